@@ -42,4 +42,4 @@ if __name__ == '__main__':
     e11810001()                             # Print unpacked EMEVD to console.
     event_script = p.as_string(e11810001)   # Pass unpacked EMEVD to a string.
     print(event_script)                     # Same as just calling the event function.
-    p.verbose(e11810001)                    # Writes to temp.verbose.txt, then opens and prints it.
+    p.verbose(e11810001)                    # Prints the event in verbose form (no files written).
@@ -4,4 +4,14 @@
 
 from .event_writer import *
 from .event_enums import *
+from .builder import EventBuilder, PrintSink, StreamSink, use_sink
+from .emevd import EMEVDReader, read_emevd
+from .columns import InstructionColumns
+from .dedupe import find_duplicate_events, merge_duplicate_events
+from .events import Event, Instruction
+from .graph import EventGraph
+from .mapcache import load_unpacked, load_unpacked_directory
+from .references import ReferenceIndex
+from .simulate import EventSimulator
+from .unpacked import UnpackedScript, parse_unpacked
 from . import extra_enums as misc
@@ -0,0 +1,149 @@
+"""
+@author: grimrhapsody
+
+Non-interactive builds of several map EMEVDs at once.
+
+Run from the command line with a module that defines MAP_EVENTS, a dictionary
+mapping map names to lists of event functions:
+
+    python -m pydses.build my_events --templates template --built built --verbose verbose
+        --emevd "C:\\...\\DATA\\event"
+"""
+
+import argparse
+import importlib
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from os.path import isfile, join
+from .event_writer import build_emevd_from_template
+
+
+# Every map with its own EMEVD in Dark Souls (PTDE). The eighteenth EMEVD,
+# common.emevd, is not a map and is not built from templates.
+MAP_NAMES = (
+    'm10_00_00_00',  # Depths
+    'm10_01_00_00',  # Undead Burg / Undead Parish
+    'm10_02_00_00',  # Firelink Shrine
+    'm11_00_00_00',  # Painted World of Ariamis
+    'm12_00_00_00',  # Darkroot Garden / Darkroot Basin
+    'm12_01_00_00',  # Royal Wood / Oolacile (DLC)
+    'm13_00_00_00',  # Catacombs
+    'm13_01_00_00',  # Tomb of the Giants
+    'm13_02_00_00',  # Great Hollow / Ash Lake
+    'm14_00_00_00',  # Blighttown / Quelaag's Domain
+    'm14_01_00_00',  # Demon Ruins / Lost Izalith
+    'm15_00_00_00',  # Sen's Fortress
+    'm15_01_00_00',  # Anor Londo
+    'm16_00_00_00',  # New Londo Ruins / Valley of Drakes
+    'm17_00_00_00',  # Duke's Archives / Crystal Cave
+    'm18_00_00_00',  # Kiln of the First Flame
+    'm18_01_00_00',  # Undead Asylum
+)
+
+
+def check_map_names(map_names, template_directory):
+    """ Raise a ValueError if any map name is not in MAP_NAMES, or has no template in template_directory. """
+    unknown = [map_name for map_name in map_names if map_name not in MAP_NAMES]
+    if unknown:
+        raise ValueError('Unknown map name{}: {}. Maps are named like {!r}.'.format(
+            '' if len(unknown) == 1 else 's', ', '.join(unknown), MAP_NAMES[0]))
+    missing = [map_name for map_name in map_names
+               if not isfile(join(template_directory, '{}.unpack.txt'.format(map_name)))]
+    if missing:
+        raise ValueError('No template in {} for: {}.'.format(template_directory, ', '.join(missing)))
+
+
+def _decline(question):
+    # Non-interactive answer to every build question: never edit templates and
+    # never abort, so events without a tag are skipped (and reported).
+    return 'N'
+
+
+def _build_map(map_name, event_function_list, template_directory, built_directory, verbose_directory,
+               emevd_directory, use_cache, optimize):
+    # Runs in a worker process. Returns a picklable summary of the build.
+    messages = []
+    start = time.perf_counter()
+    try:
+        built = build_emevd_from_template(event_function_list, map_name, template_directory, built_directory,
+                                          verbose_directory, emevd_directory, prompt=_decline,
+                                          report=lambda *args: messages.append(' '.join(str(a) for a in args)),
+                                          use_cache=use_cache, optimize=optimize)
+        error = None
+    except Exception as e:
+        built = False
+        error = '{}: {}'.format(type(e).__name__, e)
+    return {'map_name': map_name, 'built': built, 'error': error, 'messages': messages,
+            'seconds': time.perf_counter() - start}
+
+
+def build_all_maps(map_events, template_directory, built_directory, verbose_directory, emevd_directory,
+                   max_workers=None, use_cache=True, optimize=False):
+    """ Build every map in map_events in parallel, without asking any questions.
+
+    map_events maps each map name (e.g. 'm18_01_00_00') to its event_function_list. The event functions must be
+    defined at the top level of an importable module so they can be sent to the worker processes.
+
+    Events with no tag in their template are skipped rather than added, and templates are never modified. Maps whose
+    template and rendered events have not changed since their last build are skipped entirely, unless use_cache is
+    False (see cache.BuildCache). If optimize is True, every event is run through the peephole optimizer (see
+    optimize.py) before it is written.
+
+    Every map name must be in MAP_NAMES and have a template (see check_map_names), or nothing is built. Returns a
+    list of summaries (one dictionary per map, in map_events order) with keys 'map_name', 'built', 'error',
+    'messages' and 'seconds'.
+    """
+    check_map_names(map_events, template_directory)
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(_build_map, map_name, list(event_function_list), template_directory,
+                                   built_directory, verbose_directory, emevd_directory, use_cache, optimize)
+                   for map_name, event_function_list in map_events.items()]
+        return [future.result() for future in futures]
+
+
+def print_summary(results):
+    for result in results:
+        status = 'built' if result['built'] else 'FAILED' if result['error'] else 'aborted'
+        print('{} {} ({:.2f}s)'.format(result['map_name'], status, result['seconds']))
+        if result['error']:
+            print('    ' + result['error'])
+        for message in result['messages']:
+            print('    ' + message)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m pydses.build',
+                                     description='Build map EMEVDs from templates in parallel.')
+    parser.add_argument('module', help='Importable module that defines MAP_EVENTS = {map_name: [event functions]}.')
+    parser.add_argument('--templates', required=True, help='Directory of template unpacked EMEVDs.')
+    parser.add_argument('--built', required=True, help='Output directory for built unpacked EMEVDs.')
+    parser.add_argument('--verbose', required=True, help='Output directory for verbose EMEVDs.')
+    parser.add_argument('--emevd', required=True, help='Output directory for packed EMEVDs (...\\DATA\\event).')
+    parser.add_argument('--maps', nargs='*', help='Only build these maps (default: all maps in MAP_EVENTS).')
+    parser.add_argument('--workers', type=int, default=None, help='Number of worker processes.')
+    parser.add_argument('--rebuild', action='store_true', help='Ignore the build cache and rebuild every map.')
+    parser.add_argument('--optimize', action='store_true', help='Remove redundant instructions from your events.')
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, os.getcwd())
+    map_events = importlib.import_module(args.module).MAP_EVENTS
+    if args.maps:
+        map_events = {map_name: map_events[map_name] for map_name in args.maps}
+
+    start = time.perf_counter()
+    try:
+        results = build_all_maps(map_events, args.templates, args.built, args.verbose, args.emevd, args.workers,
+                                 use_cache=not args.rebuild, optimize=args.optimize)
+    except ValueError as e:
+        print(e)
+        return 2
+    print_summary(results)
+    print('Built {} of {} maps in {:.2f}s.'.format(sum(1 for result in results if result['built']), len(results),
+                                                   time.perf_counter() - start))
+    return 0 if all(result['built'] for result in results) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,204 @@
+"""
+@author: grimrhapsody
+"""
+
+import threading
+from contextlib import contextmanager
+from .events import Event, Instruction, format_header, format_instruction, format_substitution
+from .labels import Label, link_events
+from .optimize import optimize_events
+from .params import Param, substitute_parameters
+from .registers import Register, allocate_registers
+
+
+""" SINKS """
+
+
+class StreamSink(object):
+    """ Writes each unpacked EMEVD line to a text stream as soon as it is received. """
+
+    def __init__(self, stream):
+        self.stream = stream
+
+    def write_header(self, event_id, restart_type):
+        self._write_line(format_header(event_id, restart_type))
+
+    def write_instruction(self, bank, index, layout, args):
+        if any(isinstance(arg, Label) for arg in args):
+            self.mark_label(None)
+        if any(isinstance(arg, Register) for arg in args):
+            raise ValueError("Condition registers can't be allocated when lines are written out immediately. Write "
+                             "the event inside an EventBuilder instead.")
+        substitutions = ()
+        if any(isinstance(arg, Param) for arg in args):
+            args, substitutions = substitute_parameters(bank, index, layout, args)
+        self._write_line(format_instruction(bank, index, layout.arg_format, args))
+        for substitution in substitutions:
+            self.write_substitution(*substitution)
+
+    def mark_label(self, label):
+        raise ValueError("Labels can't be linked when lines are written out immediately. Write the event inside an "
+                         "EventBuilder instead (e.g. with as_string(), verbose() or write_packed()).")
+
+    def write_substitution(self, write_from_offset, read_from_offset, bytes_length):
+        self._write_line(format_substitution(write_from_offset, read_from_offset, bytes_length))
+
+    def _write_line(self, line):
+        self.stream.write(line + '\n')
+
+
+class PrintSink(StreamSink):
+    """ The original pydses behaviour: every line is printed to stdout.
+
+    sys.stdout is looked up on every write, so this sink still respects any
+    redirection you have set up yourself.
+    """
+
+    def __init__(self):
+        super().__init__(None)
+
+    def _write_line(self, line):
+        print(line)
+
+
+class EventBuilder(object):
+    """ In-memory buffer of structured event records.
+
+    Use it as a context manager around event function calls; every instruction
+    written inside the block is appended here instead of being printed:
+
+        with EventBuilder() as builder:
+            my_event_function()
+        unpacked_text = builder.render()
+
+    Events are stored as Event objects in self.events (see events.py).
+    Instructions written before any event header are kept in an Event whose
+    event_id is None.
+
+    Skip counts given as Labels (see labels.py) and symbolic condition
+    registers (see registers.py) are filled in when the block exits, or when
+    link() is called.
+    """
+
+    def __init__(self):
+        self.events = []
+        self._unlinked = []  # (event, instruction position) of instructions with Label or Register arguments
+
+    def __enter__(self):
+        push_sink(self)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        pop_sink(self)
+        if exc_type is None:
+            self.link()
+
+    def link(self):
+        """ Resolve all Label and Register arguments written so far into skip counts and registers. """
+        link_events(self._unlinked)
+        allocate_registers(self._unlinked)
+        self._unlinked = []
+
+    def optimize(self):
+        """ Run the peephole optimizer (see optimize.py) over the linked events. Returns the number of instructions
+        removed. """
+        return optimize_events(self.events)
+
+    def write_header(self, event_id, restart_type):
+        self.events.append(Event(event_id, restart_type))
+
+    def write_instruction(self, bank, index, layout, args):
+        if not self.events:
+            self.events.append(Event(None, None))
+        instructions = self.events[-1].instructions
+        if any(isinstance(arg, (Label, Register)) for arg in args):
+            self._unlinked.append((self.events[-1], len(instructions)))
+        substitutions = None
+        if any(isinstance(arg, Param) for arg in args):
+            args, substitutions = substitute_parameters(bank, index, layout, args)
+        instructions.append(Instruction(bank, index, layout, args, substitutions))
+
+    def mark_label(self, label):
+        if label.event is not None:
+            raise ValueError('{!r} has already been marked.'.format(label))
+        if not self.events:
+            self.events.append(Event(None, None))
+        label.event = self.events[-1]
+        label.position = len(label.event.instructions)
+
+    def write_substitution(self, write_from_offset, read_from_offset, bytes_length):
+        if not self.events or not self.events[-1].instructions:
+            raise ValueError('Parameter substitution must follow an instruction.')
+        self.events[-1].instructions[-1].add_substitution(write_from_offset, read_from_offset, bytes_length)
+
+    def lines(self):
+        for event in self.events:
+            yield from event.lines()
+
+    def render(self):
+        """ Render all buffered events as unpacked EMEVD text (in a single join). """
+        return render_events(self.events)
+
+    def replay(self, sink):
+        """ Send all buffered records to another sink (e.g. PrintSink()). """
+        replay_events(self.events, sink)
+
+
+def render_events(events):
+    """ Render Events as unpacked EMEVD text (in a single join). """
+    lines = [line for event in events for line in event.lines()]
+    if not lines:
+        return ''
+    return '\n'.join(lines) + '\n'
+
+
+def replay_events(events, sink):
+    for event in events:
+        if event.event_id is not None:
+            sink.write_header(event.event_id, event.restart_type)
+        for instruction in event.instructions:
+            sink.write_instruction(instruction.bank, instruction.index, instruction.layout, instruction.args)
+            for substitution in instruction.substitutions or ():
+                sink.write_substitution(*substitution)
+
+
+""" ACTIVE SINK """
+
+
+PRINT_SINK = PrintSink()
+_local = threading.local()
+
+
+def _sink_stack():
+    try:
+        return _local.stack
+    except AttributeError:
+        _local.stack = []
+        return _local.stack
+
+
+def current_sink():
+    """ Sink that receives instructions in the current thread (PRINT_SINK by default). """
+    stack = _sink_stack()
+    return stack[-1] if stack else PRINT_SINK
+
+
+def push_sink(sink):
+    _sink_stack().append(sink)
+
+
+def pop_sink(sink):
+    stack = _sink_stack()
+    if not stack or stack[-1] is not sink:
+        raise RuntimeError('Sinks must be removed in the reverse order they were added.')
+    stack.pop()
+
+
+@contextmanager
+def use_sink(sink):
+    """ Send all instructions written inside this block (in this thread) to sink. """
+    push_sink(sink)
+    try:
+        yield sink
+    finally:
+        pop_sink(sink)
@@ -0,0 +1,59 @@
+"""
+@author: grimrhapsody
+"""
+
+import hashlib
+import json
+import os
+from os.path import exists, join
+
+
+MANIFEST_NAME = '.pydses_build_cache.json'
+CACHE_VERSION = 1  # Increase this whenever the built output format changes.
+
+
+def build_digest(template_text, event_strings):
+    """ Content hash of a map build: the template text plus every rendered event function. """
+    digest = hashlib.sha1('pydses build {}\n'.format(CACHE_VERSION).encode())
+    digest.update(template_text.encode())
+    for event_string in event_strings:
+        digest.update(b'\0')
+        digest.update(event_string.encode())
+    return digest.hexdigest()
+
+
+class BuildCache(object):
+    """ Small JSON manifest in built_directory recording the input digest of each built map.
+
+    A map whose digest is unchanged (and whose output files all still exist) does not need to be rebuilt, packed or
+    converted to verbose again. Saving merges with the manifest currently on disk, so builds of different maps can
+    share it; if two saves ever race, the worst case is one unnecessary rebuild.
+    """
+
+    def __init__(self, built_directory):
+        self.path = join(built_directory, MANIFEST_NAME)
+        self.digests = self._read()
+
+    def _read(self):
+        try:
+            with open(self.path) as file:
+                manifest = json.load(file)
+        except (OSError, ValueError):
+            return {}
+        if manifest.get('version') != CACHE_VERSION:
+            return {}
+        return manifest.get('maps', {})
+
+    def is_fresh(self, map_name, digest, output_paths):
+        return self.digests.get(map_name) == digest and all(exists(path) for path in output_paths)
+
+    def update(self, map_name, digest):
+        self.digests[map_name] = digest
+
+    def save(self):
+        digests = self._read()
+        digests.update(self.digests)
+        temp_path = self.path + '.tmp{}'.format(os.getpid())
+        with open(temp_path, 'w') as file:
+            json.dump({'version': CACHE_VERSION, 'maps': digests}, file, indent=4, sort_keys=True)
+        os.replace(temp_path, self.path)
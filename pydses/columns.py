@@ -0,0 +1,191 @@
+"""
+@author: grimrhapsody
+"""
+
+import struct
+from array import array
+from bisect import bisect_right
+from .events import Instruction
+from .layouts import get_layout
+
+try:
+    import numpy as np
+except ImportError:
+    np = None  # NumPy is optional; every query also works on the plain arrays.
+
+
+""" COLUMNAR INSTRUCTION STORE """
+
+
+class InstructionColumns(object):
+    """ Every instruction of one or more maps, stored as parallel columns.
+
+    Row i is one instruction: map_ids[i] (index into map_names), event_ids[i],
+    lines[i] (line number in its event), banks[i], indices[i] and formats[i]
+    (index into arg_formats). Its packed arguments are
+    blob[arg_offsets[i]:arg_offsets[i + 1]], in the same layout as a packed
+    EMEVD, so every argument block starts on a four-byte boundary.
+
+    Build it from parsed maps (parse_unpacked, read_emevd) or from pydses output
+    (EventBuilder.events). Filters, value searches and group-bys are scans over
+    these columns, done with NumPy where it is installed.
+    """
+
+    def __init__(self):
+        self.map_names = []
+        self.arg_formats = []
+        self._map_numbers = {}
+        self._format_numbers = {}
+        self.map_ids = array('H')
+        self.event_ids = array('I')
+        self.lines = array('H')
+        self.banks = array('H')
+        self.indices = array('H')
+        self.formats = array('H')
+        self.arg_offsets = array('I', [0])
+        self.blob = bytearray()
+
+    @classmethod
+    def from_maps(cls, map_events):
+        """ Build from a dictionary mapping map names to lists of Events. """
+        columns = cls()
+        for map_name, events in map_events.items():
+            columns.add_events(events, map_name)
+        return columns
+
+    def _number(self, numbers, names, name):
+        try:
+            return numbers[name]
+        except KeyError:
+            number = numbers[name] = len(names)
+            names.append(name)
+            return number
+
+    def add_events(self, events, map_name=''):
+        """ Append the instructions of events (all from map_name). """
+        map_id = self._number(self._map_numbers, self.map_names, map_name)
+        for event in events:
+            if event.event_id is None:
+                raise ValueError('Cannot store instructions that are not inside an event (missing event header).')
+            for line, instruction in enumerate(event.instructions):
+                layout = instruction.layout
+                self.map_ids.append(map_id)
+                self.event_ids.append(event.event_id)
+                self.lines.append(line)
+                self.banks.append(instruction.bank)
+                self.indices.append(instruction.index)
+                self.formats.append(self._number(self._format_numbers, self.arg_formats, layout.arg_format))
+                self.blob += layout.struct.pack(*instruction.args)
+                self.arg_offsets.append(len(self.blob))
+
+    def __len__(self):
+        return len(self.banks)
+
+    def args(self, row):
+        """ Decoded argument tuple of one row. """
+        layout = get_layout(self.arg_formats[self.formats[row]])
+        return layout.struct.unpack_from(self.blob, self.arg_offsets[row])
+
+    def instruction(self, row):
+        """ One row as an Instruction (without substitutions, which are not stored). """
+        layout = get_layout(self.arg_formats[self.formats[row]])
+        return Instruction(self.banks[row], self.indices[row], layout,
+                           layout.struct.unpack_from(self.blob, self.arg_offsets[row]))
+
+    def location(self, row):
+        """ (map_name, event_id, line) of one row. """
+        return self.map_names[self.map_ids[row]], self.event_ids[row], self.lines[row]
+
+    def select(self, bank=None, index=None, event_id=None, map_name=None):
+        """ Rows matching every given column value, in order. """
+        conditions = []
+        if bank is not None:
+            conditions.append((self.banks, bank))
+        if index is not None:
+            conditions.append((self.indices, index))
+        if event_id is not None:
+            conditions.append((self.event_ids, event_id))
+        if map_name is not None:
+            if map_name not in self._map_numbers:
+                return []
+            conditions.append((self.map_ids, self._map_numbers[map_name]))
+        if np is not None and len(self):
+            mask = np.ones(len(self), dtype=bool)
+            for column, value in conditions:
+                mask &= _view(column) == value
+            return np.flatnonzero(mask).tolist()
+        rows = range(len(self))
+        for column, value in conditions:
+            rows = [row for row in rows if column[row] == value]
+        return list(rows)
+
+    def find_value(self, value):
+        """ Rows with a 32-bit argument equal to value (e.g. every instruction touching entity 1811990).
+
+        Integers match 'i' and 'I' arguments and floats match 'f' arguments.
+        """
+        if isinstance(value, float):
+            word, field_types = struct.pack('<f', value), 'f'
+        else:
+            word, field_types = struct.pack('<i' if value < 0 else '<I', value), 'iI'
+        if np is not None and self.blob:
+            words = np.frombuffer(self.blob, dtype='<u4')
+            hits = np.flatnonzero(words == np.frombuffer(word, dtype='<u4')[0]) * 4
+            candidates = zip(hits.tolist(), (np.searchsorted(_view(self.arg_offsets), hits, 'right') - 1).tolist())
+        else:
+            candidates = ((offset, bisect_right(self.arg_offsets, offset) - 1)
+                          for offset in _find_words(self.blob, word))
+        rows = []
+        for offset, row in candidates:
+            layout = get_layout(self.arg_formats[self.formats[row]])
+            field_offset = offset - self.arg_offsets[row]
+            if field_offset in layout.offsets and layout.arg_format[layout.offsets.index(field_offset)] in field_types:
+                if not rows or rows[-1] != row:
+                    rows.append(row)
+        return rows
+
+    def count_by_opcode(self):
+        """ Number of rows of each instruction, as {(bank, index): count}. """
+        if np is not None:
+            keys, counts = np.unique(_view(self.banks).astype('<u4') << 16 | _view(self.indices), return_counts=True)
+            return {(key >> 16, key & 0xFFFF): count for key, count in zip(keys.tolist(), counts.tolist())}
+        counts = {}
+        for key in zip(self.banks, self.indices):
+            counts[key] = counts.get(key, 0) + 1
+        return counts
+
+    def count_by_event(self):
+        """ Number of rows in each event, as {(map_name, event_id): count}. """
+        counts = {}
+        for key in zip(self.map_ids, self.event_ids):
+            counts[key] = counts.get(key, 0) + 1
+        return {(self.map_names[map_id], event_id): count for (map_id, event_id), count in counts.items()}
+
+    def numpy(self):
+        """ NumPy views (no copies) of every column, keyed by column name. Requires NumPy.
+
+        Columns can't grow while these views exist, so drop them before adding more events.
+        """
+        if np is None:
+            raise ImportError('NumPy is required for InstructionColumns.numpy().')
+        views = {name: _view(getattr(self, name))
+                 for name in ('map_ids', 'event_ids', 'lines', 'banks', 'indices', 'formats', 'arg_offsets')}
+        views['blob'] = np.frombuffer(self.blob, dtype=np.uint8)
+        return views
+
+
+def _view(column):
+    # Zero-copy NumPy view of an array.array column (which locks its size until
+    # the view is released).
+    return np.frombuffer(column, dtype=column.typecode)
+
+
+def _find_words(blob, word):
+    # Offsets of every four-byte aligned occurrence of word in blob.
+    offset = blob.find(word)
+    while offset != -1:
+        if offset % 4 == 0:
+            yield offset
+            offset = blob.find(word, offset + 4)
+        else:
+            offset = blob.find(word, offset + 1)
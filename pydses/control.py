@@ -0,0 +1,302 @@
+"""
+@author: grimrhapsody
+"""
+
+import threading
+from enum import Enum
+from .builder import current_sink
+from .event_enums import comparison_type, flag_type, logic_op_type
+from .labels import Label
+from .layouts import opcode_layout
+from .registers import Register
+
+
+"""
+Structured if/elif/else blocks, compiled to conditional skips:
+
+    with If(flag_on(11810000)):
+        award_item_lot(1234)
+    with Elif(condition_true(AND1)):
+        play_sound_effect(...)
+    with Else():
+        end()
+
+Each If or Elif writes one skip over its own block (1003[01], 1000[01], etc.)
+that fires when its test is False. A block followed by an Elif or Else also
+gets one unconditional skip (1000[03]) to the end of the chain, unless its last
+instruction already ends or restarts the event (outside of any block nested in
+it). All counts are Labels, so the
+event must be written inside an EventBuilder (as it is by as_string(),
+verbose() and the build functions).
+
+There are no loop blocks: EMEVD skips can only go forward. Use restart() (or a
+restart_if_* instruction) to run an event from the top again, or an ordinary
+Python loop to write out repeated instructions.
+"""
+
+
+TERMINATE = (1000, 4)
+
+
+""" TESTS """
+
+
+class Test(object):
+    """ A condition that one skip instruction can check. ~test is its negation.
+
+    bank and index are the skip instruction, and true_args/false_args are its
+    arguments after number_lines that make it skip when the test is True/False.
+    """
+
+    __slots__ = ('bank', 'index', 'true_args', 'false_args')
+
+    def __init__(self, bank, index, true_args, false_args):
+        self.bank = bank
+        self.index = index
+        self.true_args = tuple(true_args)
+        self.false_args = tuple(false_args)
+
+    def __invert__(self):
+        return Test(self.bank, self.index, self.false_args, self.true_args)
+
+    def skip_unless(self, number_lines):
+        """ Write the skip instruction that skips number_lines when this test is False. """
+        _write(self.bank, self.index, number_lines, *self.false_args)
+
+    def __repr__(self):
+        return 'Test({}[{:02d}], {})'.format(self.bank, self.index, self.true_args)
+
+
+def _state_test(bank, index, *args):
+    return Test(bank, index, (1,) + args, (0,) + args)
+
+
+def flag_on(flag_id, event_flag_type=flag_type.event_flag):
+    return _state_test(1003, 1, event_flag_type, flag_id)
+
+
+def flag_off(flag_id, event_flag_type=flag_type.event_flag):
+    return ~flag_on(flag_id, event_flag_type)
+
+
+def this_event_on():
+    return flag_on(0, flag_type.event)
+
+
+def this_event_off():
+    return flag_off(0, flag_type.event)
+
+
+_RANGE_NEGATIONS = {logic_op_type.all_on: logic_op_type.not_all_on, logic_op_type.all_off: logic_op_type.not_all_off,
+                    logic_op_type.not_all_off: logic_op_type.all_off, logic_op_type.not_all_on: logic_op_type.all_on}
+
+
+def flag_range_state(range_state: logic_op_type, first_flag_id, last_flag_id, event_flag_type=flag_type.event_flag):
+    range_state = logic_op_type(range_state)
+    return Test(1003, 3, (range_state, event_flag_type, first_flag_id, last_flag_id),
+                (_RANGE_NEGATIONS[range_state], event_flag_type, first_flag_id, last_flag_id))
+
+
+def flag_range_all_on(first_flag_id, last_flag_id, event_flag_type=flag_type.event_flag):
+    return flag_range_state(logic_op_type.all_on, first_flag_id, last_flag_id, event_flag_type)
+
+
+def flag_range_all_off(first_flag_id, last_flag_id, event_flag_type=flag_type.event_flag):
+    return flag_range_state(logic_op_type.all_off, first_flag_id, last_flag_id, event_flag_type)
+
+
+def condition_true(condition, finished=False):
+    # finished=True uses the 'finished condition group' skip (1000[07]).
+    return _state_test(1000, 7 if finished else 1, condition)
+
+
+def condition_false(condition, finished=False):
+    return ~condition_true(condition, finished)
+
+
+def inside_area(area_id, block_id):
+    return _state_test(1003, 7, area_id, block_id)
+
+
+def outside_area(area_id, block_id):
+    return ~inside_area(area_id, block_id)
+
+
+def object_destroyed(entity_id):
+    # Uses the same (tentative) destruction state as skip_if_object_destroyed().
+    return _state_test(1005, 1, entity_id)
+
+
+def object_not_destroyed(entity_id):
+    return ~object_destroyed(entity_id)
+
+
+_COMPARISON_NEGATIONS = {
+    comparison_type.equal: comparison_type.not_equal,
+    comparison_type.not_equal: comparison_type.equal,
+    comparison_type.greater_than: comparison_type.less_than_or_equal,
+    comparison_type.less_than_or_equal: comparison_type.greater_than,
+    comparison_type.less_than: comparison_type.greater_than_or_equal,
+    comparison_type.greater_than_or_equal: comparison_type.less_than,
+}
+
+
+def compare(left, comparison: comparison_type, right):
+    comparison = comparison_type(comparison)
+    return Test(1000, 5, (comparison, left, right), (_COMPARISON_NEGATIONS[comparison], left, right))
+
+
+""" CONDITION REGISTERS """
+
+
+def all_of(*inputs, name=None):
+    """ New symbolic AND register (see registers.py). Each input register is added to it as a condition now. """
+    register = Register('AND', name)
+    for input_condition in inputs:
+        _write(0, 0, register, 1, input_condition)
+    return register
+
+
+def any_of(*inputs, name=None):
+    """ New symbolic OR register (see registers.py). Each input register is added to it as a condition now. """
+    register = Register('OR', name)
+    for input_condition in inputs:
+        _write(0, 0, register, 1, input_condition)
+    return register
+
+
+""" BLOCKS """
+
+
+_local = threading.local()
+
+
+class _Chain(object):
+    # State of the most recently closed If/Elif block, which the next Elif or
+    # Else continues.
+
+    __slots__ = ('sink', 'event', 'position', 'start', 'end_label', 'next_label', 'nested_end')
+
+    def __init__(self, sink, end_label):
+        self.sink = sink
+        self.event = None
+        self.position = None  # instruction count when the block closed
+        self.start = None  # instruction count when the block's body started
+        self.end_label = end_label
+        self.next_label = None  # where the block's own skip lands
+        self.nested_end = None  # (event, instruction count) when the last block nested in this one closed
+
+
+def _write(bank, index, *args):
+    args = [arg.value if isinstance(arg, Enum) else arg for arg in args]
+    current_sink().write_instruction(bank, index, opcode_layout(bank, index, args), args)
+
+
+def _here():
+    # (event, instruction count) of the current write position.
+    probe = Label()
+    current_sink().mark_label(probe)
+    return probe.event, probe.position
+
+
+def _mark(label):
+    # Mark (or move) a label to the current position. Moving is safe because
+    # skip counts are only computed when the EventBuilder is closed.
+    label.event = None
+    current_sink().mark_label(label)
+
+
+def _open_blocks():
+    if not hasattr(_local, 'blocks'):
+        _local.blocks = []
+    return _local.blocks
+
+
+class _Block(object):
+    # Subclasses define _open(), which returns the _Chain the block belongs to.
+
+    __slots__ = ('test', 'chain')
+
+    def __init__(self, test=None):
+        self.test = test
+        self.chain = None
+
+    def __enter__(self):
+        self.chain = self._open()
+        if self.test is not None:
+            self.chain.next_label = Label()
+            self.test.skip_unless(self.chain.next_label)
+        else:
+            self.chain.next_label = None
+        self.chain.event, self.chain.start = _here()
+        self.chain.nested_end = None
+        _open_blocks().append(self.chain)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        chain, self.chain = self.chain, None
+        _local.chain = None
+        blocks = _open_blocks()
+        blocks.pop()
+        if exc_type is not None:
+            return
+        if chain.next_label is not None:
+            _mark(chain.next_label)
+        _mark(chain.end_label)
+        if blocks:
+            blocks[-1].nested_end = _here()
+        if self.test is not None:
+            chain.event, chain.position = _here()
+            _local.chain = chain  # an Elif or Else can continue this chain
+
+
+class If(_Block):
+    """ Block that only runs if test is True. See the top of control.py. """
+
+    __slots__ = ()
+
+    def __init__(self, test):
+        super().__init__(test)
+
+    def _open(self):
+        return _Chain(current_sink(), Label())
+
+
+class _ContinuedBlock(_Block):
+
+    __slots__ = ()
+
+    def _open(self):
+        chain = getattr(_local, 'chain', None)
+        sink = current_sink()
+        if chain is None or chain.sink is not sink or _here() != (chain.event, chain.position):
+            raise ValueError('{} must directly follow an If or Elif block.'.format(type(self).__name__))
+        instructions = chain.event.instructions
+        if (chain.position == chain.start or (instructions[-1].bank, instructions[-1].index) != TERMINATE
+                or chain.nested_end == (chain.event, chain.position)):
+            # Jump from the end of the previous block to the end of the chain,
+            # and move that block's own skip past this jump. It can only be
+            # left out if the previous block always ends with its own
+            # terminate (not one inside a nested block).
+            _write(1000, 3, chain.end_label)
+            _mark(chain.next_label)
+        _local.chain = None
+        return chain
+
+
+class Elif(_ContinuedBlock):
+    """ Block that only runs if every earlier block in the chain was skipped and test is True. """
+
+    __slots__ = ()
+
+    def __init__(self, test):
+        super().__init__(test)
+
+
+class Else(_ContinuedBlock):
+    """ Block that only runs if every earlier block in the chain was skipped. """
+
+    __slots__ = ()
+
+    def __init__(self):
+        super().__init__()
@@ -0,0 +1,154 @@
+"""
+@author: grimrhapsody
+"""
+
+from .events import Event, Instruction
+from .layouts import FIELD_SIZES, opcode_layout
+from .references import instruction_references
+from .verbose import argument_names
+
+
+"""
+Merges events that differ only in their argument values into one event that is
+initialized once per original event, in its own slot, the way vanilla maps
+reuse events (e.g. 11510090 in slots 0 and 1 in Anor Londo):
+
+    11810100, 0                              11810100, 0
+     2004[05] (ib)[1810100, 0]                2004[05] (ib)[0, 0]
+    11810101, 0                   --->           ^(0 <- 0, 4)
+     2004[05] (ib)[1810101, 0]
+                                              2000[00] (iII)[0, 11810100, 1810100]
+     2000[00] (iI)[0, 11810100]               2000[00] (iII)[1, 11810100, 1810101]
+     2000[00] (iI)[0, 11810101]
+
+Every argument that differs between the merged events becomes one four-byte
+event argument, loaded with a ^(X <- Y, Z) substitution.
+
+Only events that are safe to merge are considered. They must have no
+substitutions of their own. They must be initialized exactly once, in slot 0,
+and their ID must not be used as a flag anywhere else. They must not check
+Event ID flags (flag_type 1 or 2), whose meaning would change with the slot, or
+initialize other events. Skip counts must also match. Events 0 and 50 are
+never merged.
+
+An event in slot N sets flag (event ID + N) when it ends, so the IDs of a
+merged group must also be consecutive: the event in slot N of 11810100 must
+have been 11810100 + N, or its completion flag would change (and could be
+another event's or flag's ID). Events with the same structure are split into
+runs of consecutive IDs, and each run of two or more is a group.
+"""
+
+
+CONSTRUCTOR_EVENTS = (0, 50)
+INITIALIZE = (2000, 0)
+
+
+def _structure(event):
+    # Everything about an event except its mergeable argument values, or None
+    # if it can't be merged.
+    key = [event.restart_type]
+    for instruction in event.instructions:
+        if instruction.substitutions or (instruction.bank, instruction.index) == INITIALIZE:
+            return None
+        names = argument_names(instruction.bank, instruction.index, len(instruction.args)) or ()
+        fixed = []
+        for name, arg in zip(names, instruction.args):
+            if name == 'flag_type' and arg in (1, 2):
+                return None
+            if name == 'line_count':
+                fixed.append(arg)
+        key.append((instruction.bank, instruction.index, instruction.layout.arg_format, tuple(fixed)))
+    return tuple(key)
+
+
+def find_duplicate_events(events):
+    """ Groups of events (lists of at least two Events with consecutive IDs, in ID order) that can be merged into
+    one. """
+    initializations = {}  # event_id -> list of 2000[00] instructions
+    referenced = set()  # event IDs used as flags outside of their initialization
+    for event in events:
+        for instruction in event.instructions:
+            if (instruction.bank, instruction.index) == INITIALIZE:
+                if instruction.substitutions:
+                    referenced.add(instruction.args[1])  # initialized with run-time arguments
+                initializations.setdefault(instruction.args[1], []).append(instruction)
+            for kind, value, role in instruction_references(instruction):
+                if kind == 'flag' and not ((instruction.bank, instruction.index) == INITIALIZE and role == 'event_id'):
+                    referenced.add(value)
+    groups = {}
+    for event in events:
+        if event.event_id is None or event.event_id in CONSTRUCTOR_EVENTS or event.event_id in referenced:
+            continue
+        initialization = initializations.get(event.event_id, ())
+        if len(initialization) != 1 or initialization[0].args[0] != 0:
+            continue
+        structure = _structure(event)
+        if structure is not None:
+            groups.setdefault(structure, []).append(event)
+    runs = []
+    for group in groups.values():
+        group = sorted(group, key=lambda event: event.event_id)
+        run = group[:1]
+        for event in group[1:]:
+            if event.event_id == run[0].event_id + len(run):
+                run.append(event)
+                continue
+            runs.append(run)
+            run = [event]
+        runs.append(run)
+    return [run for run in runs if len(run) > 1]
+
+
+def merge_events(group):
+    """ One parameterized Event for a group from find_duplicate_events(), and the event argument tuple of each
+    original event (in group order). Arguments are packed as four-byte words by the 2000[00] instruction, and each
+    substitution reads only as many bytes as its field has. """
+    first = group[0]
+    varying = []  # (instruction position, argument index)
+    for position, instruction in enumerate(first.instructions):
+        for i, arg in enumerate(instruction.args):
+            if any(event.instructions[position].args[i] != arg for event in group[1:]):
+                varying.append((position, i))
+    instructions = [Instruction(instruction.bank, instruction.index, instruction.layout, instruction.args)
+                    for instruction in first.instructions]
+    for parameter, (position, i) in enumerate(varying):
+        instruction = instructions[position]
+        args = list(instruction.args)
+        args[i] = 0.0 if instruction.layout.arg_format[i] == 'f' else 0
+        instruction.args = tuple(args)
+        instruction.add_substitution(instruction.layout.offsets[i], 4 * parameter,
+                                     FIELD_SIZES[instruction.layout.arg_format[i]])
+    event_args = [tuple(event.instructions[position].args[i] for position, i in varying) for event in group]
+    return Event(first.event_id, first.restart_type, instructions), event_args
+
+
+def merge_duplicate_events(events):
+    """ Merge every group of duplicate events (see find_duplicate_events) and rewrite their initializations.
+
+    Returns the new event list and a dictionary mapping each merged event ID to the original event IDs it replaced
+    (in slot order). The given Event objects are not modified.
+    """
+    replaced = {}  # original event_id -> merged Event (or None, if it is removed)
+    initializations = {}  # original event_id -> new 2000[00] instruction
+    merged_ids = {}
+    for group in find_duplicate_events(events):
+        merged, event_args = merge_events(group)
+        merged_ids[merged.event_id] = [event.event_id for event in group]
+        for slot, (event, args) in enumerate(zip(group, event_args)):
+            replaced[event.event_id] = merged if slot == 0 else None
+            init_args = (slot, merged.event_id) + (args or (0,))
+            initializations[event.event_id] = Instruction(INITIALIZE[0], INITIALIZE[1],
+                                                          opcode_layout(*INITIALIZE, init_args), init_args)
+    new_events = []
+    for event in events:
+        if event.event_id in replaced:
+            if replaced[event.event_id] is not None:
+                new_events.append(replaced[event.event_id])
+            continue
+        instructions = [initializations.get(instruction.args[1], instruction)
+                        if (instruction.bank, instruction.index) == INITIALIZE else instruction
+                        for instruction in event.instructions]
+        if any(new is not old for new, old in zip(instructions, event.instructions)):
+            event = Event(event.event_id, event.restart_type, instructions)
+        new_events.append(event)
+    return new_events, merged_ids
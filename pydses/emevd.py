@@ -0,0 +1,276 @@
+"""
+@author: grimrhapsody
+"""
+
+import mmap
+import struct
+from .events import Event, Instruction
+from .layouts import VARIADIC_INSTRUCTIONS, get_layout, infer_format, opcode_layout
+from .validate import check_events
+
+
+"""
+Packed EMEVD layout (Dark Souls PTDE: 32-bit, little-endian):
+
+    header
+    event table             (one EVENT_STRUCT per event)
+    instruction table       (one INSTRUCTION_STRUCT per instruction)
+    event layer table       (unused here)
+    parameter table         (one PARAMETER_STRUCT per ^(X <- Y, Z) line)
+    linked file table       (offsets into packed strings)
+    base argument data      (each instruction's packed arguments)
+    packed strings          (UTF-16 names of linked files)
+
+Table offsets inside the event and instruction structs are relative to the
+start of the table they point into.
+"""
+
+
+SIGNATURE = b'EVD\0'
+VERSION = 0xCC
+
+HEADER_STRUCT = struct.Struct('<4sBBbbI' + 'I' * 17 + '4x')
+EVENT_STRUCT = struct.Struct('<IIIIiI4x')
+INSTRUCTION_STRUCT = struct.Struct('<IIIi4xi4x')
+PARAMETER_STRUCT = struct.Struct('<IIII4x')
+LINKED_FILE_STRUCT = struct.Struct('<I')
+
+
+""" PACKING """
+
+
+def _encode_linked_files(linked_files):
+    strings = bytearray()
+    offsets = []
+    for name in linked_files:
+        offsets.append(len(strings))
+        strings += name.encode('utf-16-le') + b'\0\0'
+    return offsets, bytes(strings)
+
+
+def pack_events(events, linked_files=()):
+    """ Pack events into the binary EMEVD layout.
+
+    events is a sequence of Event objects (e.g. EventBuilder.events). All sizes
+    are known from the shared ArgLayouts, so the file is written into one
+    preallocated bytearray.
+    """
+    instruction_count = 0
+    parameter_count = 0
+    base_args_size = 0
+    for event in events:
+        if event.event_id is None:
+            raise ValueError('Cannot pack instructions that are not inside an event (missing event header).')
+        instruction_count += len(event.instructions)
+        for instruction in event.instructions:
+            if instruction.substitutions:
+                parameter_count += len(instruction.substitutions)
+            base_args_size += instruction.layout.size
+    linked_offsets, strings = _encode_linked_files(linked_files)
+
+    event_table_offset = HEADER_STRUCT.size
+    instruction_table_offset = event_table_offset + EVENT_STRUCT.size * len(events)
+    layer_table_offset = instruction_table_offset + INSTRUCTION_STRUCT.size * instruction_count
+    parameter_table_offset = layer_table_offset
+    linked_table_offset = parameter_table_offset + PARAMETER_STRUCT.size * parameter_count
+    base_args_offset = linked_table_offset + LINKED_FILE_STRUCT.size * len(linked_offsets)
+    strings_offset = base_args_offset + base_args_size
+    file_size = strings_offset + len(strings)
+
+    data = bytearray(file_size)
+    HEADER_STRUCT.pack_into(
+        data, 0, SIGNATURE, 0, 0, 0, 0, VERSION, file_size,
+        len(events), event_table_offset,
+        instruction_count, instruction_table_offset,
+        0, layer_table_offset,
+        0, layer_table_offset,
+        parameter_count, parameter_table_offset,
+        len(linked_offsets), linked_table_offset,
+        base_args_size, base_args_offset,
+        len(strings), strings_offset)
+
+    event_offset = event_table_offset
+    instruction_offset = instruction_table_offset
+    parameter_offset = parameter_table_offset
+    args_offset = base_args_offset
+    for event in events:
+        first_instruction = instruction_offset
+        first_parameter = parameter_offset
+        for line, instruction in enumerate(event.instructions):
+            layout = instruction.layout
+            INSTRUCTION_STRUCT.pack_into(data, instruction_offset, instruction.bank, instruction.index, layout.size,
+                                         args_offset - base_args_offset, -1)
+            try:
+                layout.struct.pack_into(data, args_offset, *instruction.args)
+            except struct.error as e:
+                raise ValueError('Event {}, line {}: cannot pack {!r}: {}'.format(event.event_id, line, instruction, e))
+            for write_from, read_from, length in instruction.substitutions or ():
+                PARAMETER_STRUCT.pack_into(data, parameter_offset, line, write_from, read_from, length)
+                parameter_offset += PARAMETER_STRUCT.size
+            instruction_offset += INSTRUCTION_STRUCT.size
+            args_offset += layout.size
+        event_parameter_count = (parameter_offset - first_parameter) // PARAMETER_STRUCT.size
+        EVENT_STRUCT.pack_into(
+            data, event_offset, event.event_id, len(event.instructions),
+            first_instruction - instruction_table_offset,
+            event_parameter_count,
+            first_parameter - parameter_table_offset if event_parameter_count else -1,
+            event.restart_type)
+        event_offset += EVENT_STRUCT.size
+
+    for i, string_offset in enumerate(linked_offsets):
+        LINKED_FILE_STRUCT.pack_into(data, linked_table_offset + i * LINKED_FILE_STRUCT.size, string_offset)
+    data[strings_offset:] = strings
+
+    return data
+
+
+def write_emevd(events, output_file, linked_files=()):
+    """ Pack events and write them to output_file (e.g. '...\\DATA\\event\\m18_01_00_00.emevd').
+
+    Every argument is checked against its field type first, and all invalid
+    arguments are reported together (see validate.py).
+    """
+    check_events(events, output_file)
+    data = pack_events(events, linked_files)
+    with open(output_file, 'wb') as file:
+        file.write(data)
+
+
+""" READING """
+
+
+def _raw_layout(size):
+    # Layout for arguments that can't be typed from the opcode registry: whole
+    # words where possible, so packing them again gives back the same bytes.
+    return get_layout('I' * (size // 4) if size % 4 == 0 else 'B' * size)
+
+
+class EMEVDReader(object):
+    """ Memory-mapped binary EMEVD file.
+
+    The header, event table and linked files are read when the file is opened.
+    Each event's instructions, arguments and ^(X <- Y, Z) substitutions are only
+    decoded the first time that event is requested, so finding one event in a
+    large map doesn't decode the rest of the file.
+
+    Arguments are typed with the opcode registry (layouts.py). The event
+    arguments of 2000[00] are typed by size, and instructions the registry
+    doesn't know (or whose size doesn't match it) keep their raw bytes as
+    unsigned words. Either way, packing the events again gives the same bytes.
+    """
+
+    def __init__(self, emevd_filename):
+        self.filename = emevd_filename
+        with open(emevd_filename, 'rb') as file:
+            self._data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._read_tables()
+        except (struct.error, ValueError):
+            self.close()
+            raise
+
+    def _read_tables(self):
+        data = self._data
+        header = HEADER_STRUCT.unpack_from(data, 0)
+        signature, big_endian, is_64_bit, _, _, version = header[:6]
+        if signature != SIGNATURE or big_endian or is_64_bit or version != VERSION:
+            raise ValueError('{} is not a Dark Souls (PTDE) EMEVD file.'.format(self.filename))
+        (file_size, event_count, event_table_offset, _, self._instruction_table_offset, _, _, _, _, _,
+         self._parameter_table_offset, linked_count, linked_table_offset, _, self._base_args_offset, _,
+         strings_offset) = header[6:]
+        if file_size != len(data):
+            raise ValueError('{} should be {} bytes, but is {} bytes.'.format(self.filename, file_size, len(data)))
+        self._table = [EVENT_STRUCT.unpack_from(data, event_table_offset + i * EVENT_STRUCT.size)
+                       for i in range(event_count)]
+        self._positions = {row[0]: i for i, row in enumerate(self._table)}
+        self._events = {}
+        self.linked_files = []
+        for i in range(linked_count):
+            start = strings_offset + LINKED_FILE_STRUCT.unpack_from(
+                data, linked_table_offset + i * LINKED_FILE_STRUCT.size)[0]
+            end = start
+            while end + 2 <= len(data) and data[end:end + 2] != b'\0\0':
+                end += 2
+            if end + 2 > len(data):
+                raise ValueError('{}: linked file name {} (at offset {}) is not terminated.'.format(
+                    self.filename, i, start))
+            self.linked_files.append(data[start:end].decode('utf-16-le'))
+
+    @property
+    def event_ids(self):
+        """ Event IDs in file order (no events are decoded). """
+        return [row[0] for row in self._table]
+
+    def restart_type(self, event_id):
+        return self._table[self._positions[event_id]][5]
+
+    def instruction_count(self, event_id):
+        return self._table[self._positions[event_id]][1]
+
+    def event(self, event_id):
+        """ Decoded Event with the given ID (decoded once, then cached). """
+        try:
+            return self._events[event_id]
+        except KeyError:
+            pass
+        position = self._positions[event_id]
+        event = self._events[event_id] = self._decode(self._table[position])
+        return event
+
+    def _decode(self, row):
+        data = self._data
+        event_id, instruction_count, first_instruction, parameter_count, first_parameter, restart_type = row
+        instructions = []
+        offset = self._instruction_table_offset + first_instruction
+        for _ in range(instruction_count):
+            bank, index, args_size, args_offset, _ = INSTRUCTION_STRUCT.unpack_from(data, offset)
+            offset += INSTRUCTION_STRUCT.size
+            args_offset += self._base_args_offset
+            if (bank, index) in VARIADIC_INSTRUCTIONS:
+                fixed = opcode_layout(bank, index)
+                tail = struct.unpack_from('<{}i'.format((args_size - fixed.size) // 4), data, args_offset + fixed.size)
+                layout = get_layout(fixed.arg_format + infer_format(tail))
+            else:
+                try:
+                    layout = opcode_layout(bank, index)
+                except ValueError:
+                    layout = None
+            if layout is None or layout.size != args_size:
+                layout = _raw_layout(args_size)
+            instructions.append(Instruction(bank, index, layout, layout.struct.unpack_from(data, args_offset)))
+        offset = self._parameter_table_offset + first_parameter
+        for _ in range(parameter_count):
+            line, write_from, read_from, length = PARAMETER_STRUCT.unpack_from(data, offset)
+            offset += PARAMETER_STRUCT.size
+            instructions[line].add_substitution(write_from, read_from, length)
+        return Event(event_id, restart_type, instructions)
+
+    def __len__(self):
+        return len(self._table)
+
+    def __contains__(self, event_id):
+        return event_id in self._positions
+
+    def __iter__(self):
+        """ Iterate over events in file order, decoding each one as it is reached. """
+        for row in self._table:
+            yield self.event(row[0])
+
+    def events(self):
+        """ Every event, decoded, in file order (e.g. for packing or rendering). """
+        return list(self)
+
+    def close(self):
+        self._data.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def read_emevd(emevd_filename):
+    """ Open a binary EMEVD file (e.g. from '...\\DATA\\event') for lazy reading. See EMEVDReader. """
+    return EMEVDReader(emevd_filename)
@@ -2,25 +2,39 @@
 author: grimrhapsody
 """
 
-import io
 from os.path import join
-import re
-import subprocess
 from .event_enums import *
-from contextlib import redirect_stdout
-
+from .builder import EventBuilder, current_sink, render_events
+from .labels import Label
+from .cache import BuildCache, build_digest
+from .control import (If, Elif, Else, Test, flag_on, flag_off, this_event_on, this_event_off, flag_range_state,
+                      flag_range_all_on, flag_range_all_off, condition_true, condition_false, inside_area,
+                      outside_area, object_destroyed, object_not_destroyed, compare, all_of, any_of)
+from .dedupe import merge_duplicate_events
+from .emevd import write_emevd
+from .flags import FlagAllocator, check_flag_range, use_flag_allocator
+from .layouts import opcode_layout
+from .memo import build_event, clear_render_cache, render_event
+from .params import EventParameters, Param, param
+from .template import Template
+from .unpacked import parse_unpacked, parse_unpacked_lines
+from .validate import check_events
+from .verbose import render_verbose, write_verbose
+
+# Python 2 and HPR's rebuilder are no longer needed for packing or verbose
+# conversion. These are only kept so that older scripts still run.
 PYTHON_27 = 'C:\\python27\\python.exe'                      # Your Python 2 executable
 REBUILDER = 'C:\\HotPocketRemix\\emevd_rebuilder.py'        # HPR's EMEVD rebuilder script
 
 
 def set_python2(path):
-    # Specify your Python 2 executable path.
+    # Specify your Python 2 executable path (unused).
     global PYTHON_27
     PYTHON_27 = path
 
 
 def set_rebuilder(path):
-    # Specify the path of HPR's EMEVD rebuilder.
+    # Specify the path of HPR's EMEVD rebuilder (unused).
     global REBUILDER
     REBUILDER = path
 
@@ -29,7 +43,8 @@ def set_rebuilder(path):
 
 
 def build_emevd_from_template(event_function_list, map_name, template_directory, built_directory,
-                              verbose_directory, emevd_directory):
+                              verbose_directory, emevd_directory, prompt=input, report=print, use_cache=False,
+                              optimize=False):
     """ Build your custom event functions using template symbols in the unpacked EMEVD files.
 
     Create a folder of template unpacked EMEVD files. These templates will have marker symbols <########> added to them,
@@ -51,149 +66,187 @@ def build_emevd_from_template(event_function_list, map_name, template_directory,
     The built files (with all template markers replaced and unused markers removed) will be kept in the built_directory,
     and verbose versions of these will be kept in the verbose_directory. The emevd_directory should be the \event\
     folder inside your Dark Souls installation directory ('...\DATA\event').
+
+    Questions are asked with prompt() and messages are written with report(), so you can replace these for
+    non-interactive builds (see build.build_all_maps). Returns False if the build was aborted.
+
+    If use_cache is True, a hash of the template and of every rendered event is stored in a manifest in the
+    built_directory, and the whole build (including packing and verbose conversion) is skipped when nothing has
+    changed since the last build of this map.
+
+    If optimize is True, your events are run through the peephole optimizer (see optimize.py) before they are
+    inserted. Template events are left as they are.
     """
 
-    with open(join(template_directory, '{}.unpack.txt'.format(map_name))) as template_file:
-        template = template_file.read()
+    template_path = join(template_directory, '{}.unpack.txt'.format(map_name))
+    built_path = join(built_directory, '{}.unpack.txt'.format(map_name))
+    emevd_path = join(emevd_directory, '{}.emevd'.format(map_name))
+    verbose_path = join(verbose_directory, '{}.verbose.txt'.format(map_name))
+    with open(template_path) as template_file:
+        template_text = template_file.read()
+    # Each event function is built once (or taken from the render cache), and the same Events are validated and
+    # rendered.
+    built_events = [build_event(f, optimize=optimize) for f in event_function_list]
+    event_strings = [render_events(events) for events in built_events]
+
+    if use_cache:
+        cache = BuildCache(built_directory)
+        if cache.is_fresh(map_name, build_digest(template_text, event_strings),
+                          (built_path, emevd_path, verbose_path)):
+            report('{} is up to date.'.format(map_name))
+            return True
+
+    # Check every argument of your events before anything is written, so all invalid arguments are reported at once
+    # (with event and line numbers) rather than the first one failing to parse from the built text.
+    check_events([event for events in built_events for event in events], map_name)
+
+    template = parse_unpacked_lines(template_text.splitlines())  # events indexed by ID, plus template tags
     template_changed = False  # enabled if/when template is altered
-    built = template  # file that will be modified for packing
-    aborted = False
+    substitutions = {}  # tag -> replacement, applied to the template in a single pass
 
-    for f in event_function_list:
-        event_string = as_string(f)
-        event_id = event_string.split(',')[0]
+    for event_string in event_strings:
+        event_id = int(event_string.split(',')[0])
         event_tag = '<{}>'.format(event_id)
-        if template.find(event_tag) == -1:
-            if template.find('\n{}, '.format(event_id)) == -1:
+        init_tag = '<INIT_{}>'.format(event_id)
+        if not template.has_tag(event_tag):
+            if event_id not in template.events:
                 # No tag or old event exists. Ask user if they want to permanently add a tag at the bottom of the file.
-                if input('No tag found for event {} in template. Add a new tag at the bottom? (Y for Yes)'
+                if prompt('No tag found for event {} in template. Add a new tag at the bottom? (Y for Yes)'
                                  .format(event_id)) in 'Yy':
-                    template += '\n\n' + event_tag
-                    built += '\n\n' + event_string
+                    template.append(event_tag)
                     template_changed = True
-                    if template.find('<INIT0>') == -1:
-                        print('No <INIT0> tag found to create initialization event - make sure you place the tag '
+                    if not template.has_tag('<INIT0>'):
+                        report('No <INIT0> tag found to create initialization event - make sure you place the tag '
                               '<INIT_{}> wherever you want the event to be initialized.'.format(event_id))
-                    elif input('Insert initialization instruction under <INIT0> tag? (Y for Yes)') in 'Yy':
-                        # Note no space before the new tag, due to the natural space in p.initialize_event.
-                        template = template.replace('<INIT0>', '<INIT0>\n<INIT_{}>'.format(event_id))
-                        built = built.replace('<INIT0>', '<INIT0>\n<INIT_{}>'.format(event_id))
+                    elif prompt('Insert initialization instruction under <INIT0> tag? (Y for Yes)') in 'Yy':
+                        template.insert_tag_after('<INIT0>', init_tag)
                     else:
-                        print('Make sure you place the tag <INIT_{}> wherever you want '
+                        report('Make sure you place the tag <INIT_{}> wherever you want '
                               'the event to be initialized.'.format(event_id))
                 else:
-                    if input('Abort? (Y for Yes)') in 'Yy':
-                        aborted = True
-                        print('Aborting pack - no files written or modified.')
-                        break
+                    if prompt('Abort? (Y for Yes)') in 'Yy':
+                        report('Aborting pack - no files written or modified.')
+                        return False
                     else:
                         # Skip this event.
+                        report('Skipping event {}.'.format(event_id))
                         continue
             else:
                 # Old event found. Ask user if they want to permanently overwrite this old event with a tag.
-                if input('Event {} exists in vanilla file. Overwrite in template with a tag? (Y for Yes)'
+                if prompt('Event {} exists in vanilla file. Overwrite in template with a tag? (Y for Yes)'
                                  .format(event_id)) in 'Yy':
-                    try:
-                        old_event = re.search(r'\n({},.*?)\n\n'.format(event_id), template, re.DOTALL).group(1)
-                    except:
-                        # Old event must be last in file if above search fails.
-                        # TODO: Figure out how to combine these two searches (two newlines OR end of string).
-                        old_event = re.search(r'\n({},.*?)\Z'.format(event_id), template).group(1)
-                    template = template.replace(old_event, event_tag)
-                    built = built.replace(old_event, event_string)
+                    template.replace_event(event_id, event_tag)
                     template_changed = True
-
                 else:
-                    if input('Abort? (Y for Yes)') in 'Yy':
-                        aborted = True
-                        print('Aborting pack - no files written or modified.')
-                        break
+                    if prompt('Abort? (Y for Yes)') in 'Yy':
+                        report('Aborting pack - no files written or modified.')
+                        return False
                     else:
                         # Skip this event.
+                        report('Skipping event {}.'.format(event_id))
                         continue
-            if template_changed:
-                with open('template/{}.unpack.txt'.format(map_name), 'w') as template_file:
-                    template_file.write(template)
+        # Replace tag.
+        substitutions[event_tag] = event_string.rstrip('\n')
+        # Replace initialization tag.
+        if not template.has_tag(init_tag):
+            report('No <INIT> tag found to create initialization event - make sure you place the tag '
+                  '<INIT_{}> wherever you want the event to be initialized.'.format(event_id))
         else:
-            # Replace tag.
-            built = built.replace(event_tag + '\n', event_string)
-            # Replace initialization tag.
-            if built.find('<INIT_{}>'.format(event_id)) == -1:
-                print('No <INIT> tag found to create initialization event - make sure you place the tag '
-                      '<INIT_{}> wherever you want the event to be initialized.'.format(event_id))
-            else:
-                built = built.replace('<INIT_{}>'.format(event_id), initialize_event(event_id))
+            substitutions[init_tag] = as_string(initialize_event, event_id).strip()
+
+    if template_changed:
+        template_text = template.render()
+        with open(template_path, 'w') as template_file:
+            template_file.write(template_text)
 
-    # Delete remaining tags.
-    unused_tags = re.findall('(<.*?>)', built)
+    # Substitute all tags in one pass. Remaining tags are deleted.
+    built, unused_tags = Template(template.render()).render(substitutions)
     for tag in unused_tags:
-        print('Unused tag:', tag)
         if tag != '<INIT0>':  # <INIT0> tag is expected to remain and is silently removed.
-            print('Warning: tag {} was not substituted. (Removing for pack.)'.format(tag))
-        built = built.replace('\n {}'.format(tag), '')
+            report('Warning: tag {} was not substituted. (Removing for pack.)'.format(tag))
 
     # Save built and packed.
-    with open('built/{}.unpack.txt'.format(map_name), 'w') as built_file:
+    with open(built_path, 'w') as built_file:
         built_file.write(built)
 
-    with open('G:\\Code\\DarkSoulsMods\\Events\\DoAevents\\built\\{}.unpack.txt'.format(map_name), 'r') as built_file:
-        d = built_file.read()
-        print(d)
+    unpacked_to_packed(built_path, emevd_path)
+    unpacked_to_verbose(built_path, verbose_path)
 
-    unpacked_to_packed(join(built_directory, '{}.unpack.txt'.format(map_name)),
-                       join(emevd_directory, '{}.emevd'.format(map_name)))
-    unpacked_to_verbose(join(built_directory, '{}.unpack.txt'.format(map_name)),
-                        join(verbose_directory, '{}.verbose.txt'.format(map_name)))
+    if use_cache:
+        cache.update(map_name, build_digest(template_text, event_strings))
+        cache.save()
+    return True
 
 
-def unpacked_to_packed(unpacked_filename, output_file):
-    """ Just calls the rebuilder in Python 2. """
-    global PYTHON_27
-    global REBUILDER
-    command = '{} {} -p \"{}\" -o \"{}\"' \
-        .format(PYTHON_27, REBUILDER, unpacked_filename, output_file)
-    print('command:', command)
-    subprocess.run(command)
+def build_events(event_function_list, optimize=False):
+    """ Run every function in event_function_list once, in order, and return the Events they write (after the
+    peephole optimizer, if optimize is True). """
+    with EventBuilder() as builder:
+        for event_function in event_function_list:
+            event_function()
+    if optimize:
+        builder.optimize()
+    return builder.events
 
 
-def unpacked_to_verbose(unpacked_filename, output_file):
-    """ Convert unpacked file to verbose.
+def write_packed(event_function_list, output_file, optimize=False, merge_duplicates=False):
+    """ Pack your event functions directly into a binary EMEVD file (no Python 2 or HPR needed).
+
+    Every function in event_function_list is run once, in order, and all of the
+    events they write are packed together (after the peephole optimizer, if
+    optimize is True). If merge_duplicates is True, events that only differ in
+    their arguments are packed as one event with several slots (see dedupe.py).
+    """
+    events = build_events(event_function_list, optimize=optimize)
+    if merge_duplicates:
+        events, _ = merge_duplicate_events(events)
+    write_emevd(events, output_file)
+
 
-    HPR's code will throw its own useful errors if your EMEVD is wrong in any
-    way - including extra whitespace.
+def unpacked_to_packed(unpacked_filename, output_file):
+    """ Pack an unpacked EMEVD file (parsed line by line) into a binary EMEVD file.
+
+    This no longer needs Python 2 or HPR's rebuilder.
+    """
+    write_emevd(parse_unpacked(unpacked_filename).event_list(), output_file)
 
-    This is intended only as an example method to quickly convert any events
-    you write with pydses - you can probably come up with your own better way.
 
-    You can specify your Python 2 exe and EMEVD rebuilder with set_python2() and
-    set_rebuilder() above.
+def unpacked_to_verbose(unpacked_filename, output_file):
+    """ Convert unpacked file to verbose (see verbose.py), without Python 2 or HPR.
+
+    Parse errors give the line number of the unpacked file. Template tags are
+    not allowed.
     """
-    global PYTHON_27
-    global REBUILDER
-    command = '{} {} -p \"{}\" -v -o \"{}\"' \
-        .format(PYTHON_27, REBUILDER, unpacked_filename, output_file)
-    subprocess.run(command)
+    events = parse_unpacked(unpacked_filename).event_list()
+    with open(output_file, 'w') as file:
+        write_verbose(events, file)
 
 
 def verbose(event_function, *args):
-    """ Convert an event function you've written (and its arguments) to a
-    temporary verbose EMEVD file, which is then printed for inspection.
+    """ Print an event function you've written (and its arguments) in verbose
+    form for inspection. No files are written.
     """
-    with open('temp.unpack.txt', 'w') as file:
-        with redirect_stdout(file):
-            event_function(*args)
-    unpacked_to_verbose('temp.unpack.txt', 'temp.verbose.txt')
-    with open('temp.verbose.txt', 'r') as file:
-        print('\n' + file.read())
+    with EventBuilder() as builder:
+        event_function(*args)
+    print('\n' + render_verbose(builder.events))
 
 
-def as_string(event_function):
+def as_string(event_function, *args, optimize=False):
     """ Load formatted event into a string variable.
+
+    The event function writes into an in-memory EventBuilder (nothing is
+    printed), which is then rendered in one go. Renders are cached until the
+    event function (or anything it calls) changes; see memo.render_event.
+    If optimize is True, redundant instructions are removed (see optimize.py).
+    """
+    return render_event(event_function, *args, optimize=optimize)
+
+
+def mark(label):
+    """ Mark where a Label (used as the number_lines of a skip) lands: just
+    before the next instruction. See labels.py.
     """
-    with redirect_stdout(io.StringIO()) as new_stdout:
-        event_function()
-        new_stdout.seek(0)
-        return new_stdout.read()
+    current_sink().mark_label(label)
 
 
 def DEBUG_PENDANT():
@@ -206,16 +259,21 @@ def DEBUG_PENDANT():
 """ PRIVATE HELPER FUNCTIONS """
 
 
-def __format_event(event_format, *args):
-    args = list(args)
-    for x in range(len(args)):
-        if isinstance(args[x], Enum):
-            args[x] = args[x].value
-
-    print(' {}[{}] ({}){}'.format(*event_format, args))
+def __format_event(bank, index, *args):
+    # Sends the instruction to the active sink (printed by default, or buffered
+    # inside an EventBuilder). The argument format comes from the shared opcode
+    # registry in layouts.py.
+    args = [arg.value if isinstance(arg, Enum) else arg for arg in args]
+    layout = opcode_layout(bank, index, args)
+    if len(args) != len(layout.arg_format):
+        raise ValueError('Instruction {}[{:02d}] takes {} arguments ({}), not {}.'.format(
+            bank, index, len(layout.arg_format), layout.arg_format, len(args)))
+    current_sink().write_instruction(bank, index, layout, args)
 
 
 def __bint(bool_value):
+    if isinstance(bool_value, Param):
+        return bool_value  # loaded from the event arguments
     return 1 if bool_value else 0
 
 
@@ -228,7 +286,7 @@ def event(event_id, restart_type):
         1: Event will run again if you rest at a bonfire.
         2: Unknown - only used for reassembling skeletons.
     """
-    print('{}, {}'.format(event_id, restart_type))
+    current_sink().write_header(event_id, restart_type)
 
 
 """ 2000: SYSTEM """
@@ -247,15 +305,13 @@ def initialize_event_with_slot(event_slot_number, event_id, *event_args):
     # depending on the event.
     # TODO: Check validity of arguments here.
     # TODO: Fill out event_id to eight digits.
-    event_format = ['2000', '00', 'iII']
     if not event_args: event_args = (0,)
-    return __format_event(event_format, event_slot_number, event_id, *event_args)
+    return __format_event(2000, 0, event_slot_number, event_id, *event_args)
 
 
 # 2
 def set_network_sync(network_sync_state):
-    event_format = ['2000', '02', 'B']
-    return __format_event(event_format, __bint(network_sync_state))
+    return __format_event(2000, 2, __bint(network_sync_state))
 
 
 def disable_network_sync():
@@ -268,16 +324,12 @@ def enable_network_sync():
 
 # 4
 def issue_prefetch_request(request_id):
-    event_format = ['2000', '04', 'I']
-    return __format_event(event_format, request_id)
+    return __format_event(2000, 4, request_id)
 
 
 # 5
 def save_request():
-    group = '2000'
-    index = '05'
-    arg_format = 'B'
-    return __format_event(group, index, arg_format, 0)
+    return __format_event(2000, 5, 0)
 
 
 """ 2002: CUTSCENES """
@@ -285,29 +337,25 @@ def save_request():
 
 # 2
 def play_cutscene_and_warp_player(cutscene_id, playback_method, point_entity_id, area_id, block_id):
-    event_format = ['2002', '02', 'iIiBB']
-    return __format_event(event_format, cutscene_id, playback_method, point_entity_id, area_id, block_id)
+    return __format_event(2002, 2, cutscene_id, playback_method, point_entity_id, area_id, block_id)
 
 
 # 3
 def play_cutscene_to_player(cutscene_id, playback_method, player_entity_id):
-    event_format = ['2002', '03', 'iIi']
-    return __format_event(event_format, cutscene_id, playback_method, player_entity_id)
+    return __format_event(2002, 3, cutscene_id, playback_method, player_entity_id)
 
 
 # 4
 def play_cutscene_and_warp_specific_player(cutscene_id, playback_method, point_entity_id, area_id, block_id,
                                            player_entity_id):
-    event_format = ['2002', '04', 'iIiBBi']
-    return __format_event(event_format, cutscene_id, playback_method, point_entity_id, area_id, block_id,
+    return __format_event(2002, 4, cutscene_id, playback_method, point_entity_id, area_id, block_id,
                           player_entity_id)
 
 
 # 5
 def play_cutscene_and_rotate_player(cutscene_id, playback_method, axis_x, axis_z, rotation, translation_y,
                                     player_entity_id):
-    event_format = ['2002', '05', 'iIffifi']
-    return __format_event(event_format, cutscene_id, playback_method, axis_x, axis_z, rotation, translation_y,
+    return __format_event(2002, 5, cutscene_id, playback_method, axis_x, axis_z, rotation, translation_y,
                           player_entity_id)
 
 
@@ -316,8 +364,7 @@ def play_cutscene_and_rotate_player(cutscene_id, playback_method, axis_x, axis_z
 
 # 1
 def animation_playback_request(entity_id, animation_id, loop, wait_for_completion):
-    event_format = ['2003', '01', 'iiBB']
-    return __format_event(event_format, entity_id, animation_id, __bint(loop), __bint(wait_for_completion))
+    return __format_event(2003, 1, entity_id, animation_id, __bint(loop), __bint(wait_for_completion))
 
 
 # 2
@@ -330,8 +377,7 @@ def disable_event_flag(event_flag_id):
 
 
 def set_event_flag(event_flag_id, desired_state):
-    event_format = ['2003', '02', 'iB']
-    return __format_event(event_format, event_flag_id, __bint(desired_state))
+    return __format_event(2003, 2, event_flag_id, __bint(desired_state))
 
 
 # 3
@@ -344,22 +390,19 @@ def disable_spawner(entity_id):
 
 
 def set_spawner_state(entity_id, desired_state):
-    event_format = ['2003', '03', 'iB']
-    return __format_event(event_format, entity_id, __bint(desired_state))
+    return __format_event(2003, 3, entity_id, __bint(desired_state))
 
 
 # 4
 def award_item_lot(item_lot_id):
     # Directly gives to player (pops up on screen).
-    event_format = ['2003', '04', 'i']
-    return __format_event(event_format, item_lot_id)
+    return __format_event(2003, 4, item_lot_id)
 
 
 # 5
 def shoot_projectile(owner_entity_id, projectile_entity_id, damipoly_id, behavior_id, launch_angle_x, launch_angle_y,
                      launch_angle_z):
-    event_format = ['2003', '05', 'iiiiiii']
-    return __format_event(event_format, owner_entity_id, projectile_entity_id, damipoly_id, behavior_id, launch_angle_x,
+    return __format_event(2003, 5, owner_entity_id, projectile_entity_id, damipoly_id, behavior_id, launch_angle_x,
                           launch_angle_y, launch_angle_z)
 
 
@@ -381,8 +424,7 @@ def cancel_event_id_with_slot(event_id, event_slot_id):
 
 
 def set_event_id_state_with_slot(event_id, event_slot_id, desired_state):
-    event_format = ['2003', '08', 'iiB']
-    return __format_event(event_format, event_id, event_slot_id, __bint(desired_state))
+    return __format_event(2003, 8, event_id, event_slot_id, __bint(desired_state))
 
 
 # 11
@@ -404,33 +446,28 @@ def disable_boss_health_bar_with_slot(entity_id, slot_number, name_id):
 
 def set_boss_health_bar_with_slot(desired_state, entity_id, slot_number, name_id):
     # Note: slot number can only be 0 (bottom) or 1 (top).
-    event_format = ['2003', '11', 'bihh']
-    return __format_event(event_format, desired_state, entity_id, slot_number, name_id)
+    return __format_event(2003, 11, desired_state, entity_id, slot_number, name_id)
 
 
 # 12
 def kill_boss(entity_id):
-    event_format = ['2003', '12', 'i']
-    return __format_event(event_format, entity_id)
+    return __format_event(2003, 12, entity_id)
 
 
 # 13
 def modify_navmesh_collision_bitflags(entity_id, navimesh_collision_bit, modification_type):
     # Modification type: 0 = add, 1 = delete, 2 = invert
-    event_format = ['2003', '13', 'iIB']
-    return __format_event(event_format, entity_id, navimesh_collision_bit, modification_type)
+    return __format_event(2003, 13, entity_id, navimesh_collision_bit, modification_type)
 
 
 # 14
 def warp_player(area_id, block_id, area_entity_id):
-    event_format = ['2003', '14', 'BBi']
-    return __format_event(event_format, area_id, block_id, area_entity_id)
+    return __format_event(2003, 14, area_id, block_id, area_entity_id)
 
 
 # 16
 def trigger_multiplayer_event(multiplayer_event_id):
-    event_format = ['2003', '16', 'i']
-    return __format_event(event_format, multiplayer_event_id)
+    return __format_event(2003, 16, multiplayer_event_id)
 
 
 # 17
@@ -443,26 +480,23 @@ def randomly_disable_one_flag_in_range(start_event_flag_id, end_event_flag_id):
 
 
 def randomly_set_one_flag_in_range(start_event_flag_id, end_event_flag_id, desired_state):
-    event_format = ['2003', '17', 'IIB']
-    return __format_event(event_format, start_event_flag_id, end_event_flag_id, __bint(desired_state))
+    check_flag_range(start_event_flag_id, end_event_flag_id)
+    return __format_event(2003, 17, start_event_flag_id, end_event_flag_id, __bint(desired_state))
 
 
 # 18
 def force_animation(entity_id, animation_id, loop, wait_for_completion, do_not_wait_for_transition):
-    event_format = ['2003', '18', 'iiBBB']
-    return __format_event(event_format, entity_id, animation_id, __bint(loop), __bint(wait_for_completion), __bint(do_not_wait_for_transition))
+    return __format_event(2003, 18, entity_id, animation_id, __bint(loop), __bint(wait_for_completion), __bint(do_not_wait_for_transition))
 
 
 # 19
 def set_area_texture_parambank_slot_index(area_id, texture_parambank_slot_index):
-    event_format = ['2003', '19', 'hh']
-    return __format_event(event_format, area_id, texture_parambank_slot_index)
+    return __format_event(2003, 19, area_id, texture_parambank_slot_index)
 
 
 # 21
 def increment_ngplus_counter():
-    event_format = ['2003', '21', 'B']
-    return __format_event(event_format, 0)
+    return __format_event(2003, 21, 0)
 
 
 # 22
@@ -475,91 +509,78 @@ def disable_all_flags_in_range(start_event_flag_id, end_event_flag_id):
 
 
 def set_all_flags_in_range(start_event_flag_id, end_event_flag_id, desired_state):
-    event_format = ['2003', '22', 'iiB']
-    return __format_event(event_format, start_event_flag_id, end_event_flag_id, desired_state)
+    check_flag_range(start_event_flag_id, end_event_flag_id)
+    return __format_event(2003, 22, start_event_flag_id, end_event_flag_id, desired_state)
 
 
 # 23
 def set_player_respawn_point(respawn_point_id):
-    event_format = ['2003', '23', 'i']
-    return __format_event(event_format, respawn_point_id)
+    return __format_event(2003, 23, respawn_point_id)
 
 
 # 24
 def remove_items_from_player(item_type, item_id, quantity):
     # Quantity may be broken (always removes all).
-    event_format = ['2003', '24', 'iii']
-    return __format_event(event_format, item_type, item_id, quantity)
+    return __format_event(2003, 24, item_type, item_id, quantity)
 
 
 # 25
 def place_NPC_summon_sign(sign_type, entity_id, summon_point, summon_event_flag_id, dismissal_event_flag_id):
-    event_format = ['2003', '25', 'iiiii']
-    return __format_event(event_format, sign_type, entity_id, summon_point, summon_event_flag_id,
+    return __format_event(2003, 25, sign_type, entity_id, summon_point, summon_event_flag_id,
                           dismissal_event_flag_id)
 
 
 # 26
 def set_tip_message_visibility(entity_id, desired_state):
-    event_format = ['2003', '26', 'iB']
-    return __format_event(event_format, entity_id, desired_state)
+    return __format_event(2003, 26, entity_id, desired_state)
 
 
 # 28
 def award_achievement(achievement_id):
-    event_format = ['2003', '28', 'i']
-    return __format_event(event_format, achievement_id)
+    return __format_event(2003, 28, achievement_id)
 
 
 # 30
 def set_vagrant_spawning(desired_state):
     # 1 = disable
-    event_format = ['2003', '30', 'B']
-    return __format_event(event_format, desired_state)
+    return __format_event(2003, 30, desired_state)
 
 
 # 31
 def increment_event_value(event_flag_id, number_bits, max_value):
-    event_format = ['2003', '31', 'iII']
-    return __format_event(event_format, event_flag_id, number_bits, max_value)
+    return __format_event(2003, 31, event_flag_id, number_bits, max_value)
 
 
 # 32
 def clear_event_value(event_flag_id, number_bits):
-    event_format = ['2003', '32', 'iI']
-    return __format_event(event_format, event_flag_id, number_bits)
+    return __format_event(2003, 32, event_flag_id, number_bits)
 
 
 # 33
 def set_snuggly_next_trade(event_flag_id):
-    event_format = ['2003', '33', 'i']
-    return __format_event(event_format, event_flag_id)
+    return __format_event(2003, 33, event_flag_id)
 
 
 # 34
 def snuggly_item_drop(item_lot_id, area_entity_id, event_flag_id, hitbox_entity_id):
-    event_format = ['2003', '34', 'iiii']
-    return __format_event(event_format, item_lot_id, area_entity_id, event_flag_id, hitbox_entity_id)
+    return __format_event(2003, 34, item_lot_id, area_entity_id, event_flag_id, hitbox_entity_id)
 
 
 # 35
 def move_dropped_items_and_bloodstains(source_area_entity_id, destination_area_entity_id):
-    event_format = ['2003', '35', 'ii']
-    return __format_event(event_format, source_area_entity_id, destination_area_entity_id)
+    return __format_event(2003, 35, source_area_entity_id, destination_area_entity_id)
 
 
 # 36
 def award_item_to_host_only(item_lot_id):
-    event_format = ['2003', '36', 'i']
-    return __format_event(event_format, item_lot_id)
+    return __format_event(2003, 36, item_lot_id)
 
 
 # Note: 37-40 are Battle of Stoicism events that I haven't bothered with.
 
 # 41
 def activate_player_killplane(map_id, block_id, threshold_Y, target_model_id):
-    event_format = ['2003', '41', 'iifi']
-    return __format_event(event_format, map_id, block_id, threshold_Y, target_model_id)
+    return __format_event(2003, 41, map_id, block_id, threshold_Y, target_model_id)
 
 
 """ 2004: CHARACTER """
@@ -575,8 +596,7 @@ def disable_ai(entity_id):
 
 
 def set_ai(entity_id, desired_state):
-    event_format = ['2004', '01', 'iB']
-    return __format_event(event_format, entity_id, __bint(desired_state))
+    return __format_event(2004, 1, entity_id, __bint(desired_state))
 
 
 # 2
@@ -607,22 +627,19 @@ def switch_allegiance(entity_id, new_team):
         12: "Fighting Ally",
         13: "Intruder"
     """
-    event_format = ['2004', '02', 'ib']
-    return __format_event(event_format, entity_id, new_team)
+    return __format_event(2004, 2, entity_id, new_team)
 
 
 # 3
 def warp(entity_id, warp_destination_type, destination_target_id, damipoly_id):
     # Technically a warp 'request.'
-    event_format = ['2004', '03', 'iBii']
-    return __format_event(event_format, entity_id, warp_destination_type, destination_target_id, damipoly_id)
+    return __format_event(2004, 3, entity_id, warp_destination_type, destination_target_id, damipoly_id)
 
 
 # 4
 def kill(entity_id, yields_souls=0):
     # Technically a kill 'request.'
-    event_format = ['2004', '04', 'iB']
-    return __format_event(event_format, entity_id, __bint(yields_souls))
+    return __format_event(2004, 4, entity_id, __bint(yields_souls))
 
 
 # 5
@@ -635,29 +652,25 @@ def disable(entity_id):
 
 
 def set_character_state(entity_id, desired_state):
-    event_format = ['2004', '05', 'ib']
-    return __format_event(event_format, entity_id, __bint(desired_state))
+    return __format_event(2004, 5, entity_id, __bint(desired_state))
 
 
 # 6
 def ezstate_instruction_request(entity_id, command_id, slot_number):
     # Slot number from 0-3.
-    event_format = ['2004', '06', 'iiB']
-    return __format_event(event_format, entity_id, command_id, slot_number)
+    return __format_event(2004, 6, entity_id, command_id, slot_number)
 
 
 # 7
 def create_spawner(entity_id):
     # Technically create 'bullet owner.'
-    event_format = ['2004', '07', 'i']
-    return __format_event(event_format, entity_id)
+    return __format_event(2004, 7, entity_id)
 
 
 # 8
 def set_special_effect(entity_id, special_effect_id):
     # 'Special effect' as in buff/debuff, not graphics.
-    event_format = ['2004', '08', 'ii']
-    return __format_event(event_format, entity_id, special_effect_id)
+    return __format_event(2004, 8, entity_id, special_effect_id)
 
 
 # 9
@@ -668,8 +681,7 @@ def set_standby_animation_settings_to_default(entity_id):
 def set_standby_animation_settings(entity_id, standby_animation, damage_animation, cancel_animation, death_animation,
                                    standby_return_animation):
     # Sets entity's standby animations. -1 is default for each category.
-    event_format = ['2004', '09', 'iiiiii']
-    return __format_event(event_format, entity_id, standby_animation, damage_animation, cancel_animation,
+    return __format_event(2004, 9, entity_id, standby_animation, damage_animation, cancel_animation,
                           death_animation, standby_return_animation)
 
 
@@ -686,29 +698,25 @@ def set_gravity(entity_id, desired_state):
     # 1 = disabled
     # Does NOT allow any sort of RigidBody activity, but rather determines if
     # the entity changes height as it moves around.
-    event_format = ['2004', '10', 'iB']
-    return __format_event(event_format, entity_id, __bint(desired_state))
+    return __format_event(2004, 10, entity_id, __bint(desired_state))
 
 
 # 12
 def set_immortality(entity_id, desired_state):
     # Character will take damage, but not die.
-    event_format = ['2004', '12', 'iB']
-    return __format_event(event_format, entity_id, __bint(desired_state))
+    return __format_event(2004, 12, entity_id, __bint(desired_state))
 
 
 # 13
 def set_nest(entity_id, area_id):
     # Home point for entity AI.
-    event_format = ['2004', '13', 'ii']
-    return __format_event(event_format, entity_id, area_id)
+    return __format_event(2004, 13, entity_id, area_id)
 
 
 # 14
 def rotate_to_face_entity(entity_id, target_entity_id):
     # Rotate first entity to face towards second.
-    event_format = ['2004', '14', 'ii']
-    return __format_event(event_format, entity_id, target_entity_id)
+    return __format_event(2004, 14, entity_id, target_entity_id)
 
 
 # 15
@@ -722,94 +730,80 @@ def disable_invincibility(entity_id):
 
 def set_invincibility(entity_id, desired_state):
     # Character cannot take damage or die.
-    event_format = ['2004', '15', 'iB']
-    return __format_event(event_format, entity_id, __bint(desired_state))
+    return __format_event(2004, 15, entity_id, __bint(desired_state))
 
 
 # 16
 def clear_ai_target_list(entity_id):
-    event_format = ['2004', '16', 'i']
-    return __format_event(event_format, entity_id)
+    return __format_event(2004, 16, entity_id)
 
 
 # 17
 def ai_instruction(entity_id, command_id, slot_number):
-    event_format = ['2004', '17', 'iiB']
-    return __format_event(event_format, entity_id, command_id, slot_number)
+    return __format_event(2004, 17, entity_id, command_id, slot_number)
 
 
 # 18
 def set_event_point(entity_id, event_area_entity_id, reaction_range):
     # TODO: No idea what this does yet.
-    event_format = ['2004', '18', 'iif']
-    return __format_event(event_format, entity_id, event_area_entity_id, reaction_range)
+    return __format_event(2004, 18, entity_id, event_area_entity_id, reaction_range)
 
 
 # 19
 def set_ai_id(entity_id, ai_id):
-    event_format = ['2004', '19', 'ii']
-    return __format_event(event_format, entity_id, ai_id)
+    return __format_event(2004, 19, entity_id, ai_id)
 
 
 # 20
 def replan_ai(entity_id):
     # Force entity to re-plan AI.
-    event_format = ['2004', '20', 'i']
-    return __format_event(event_format, entity_id)
+    return __format_event(2004, 20, entity_id)
 
 
 # 21
 def cancel_special_effect(entity_id, special_effect_id):
-    event_format = ['2004', '21', 'ii']
-    return __format_event(event_format, entity_id, special_effect_id)
+    return __format_event(2004, 21, entity_id, special_effect_id)
 
 
 # 22
 def create_multipart_NPC_part(entity_id, part_npc_type, part_index, part_health,
                               damage_correction, body_damage_correction, is_invincible, start_in_stop_state):
     # Obviously complex and I'm not planning to do much other than copy existing use.
-    event_format = ['2004', '22', 'ihhiffBB']
-    return __format_event(event_format, entity_id, part_npc_type, part_index, part_health,
+    return __format_event(2004, 22, entity_id, part_npc_type, part_index, part_health,
                           damage_correction, body_damage_correction, __bint(is_invincible), __bint(start_in_stop_state))
 
 
 # 23
 def set_multipart_NPC_part_health(entity_id, part_npc_type, desired_hp, overwrite_max):
-    event_format = ['2004', '23', 'iiiB']
-    return __format_event(event_format, entity_id, part_npc_type, desired_hp, __bint(overwrite_max))
+    return __format_event(2004, 23, entity_id, part_npc_type, desired_hp, __bint(overwrite_max))
 
 
 # 24
 def set_multipart_NPC_part_effects(entity_id, part_npc_type, material_special_effect_id, material_SFX_id):
-    event_format = ['2004', '24', 'iiii']
-    return __format_event(event_format, entity_id, part_npc_type, material_special_effect_id, material_SFX_id)
+    return __format_event(2004, 24, entity_id, part_npc_type, material_special_effect_id, material_SFX_id)
 
 
 # 25
 def set_multipart_NPC_part_bullet_damage_scaling(entity_id, part_npc_type, desired_scaling):
-    event_format = ['2004', '25', 'iif']
-    return __format_event(event_format, entity_id, part_npc_type, desired_scaling)
+    return __format_event(2004, 25, entity_id, part_npc_type, desired_scaling)
 
 
 # 26
 def set_display_mask(entity_id, bit_number, switch_type):
     # 0 = off, 1 = on, 2 = change
-    event_format = ['2004', '26', 'iBB']
-    return __format_event(event_format, entity_id, bit_number, switch_type)
+    return __format_event(2004, 26, entity_id, bit_number, switch_type)
 
 
 # 27
 def set_hitbox_mask(entity_id, bit_number, switch_type):
     # 0 = off, 1 = on, 2 = change
-    event_format = ['2004', '27', 'iBB']
-    return __format_event(event_format, entity_id, bit_number, switch_type)
+    return __format_event(2004, 27, entity_id, bit_number, switch_type)
 
 
 # 28
 def set_network_update_authority(entity_id, authority_level):
     # 0 = normal, 4095 = forced (or -1 I assume)
-    event_format = ['2004', '28', 'ii']
-    return __format_event(event_format, entity_id, authority_level)
+    return __format_event(2004, 28, entity_id, authority_level)
 
 
 # 29
@@ -825,8 +819,7 @@ def set_backread_state(entity_id, desired_state):
     # 'Setting to remove from back lead' - involved in permanent disabling
     # 1 = remove, 0 = don't remove
     # Not sure if it can be restored once removed
-    event_format = ['2004', '29', 'iB']
-    return __format_event(event_format, entity_id, __bint(desired_state))
+    return __format_event(2004, 29, entity_id, __bint(desired_state))
 
 
 # 30
@@ -840,8 +833,7 @@ def disable_health_bar(entity_id):
 
 def set_health_bar_display(entity_id, desired_state):
     # Normal bar, not boss bar.
-    event_format = ['2004', '30', 'iB']
-    return __format_event(event_format, entity_id, __bint(desired_state))
+    return __format_event(2004, 30, entity_id, __bint(desired_state))
 
 
 # 31
@@ -855,23 +847,20 @@ def disable_collision(entity_id):
 
 def set_collision(entity_id, disable_collision):
     # 1 = no collision
-    event_format = ['2004', '31', 'iB']
-    return __format_event(event_format, entity_id, __bint(disable_collision))
+    return __format_event(2004, 31, entity_id, __bint(disable_collision))
 
 
 # 32
 def ai_event(entity_id, command_id, slot_number, start_event_flag_id, end_event_flag_id):
     # Complex AI stuff.
     # TODO: Check usage.
-    event_format = ['2004', '32', 'iiBii']
-    return __format_event(event_format, entity_id, command_id, slot_number, start_event_flag_id, end_event_flag_id)
+    return __format_event(2004, 32, entity_id, command_id, slot_number, start_event_flag_id, end_event_flag_id)
 
 
 # 33
 def refer_damage_to_entity(entity_id, target_entity_id):
     # Damage to first entity affects second (a la Four Kings).
-    event_format = ['2004', '33', 'ii']
-    return __format_event(event_format, entity_id, target_entity_id)
+    return __format_event(2004, 33, entity_id, target_entity_id)
 
 
 # 34
@@ -883,36 +872,31 @@ def set_network_update_rate(entity_id, is_fixed, frequency):
         2: "Every 2 frames",
         5: "Every 5 frames
     """
-    event_format = ['2004', '34', 'iBb']
-    return __format_event(event_format, entity_id, __bint(is_fixed), frequency)
+    return __format_event(2004, 34, entity_id, __bint(is_fixed), frequency)
 
 
 # 35
 def set_backread_state_alternate(entity_id, desired_state):
     # Not sure how this relates to 2004[29] above.
     # TODO: Check and compare usage.
-    event_format = ['2004', '35', 'iB']
-    return __format_event(event_format, entity_id, __bint(desired_state))
+    return __format_event(2004, 35, entity_id, __bint(desired_state))
 
 
 # 36
 def hellkite_breath_control(entity_id, object_entity_id, animation_id):
     # I don't expect to be reusing this, obviously.
-    event_format = ['2004', '36', 'iii']
-    return __format_event(event_format, entity_id, object_entity_id, animation_id)
+    return __format_event(2004, 36, entity_id, object_entity_id, animation_id)
 
 
 # 37
 def drop_mandatory_treasure(entity_id):
     # Forces drop of mandatory treasure, e.g. NPC drop on reload.
-    event_format = ['2004', '37', 'i']
-    return __format_event(event_format, entity_id)
+    return __format_event(2004, 37, entity_id)
 
 
 # 38
 def betray_current_covenant():
-    event_format = ['2004', '38', 'B']
-    return __format_event(event_format, 0)
+    return __format_event(2004, 38, 0)
 
 
 # 39
@@ -925,36 +909,33 @@ def disable_animations(entity_id):
 
 
 def set_animation_state(entity_id, desired_state):
-    event_format = ['2004', '39', 'iB']
-    return __format_event(event_format, entity_id, __bint(desired_state))
+    return __format_event(2004, 39, entity_id, __bint(desired_state))
 
 
 # 40
-def warp_and_set_floor(entity_id, warp_destination_type, damipoly_id, destination_entity_id):
+def warp_and_set_floor(entity_id, warp_destination_type, damipoly_id, destination_entity_id, floor_entity_id):
     # Type: 0 = object, 1 = area, 2 = character
-    event_format = ['2004', '40', 'iBiii']
-    return __format_event(event_format, entity_id, warp_destination_type, damipoly_id, destination_entity_id)
+    # The floor is the hitbox entity the warped entity will be standing on.
+    return __format_event(2004, 40, entity_id, warp_destination_type, destination_entity_id, damipoly_id,
+                          floor_entity_id)
 
 
 # 41
 def short_warp(entity_id, warp_destination_type, destination_target_id, damipoly_id):
-    event_format = ['2004', '41', 'iBii']
-    return __format_event(event_format, entity_id, warp_destination_type, destination_target_id, damipoly_id)
+    return __format_event(2004, 41, entity_id, warp_destination_type, destination_target_id, damipoly_id)
 
 
 # 42
 def warp_and_copy_floor(entity_id, warp_destination_type, destination_target_id, damipoly_id, copy_floor_of_entity_id):
     # Type: 0 = object, 1 = area, 2 = character
-    event_format = ['2004', '42', 'iBiii']
-    return __format_event(event_format, entity_id, warp_destination_type, destination_target_id, damipoly_id,
+    return __format_event(2004, 42, entity_id, warp_destination_type, destination_target_id, damipoly_id,
                           copy_floor_of_entity_id)
 
 
 # 43
 def reset_animation(entity_id, disable_interpolation):
     # 0 = interpolated, 1 = not interpolated
-    event_format = ['2004', '43', 'iB']
-    return __format_event(event_format, entity_id, __bint(disable_interpolation))
+    return __format_event(2004, 43, entity_id, __bint(disable_interpolation))
 
 
 # 44
@@ -977,8 +958,7 @@ def change_allegiance_and_exit_standby_animation(entity_id, new_team):
         12: "Fighting Ally",
         13: "Intruder"
     """
-    event_format = ['2004', '44', 'iB']
-    return __format_event(event_format, entity_id, new_team)
+    return __format_event(2004, 44, entity_id, new_team)
 
 
 # 45
@@ -986,20 +966,18 @@ def NPC_humanity_registration(entity_id, event_flag_id):
     # Not known exactly what the event flag does, but this instruction is
     # always called to initialize NPCs who drop humanity. It probably makes the
     # game's sin system aware of the NPC's death, etc.
-    event_format = ['2004', '45', 'ii']
-    return __format_event(event_format, entity_id, event_flag_id)
+    return __format_event(2004, 45, entity_id, event_flag_id)
 
 
 # 46
 def increment_player_pvp_sin():
-    event_format = ['2004', '46', 'B']
-    return __format_event(event_format, 0)
+    return __format_event(2004, 46, 0)
 
 
 # 47
 def equal_recovery():
     # No arguments; HPR speculates that it may trigger a garbage collection.
-    return '2004[47]'
+    return __format_event(2004, 47)
 
 
 """ 2005: OBJECT """
@@ -1009,14 +987,12 @@ def equal_recovery():
 def destroy_object(entity_id, slot_number):
     # Technically requests the object's destruction. Not sure what the slot
     # number does.
-    event_format = ['2005', '01', 'ib']
-    return __format_event(event_format, entity_id, slot_number)
+    return __format_event(2005, 1, entity_id, slot_number)
 
 
 # 2
 def restore_object(entity_id):
-    event_format = ['2005', '02', 'i']
-    return __format_event(event_format, entity_id)
+    return __format_event(2005, 2, entity_id)
 
 
 # 3
@@ -1029,8 +1005,7 @@ def disable_object(entity_id):
 
 
 def set_object_state(entity_id, activation_status):
-    event_format = ['2005', '03', 'iB']
-    return __format_event(event_format, entity_id, activation_status)
+    return __format_event(2005, 3, entity_id, activation_status)
 
 
 # 4
@@ -1043,15 +1018,13 @@ def disable_treasure(entity_id):
 
 
 def set_treasure_state(entity_id, activation_status):
-    event_format = ['2005', '04', 'iB']
-    return __format_event(event_format, entity_id, activation_status)
+    return __format_event(2005, 4, entity_id, activation_status)
 
 
 # 5
 def start_object_activation(entity_id, object_parameter_id, relative_idx):
     # Calls ObjAct function of object. Not sure what relative IDX does.
-    event_format = ['2005', '05', 'iii']
-    return __format_event(event_format, entity_id, object_parameter_id, relative_idx)
+    return __format_event(2005, 5, entity_id, object_parameter_id, relative_idx)
 
 
 # 6
@@ -1065,22 +1038,19 @@ def disable_object_activation(entity_id, object_parameter_id):
 
 def set_object_activation(entity_id, object_parameter_id, activation_status):
     # Sets whether the object can be activated (1) or not activated (0).
-    event_format = ['2005', '06', 'iiB']
-    return __format_event(event_format, entity_id, object_parameter_id, activation_status)
+    return __format_event(2005, 6, entity_id, object_parameter_id, activation_status)
 
 
 # 7
 def skip_to_end_of_animation(entity_id, animation_id):
     # Sets object to whatever state it would have given the activation.
-    event_format = ['2005', '07', 'ii']
-    return __format_event(event_format, entity_id, animation_id)
+    return __format_event(2005, 7, entity_id, animation_id)
 
 
 # 8
 def skip_to_end_of_destruction(entity_id, slot_number):
     # Sets object to whatever state it would have after destruction.
-    event_format = ['2005', '08', 'ib']
-    return __format_event(event_format, entity_id, slot_number)
+    return __format_event(2005, 8, entity_id, slot_number)
 
 
 # 9
@@ -1094,8 +1064,7 @@ def create_damaging_object(entity_flag_id, entity_id, damipoly_id, behavior_id,
         2: Map
         3: Character and Map
     """
-    event_format = ['2005', '09', 'iiiiifff']
-    return __format_event(event_format, entity_flag_id, entity_id, damipoly_id, behavior_id, target_type, radius, life,
+    return __format_event(2005, 9, entity_flag_id, entity_id, damipoly_id, behavior_id, target_type, radius, life,
                           repetition_time)
 
 
@@ -1103,22 +1072,19 @@ def create_damaging_object(entity_flag_id, entity_id, damipoly_id, behavior_id,
 def register_statue_object(entity_id, area_number, block_number, statue_type):
     # I believe this creates a petrified or crystallized statue.
     # TODO: Check usage.
-    event_format = ['2005', '10', 'iBBB']
-    return __format_event(event_format, entity_id, area_number, block_number, statue_type)
+    return __format_event(2005, 10, entity_id, area_number, block_number, statue_type)
 
 
 # 11
 def warp_object_to_character(entity_id, character_entity_id, damipoly_id):
     # TODO: Check when this is actually used, as I'm not sure what use it has.
-    event_format = ['2005', '11', 'iih']
-    return __format_event(event_format, entity_id, character_entity_id, damipoly_id)
+    return __format_event(2005, 11, entity_id, character_entity_id, damipoly_id)
 
 
 # 12
 def remove_object_event_flag(event_flag_id):
     # TODO: Check when this is actually used.
-    event_format = ['2005', '12', 'i']
-    return __format_event(event_format, event_flag_id)
+    return __format_event(2005, 12, event_flag_id)
 
 
 # 13
@@ -1132,8 +1098,7 @@ def disable_object_invulnerability(entity_id):
 
 def set_object_invulnerability(entity_id, invulnerability_state):
     # 1 = invulnerable
-    event_format = ['2005', '13', 'iB']
-    return __format_event(event_format, entity_id, invulnerability_state)
+    return __format_event(2005, 13, entity_id, invulnerability_state)
 
 
 # 14
@@ -1146,15 +1111,13 @@ def deactivate_object_with_idx(entity_id, object_parameter_id, relative_idx):
 
 
 def set_object_activation_with_idx(entity_id, object_parameter_id, relative_idx, activation_state):
-    event_format = ['2005', '14', 'iiiB']
-    return __format_event(event_format, entity_id, object_parameter_id, relative_idx, activation_state)
+    return __format_event(2005, 14, entity_id, object_parameter_id, relative_idx, activation_state)
 
 
 # 15
 def enable_treasure_collection(entity_id):
     # TODO: Speculated use only. Check usage.
-    event_format = ['2005', '15', 'i']
-    return __format_event(event_format, entity_id)
+    return __format_event(2005, 15, entity_id)
 
 
 """ 2006: SFX """
@@ -1163,15 +1126,12 @@ def enable_treasure_collection(entity_id):
 # 1
 def delete_map_sfx(entity_id, erase_root_only=True):
     # Erasing the root only probably allows easy recreation later (default).
-    event_format = ['2006', '01', 'iB']
-
-    return __format_event(event_format, entity_id, __bint(erase_root_only))
+    return __format_event(2006, 1, entity_id, __bint(erase_root_only))
 
 
 # 2
 def create_map_sfx(entity_id):
-    event_format = ['2006', '02', 'i']
-    return __format_event(event_format, entity_id)
+    return __format_event(2006, 2, entity_id)
 
 
 # 3
@@ -1182,21 +1142,18 @@ def create_oneoff_sfx(sfx_type, entity_id, damipoly_id, sfx_id):
         1: "Area",
         2: "Character"
     """
-    event_format = ['2006', '03', 'iiii']
-    return __format_event(event_format, sfx_type, entity_id, damipoly_id, sfx_id)
+    return __format_event(2006, 3, sfx_type, entity_id, damipoly_id, sfx_id)
 
 
 # 4
 def create_object_sfx(entity_id, damipoly_id, sfx_id):
-    event_format = ['2006', '04', 'iii']
-    return __format_event(event_format, entity_id, damipoly_id, sfx_id)
+    return __format_event(2006, 4, entity_id, damipoly_id, sfx_id)
 
 
 # 5
 def delete_object_sfx(entity_id, erase_root=True):
     # Note `erase_root` vs. `erase_root_only` for map SFX.
-    event_format = ['2006', '05', 'ii']
-    return __format_event(event_format, entity_id, __bint(erase_root))
+    return __format_event(2006, 5, entity_id, __bint(erase_root))
 
 
 """ 2007: MESSAGE """
@@ -1214,8 +1171,7 @@ def display_generic_dialog(message_id, button_type, number_buttons, entity_id, d
         2: "2 Button",
         6: "No Button"
     """
-    event_format = ['2007', '01', 'ihhif']
-    return __format_event(event_format, message_id, button_type, number_buttons, entity_id, display_distance)
+    return __format_event(2007, 1, message_id, button_type, number_buttons, entity_id, display_distance)
 
 
 # 2
@@ -1236,23 +1192,20 @@ def display_text_banner(banner_type):
         16: "Stadium Defeat",
         17: "Stadium Draw"
     """
-    event_format = ['2007', '02', 'B']
-    return __format_event(event_format, banner_type)
+    return __format_event(2007, 2, banner_type)
 
 
 # 3
 def display_status_explanation_message(message_id, pad_enabled=0):
     # Displays messages explaining curse, no bonfire warp, etc.
     # TODO: Check usage for pad_enabled; when would it be used?
-    event_format = ['2007', '03', 'iB']
-    return __format_event(event_format, message_id, pad_enabled)
+    return __format_event(2007, 3, message_id, pad_enabled)
 
 
 # 4
 def display_battlefield_message(message_id, display_location_index):
     # TODO: Check usage.
-    event_format = ['2007', '04', 'iB']
-    return __format_event(event_format, message_id, display_location_index)
+    return __format_event(2007, 4, message_id, display_location_index)
 
 
 # 5-9 are Battle of Stoicism messages, not bothering for now.
@@ -1265,8 +1218,7 @@ def set_locked_camera_slot_number(area_id, block_id, locked_camera_slot_number):
     # This doesn't seem to be used as often as I'd expect, given the number
     # of different camera settings in the params. Camera settings triggered by
     # boss battles may be handled elsewhere.
-    event_format = ['2008', '03', 'BBH']
-    return __format_event(event_format, area_id, block_id, locked_camera_slot_number)
+    return __format_event(2008, 3, area_id, block_id, locked_camera_slot_number)
 
 
 """ 2009: SCRIPT """
@@ -1276,8 +1228,7 @@ def set_locked_camera_slot_number(area_id, block_id, locked_camera_slot_number):
 def register_ladder(event_flag_id_1, event_flag_id_2, entity_id):
     # Not sure what the different event flags do. Called on area initialization
     # to make ladders interactable.
-    event_format = ['2009', '00', 'iii']
-    return __format_event(event_format, event_flag_id_1, event_flag_id_2, entity_id)
+    return __format_event(2009, 0, event_flag_id_1, event_flag_id_2, entity_id)
 
 
 # 3
@@ -1286,23 +1237,20 @@ def register_bonfire(event_flag_id, entity_id, reaction_distance, reaction_angle
     # I assume that the reaction arguments restrict the distance and angle from
     # which you can activate the bonfire. The last argument might determine
     # where you spawn at the bonfire, but it's not a float.
-    event_format = ['2009', '03', 'iiffi']
-    return __format_event(event_format, event_flag_id, entity_id, reaction_distance, reaction_angle,
+    return __format_event(2009, 3, event_flag_id, entity_id, reaction_distance, reaction_angle,
                           initial_basic_spot_point)
 
 
 # 4
 def activate_NPC_buffs(entity_id):
-    event_format = ['2009', '04', 'i']
-    return __format_event(event_format, entity_id)
+    return __format_event(2009, 4, entity_id)
 
 
 # 6
 def notify_boss_room_entry():
     # Triggers message for summons that player has challenged the boss.
     # Might do other things for online play as well, no doubt.
-    event_format = ['2009', '06', 'B']
-    return __format_event(event_format, 0)
+    return __format_event(2009, 6, 0)
 
 
 """ 2010: SOUND """
@@ -1325,8 +1273,7 @@ def play_sound_effect(entity_id, sound_type, sound_id):
         9: "b: Armor Material Dependence",
         10: "g: Ghost"
     """
-    event_format = ['2010', '02', 'iii']
-    return __format_event(event_format, entity_id, sound_type, sound_id)
+    return __format_event(2010, 2, entity_id, sound_type, sound_id)
 
 
 # 3
@@ -1340,8 +1287,7 @@ def disable_map_sound(entity_id):
 
 def set_map_sound(entity_id, sound_state):
     # Includes boss music, which is obviously the most common use.
-    event_format = ['2010', '03', 'iB']
-    return __format_event(event_format, entity_id, sound_state)
+    return __format_event(2010, 3, entity_id, sound_state)
 
 
 """ 2011: HIT """
@@ -1358,8 +1304,7 @@ def disable_hitbox(entity_id):
 
 def set_hitbox_state(entity_id, activation_state):
     # 1 = Hitbox is enabled.
-    event_format = ['2011', '01', 'iB']
-    return __format_event(event_format, entity_id, activation_state)
+    return __format_event(2011, 1, entity_id, activation_state)
 
 
 """ 2012: MAP """
@@ -1376,8 +1321,7 @@ def disable_map_part(map_part_id):
 
 def set_map_part_state(map_part_id, activation_state):
     # TODO: Check usage of this.
-    event_format = ['2012', '01', 'iB']
-    return __format_event(event_format, map_part_id, activation_state)
+    return __format_event(2012, 1, map_part_id, activation_state)
 
 
 """ 1000: EXECUTION CONTROL (SYSTEM) """
@@ -1404,8 +1348,7 @@ def skip_if_condition_state(number_lines, required_state, condition):
     (execution_condition.main, execution_condition.and1, execution_condition.or1, etc)
     OR, alternatively, as constants found directly within event_enums (MAIN, AND1, OR1, etc)
     """
-    event_format = ['1000', '01', 'BBb']
-    return __format_event(event_format, number_lines, required_state, condition)
+    return __format_event(1000, 1, number_lines, required_state, condition)
 
 
 # 2
@@ -1434,15 +1377,13 @@ def end_if_condition_false(condition = 0):
 
 
 def terminate_if_condition_state(event_end_type, required_state, condition):
-    event_format = ['1000', '02', 'BBb']
-    return __format_event(event_format, event_end_type, required_state, condition)
+    return __format_event(1000, 2, event_end_type, required_state, condition)
 
 
 # 3
 def skip(number_lines):
     # Unconditional line skip.
-    event_format = ['1000', '03', 'B']
-    return __format_event(event_format, number_lines)
+    return __format_event(1000, 3, number_lines)
 
 
 # 4
@@ -1458,8 +1399,7 @@ def end():
 
 def terminate(event_end_type):
     # Unconditional event termination (1 = restart).
-    event_format = ['1000', '04', 'B']
-    return __format_event(event_format, event_end_type)
+    return __format_event(1000, 4, event_end_type)
 
 
 # 5
@@ -1498,8 +1438,7 @@ def skip_if_value_comparison(number_lines, comparison_type, left, right):
         4: ">=",
         5: "<="
     """
-    event_format = ['1000', '05', 'Bbii']
-    return __format_event(event_format, number_lines, comparison_type, left, right)
+    return __format_event(1000, 5, number_lines, comparison_type, left, right)
 
 
 # 6
@@ -1563,8 +1502,7 @@ def terminate_if_value_comparison(event_end_type, comparison_type, left, right):
         4: ">=",
         5: "<="
     """
-    event_format = ['1000', '06', 'Bbii']
-    return __format_event(event_format, event_end_type, comparison_type, left, right)
+    return __format_event(1000, 6, event_end_type, comparison_type, left, right)
 
 
 # 7
@@ -1583,8 +1521,7 @@ def skip_if_condition_state_finished(number_lines, required_state, condition):
     # "finished condition group" (condition) rather than simply "condition
     # group". This may use the condition in a slightly different way.
     # TODO: Examine when this is used versus 1000[01].
-    event_format = ['1000', '07', 'BBb']
-    return __format_event(event_format, number_lines, required_state, condition)
+    return __format_event(1000, 7, number_lines, required_state, condition)
 
 
 # 8
@@ -1615,15 +1552,13 @@ def end_if_condition_false_finished(condition = 0):
 def terminate_if_condition_state_finished(event_end_type, required_state, condition):
     # See 1000[07]; unclear how this differs from 1000[02].
     # TODO: Examine usage of this vs. 1000[02].
-    event_format = ['1000', '08', 'BBb']
-    return __format_event(event_format, event_end_type, required_state, condition)
+    return __format_event(1000, 8, event_end_type, required_state, condition)
 
 
 # 9
 def wait_for_network_approval(timeout):
     # Wait for network to approve event (up to `timeout` seconds).
-    event_format = ['1000', '09', 'f']
-    return __format_event(event_format, timeout)
+    return __format_event(1000, 9, timeout)
 
 
 """ 1001: EXECUTION CONTROL (TIMER) """
@@ -1632,23 +1567,20 @@ def wait_for_network_approval(timeout):
 # 0
 def wait(number_seconds):
     # Wait for some number of seconds.
-    event_format = ['1001', '00', 'f']
-    return __format_event(event_format, number_seconds)
+    return __format_event(1001, 0, number_seconds)
 
 
 # 1
 def wait_frames(number_frames):
     # Wait for some number of frames.
-    event_format = ['1001', '01', 'i']
-    return __format_event(event_format, number_frames)
+    return __format_event(1001, 1, number_frames)
 
 
 # 2
 def wait_random_range(min_number_seconds, max_number_seconds):
     # Wait for a random number of seconds between min and max. I assume the
     # distribution is inclusive and uniform.
-    event_format = ['1001', '02', 'ff']
-    return __format_event(event_format, min_number_seconds, max_number_seconds)
+    return __format_event(1001, 2, min_number_seconds, max_number_seconds)
 
 
 """ 1003: EXECUTION CONTROL (EVENT) """
@@ -1682,8 +1614,7 @@ def skip_if_event_flag_off(number_lines, event_flag_type: flag_type, event_flag_
 def skip_if_event_flag_state(number_lines, required_flag_state, event_flag_type: flag_type, event_flag_id):
     # Skip some number of instructions if the specified flag has the specified
     # state (0 = off, 1 = on).
-    event_format = ['1003', '01', 'BBBi']
-    return __format_event(event_format, number_lines, required_flag_state, event_flag_type, event_flag_id)
+    return __format_event(1003, 1, number_lines, required_flag_state, event_flag_type, event_flag_id)
 
 
 # 2
@@ -1714,8 +1645,7 @@ def restart_if_event_flag_off(event_flag_type: flag_type, event_flag_id):
 def terminate_if_event_flag_state(event_end_type, required_flag_state, event_flag_type: flag_type, event_flag_id):
     # Terminate (end or restart) event if the specified flag has the specified
     # state (0 = off, 1 = on).
-    event_format = ['1003', '02', 'BBBi']
-    return __format_event(event_format, event_end_type, required_flag_state, event_flag_type, event_flag_id)
+    return __format_event(1003, 2, event_end_type, required_flag_state, event_flag_type, event_flag_id)
 
 
 # 3
@@ -1737,8 +1667,7 @@ def skip_if_event_flag_range_state(number_lines, required_flag_state, event_flag
         1: "Event ID",
         2: "Event ID with Slot Number"
     """
-    event_format = ['1003', '03', 'BBBii']
-    return __format_event(event_format, number_lines, required_flag_state, event_flag_type, start_event_flag_id,
+    return __format_event(1003, 3, number_lines, required_flag_state, event_flag_type, start_event_flag_id,
                           end_event_flag_id)
 
 
@@ -1763,8 +1692,7 @@ def terminate_if_event_flag_range_state(event_end_type, required_flag_state, eve
                                         end_event_flag_id):
     # Terminate (end or restart) event if the specified range of flags all have
     # the specified state (0 = off, 1 = on).
-    event_format = ['1003', '04', 'BBBii']
-    return __format_event(event_format, event_end_type, required_flag_state, event_flag_type, start_event_flag_id,
+    return __format_event(1003, 4, event_end_type, required_flag_state, event_flag_type, start_event_flag_id,
                           end_event_flag_id)
 
 
@@ -1795,8 +1723,7 @@ def skip_if_multiplayer_state(number_lines, required_multiplayer_state):
         2: "Multiplayer" (either has a client or is a client I believe)
         3: "Singleplayer" (host with no client)
     """
-    event_format = ['1003', '05', 'Bb']
-    return __format_event(event_format, number_lines, required_multiplayer_state)
+    return __format_event(1003, 5, number_lines, required_multiplayer_state)
 
 
 # 6
@@ -1842,8 +1769,7 @@ def terminate_if_multiplayer_state(event_end_type, required_multiplayer_state):
         2: "Multiplayer" (either has a client or is a client I believe)
         3: "Singleplayer" (host with no client)
     """
-    event_format = ['1003', '06', 'Bb']
-    return __format_event(event_format, event_end_type, required_multiplayer_state)
+    return __format_event(1003, 6, event_end_type, required_multiplayer_state)
 
 
 # 7
@@ -1858,8 +1784,7 @@ def skip_if_outside_area(number_lines, area_id, block_id):
 def skip_if_area_state(number_lines, required_area_state, area_id, block_id):
     # Skip some number of lines if the player is outside (0) or inside (1) the
     # specified area and block.
-    event_format = ['1003', '07', 'BBBB']
-    return __format_event(event_format, number_lines, required_area_state, area_id, block_id)
+    return __format_event(1003, 7, number_lines, required_area_state, area_id, block_id)
 
 
 # 8 - this terminates the event based on area state, but judging from HPR's
@@ -1885,8 +1810,7 @@ def skip_if_object_destruction_state(number_lines, required_destruction_state, e
     # to guess if 0 = destroyed or 1 = destroyed. I assume the latter, but only
     # tentatively (because it's the default).
     # TODO: Check usage to figure out state bool.
-    event_format = ['1005', '01', 'BBi']
-    return __format_event(event_format, number_lines, required_destruction_state, entity_id)
+    return __format_event(1005, 1, number_lines, required_destruction_state, entity_id)
 
 
 # 2
@@ -1914,8 +1838,7 @@ def terminate_if_object_destruction_state(event_end_type, required_destruction_s
     # Terminates (ends or restarts) the event if the specified object has the
     # specified destruction state. Guessing that 1 = destroyed.
     # TODO: Confirm bool.
-    event_format = ['1005', '02', 'BBi']
-    return __format_event(event_format, event_end_type, required_destruction_state, entity_id)
+    return __format_event(1005, 2, event_end_type, required_destruction_state, entity_id)
 
 
 """ 0: EXECUTION CONDITIONS (SYSTEM) """
@@ -1936,8 +1859,7 @@ def if_condition_state(output_condition, required_result, input_condition):
     # condition (where many values can be stored).
     # The required result is 1 by default, which means that the output condition
     # will simply store the evaluation of the input.
-    event_format = ['   0', '00', 'bBb']
-    return __format_event(event_format, output_condition, required_result, input_condition)
+    return __format_event(0, 0, output_condition, required_result, input_condition)
 
 
 """ 1: EXECUTION CONDITIONS (TIME) """
@@ -1947,15 +1869,13 @@ def if_condition_state(output_condition, required_result, input_condition):
 def if_time_elapsed(output_condition, number_seconds):
     # Counts seconds since event started (I think).
     # TODO: Confirm time since event started.
-    event_format = ['   1', '00', 'bf']
-    return __format_event(event_format, output_condition, number_seconds)
+    return __format_event(1, 0, output_condition, number_seconds)
 
 
 # 1
 def if_frames_elapsed(output_condition, number_frames):
     # TODO: Confirm number of frames since event started.
-    event_format = ['   1', '01', 'bi']
-    return __format_event(event_format, output_condition, number_frames)
+    return __format_event(1, 1, output_condition, number_frames)
 
 
 # 2 and 3 choose a random number of seconds/frames, I think, but unused.
@@ -1973,8 +1893,7 @@ def if_event_flag_off(output_condition, event_flag_type: flag_type, event_flag_i
 
 
 def if_event_flag_state(output_condition, required_flag_state, event_flag_type, event_flag_id):
-    event_format = ['   3', '00', 'bBBi']
-    return __format_event(event_format, output_condition, required_flag_state, event_flag_type, event_flag_id)
+    return __format_event(3, 0, output_condition, required_flag_state, event_flag_type, event_flag_id)
 
 
 # 1
@@ -1988,8 +1907,7 @@ def if_event_flag_range_off(output_condition, event_flag_type: flag_type, start_
 
 def if_event_flag_range_state(output_condition, required_flag_state, event_flag_type: flag_type, start_event_flag_id,
                               end_event_flag_id):
-    event_format = ['   3', '01', 'bBBii']
-    return __format_event(event_format, output_condition, required_flag_state, event_flag_type, start_event_flag_id,
+    return __format_event(3, 1, output_condition, required_flag_state, event_flag_type, start_event_flag_id,
                           end_event_flag_id)
 
 
@@ -2014,8 +1932,7 @@ def if_entity_inside_or_outside_area(output_condition, entity_id, area_entity_id
     # Checks if specified entity is inside or outside specified area.
     # 0 = outside, 1 = inside.
     # Note that argument order has changed.
-    event_format = ['   3', '02', 'bBii']
-    return __format_event(event_format, output_condition, is_inside, entity_id, area_entity_id)
+    return __format_event(3, 2, output_condition, is_inside, entity_id, area_entity_id)
 
 
 # 3
@@ -2039,8 +1956,7 @@ def if_entity_within_or_beyond_distance(output_condition, first_entity_id, secon
                                         is_within):
     # Check is entity A is within (is_within == True) or beyond the specified
     # distance of entity B.
-    event_format = ['   3', '03', 'bBiif']
-    return __format_event(event_format, output_condition, __bint(is_within), first_entity_id, second_entity_id, required_distance)
+    return __format_event(3, 3, output_condition, __bint(is_within), first_entity_id, second_entity_id, required_distance)
 
 
 # 4
@@ -2055,8 +1971,7 @@ def if_player_does_not_have_item(output_condition, item_type, item_id):
 def if_player_has_or_does_not_have_item(output_condition, item_type, item_id, required_state):
     # Check if player has specified item in inventory, not including Bottomless
     # Box (required_state == True) or does not have the item (required_state == False).
-    event_format = ['   3', '04', 'bBiB']
-    return __format_event(event_format, output_condition, item_type, item_id, __bint(required_state))
+    return __format_event(3, 4, output_condition, item_type, item_id, __bint(required_state))
 
 
 # 5
@@ -2080,8 +1995,7 @@ def if_action_button_state(output_condition, category, target_entity_id, reactio
     :param reaction_attribute: Discerns which player(s) the prompt / activation works for.
     :param pad_id: ID of the action button used, usually ID 0, which is the A (Xbox) / Cross (PlayStation) button.
     """
-    event_format = ['   3', '05', 'biifhfiBi']
-    return __format_event(event_format, output_condition, category, target_entity_id, reaction_angle, damipoly_id,
+    return __format_event(3, 5, output_condition, category, target_entity_id, reaction_angle, damipoly_id,
                           reaction_distance, help_id, reaction_attribute, pad_id)
 
 
@@ -2105,8 +2019,7 @@ def if_multiplayer(output_condition):
 def if_multiplayer_state(output_condition, required_state):
     # Check if player is host (0), summon (1), single player (2), or
     # multiplayer (3).
-    event_format = ['   3', '06', 'bb']
-    return __format_event(event_format, output_condition, required_state)
+    return __format_event(3, 6, output_condition, required_state)
 
 
 # 7
@@ -2120,8 +2033,7 @@ def if_all_players_outside_area(output_condition, area_entity_id):
 
 def if_all_players_inside_or_outside_area(output_condition, area_entity_id, is_inside):
     # Check if all players are inside (1) or outside (0) the specified area.
-    event_format = ['   3', '07', 'bBi']
-    return __format_event(event_format, output_condition, is_inside, area_entity_id)
+    return __format_event(3, 7, output_condition, is_inside, area_entity_id)
 
 
 # 8
@@ -2135,15 +2047,13 @@ def if_not_in_world_area(output_condition, area_id, block_id):
 
 def if_world_area_state(output_condition, area_id, block_id, is_inside):
     # Check if player is inside or outside the specified world area and block.
-    event_format = ['   3', '08', 'bBBB']
-    return __format_event(event_format, output_condition, is_inside, area_id, block_id)
+    return __format_event(3, 8, output_condition, is_inside, area_id, block_id)
 
 
 # 9
 def if_multiplayer_event(output_condition, multiplayer_event_id):
     # Check if a multiplayer event has occured.
-    event_format = ['   3', '09', 'bI']
-    return __format_event(event_format, output_condition, multiplayer_event_id)
+    return __format_event(3, 9, output_condition, multiplayer_event_id)
 
 
 # 10
@@ -2165,8 +2075,7 @@ def if_count_true_event_flags_in_range(output_condition, event_flag_type: flag_t
                                        comparison_type, count_comparison):
     # Checks if the count of true flags in the specified range satisfies the
     # specified comparison (usually 4: >=) with the specified count.
-    event_format = ['   3', '10', 'bBiibi']
-    return __format_event(event_format, output_condition, event_flag_type, start_event_flag_id, end_event_flag_id,
+    return __format_event(3, 10, output_condition, event_flag_type, start_event_flag_id, end_event_flag_id,
                           comparison_type, count_comparison)
 
 
@@ -2178,16 +2087,14 @@ def if_world_tendency_greater_than_or_equal(output_condition, tendency_type, min
 def if_world_tendency_comparison(output_condition, tendency_type, comparison_type, tendency_comparison):
     # Check if comparison of world tendency with specified value is true.
     # tendency_type: 0 = white tendency, 1 = black tendency.
-    event_format = ['   3', '11', 'bBBB']
-    return __format_event(event_format, output_condition, tendency_type, comparison_type, tendency_comparison)
+    return __format_event(3, 11, output_condition, tendency_type, comparison_type, tendency_comparison)
 
 
 # 12
 def if_event_value_comparison(output_condition, event_flag_id, number_bits, comparison_type, comparison_value):
     # Check if specified bit in event value (usually 0 I think) compares true
     # with specified value.
-    event_format = ['   3', '12', 'biBBI']
-    return __format_event(event_format, output_condition, event_flag_id, number_bits, comparison_type, comparison_value)
+    return __format_event(3, 12, output_condition, event_flag_id, number_bits, comparison_type, comparison_value)
 
 
 # 13
@@ -2195,23 +2102,20 @@ def if_action_button_state_in_boss(output_condition, category, target_entity_id,
                                    reaction_distance, help_id, reaction_attribute, pad_id):
     # Checks state of action button (A on the Xbox controller). I assume this
     # one only applies in boss rooms. See if_action_button_state docs.
-    event_format = ['   3', '13', 'biifhfiBi']
-    return __format_event(event_format, output_condition, category, target_entity_id, reaction_angle, damipoly_id,
+    return __format_event(3, 13, output_condition, category, target_entity_id, reaction_angle, damipoly_id,
                           reaction_distance, help_id, reaction_attribute, pad_id)
 
 
 # 14
 def if_any_item_dropped_in_area(output_condition, area_entity_id):
     # Check if any item has been dropped in the specified area.
-    event_format = ['   3', '14', 'bi']
-    return __format_event(event_format, output_condition, area_entity_id)
+    return __format_event(3, 14, output_condition, area_entity_id)
 
 
 # 15
 def if_item_dropped(output_condition, item_type, item_id):
     # Check if a specified item has been dropped (anywhere).
-    event_format = ['   3', '15', 'bii']
-    return __format_event(event_format, output_condition, item_type, item_id)
+    return __format_event(3, 15, output_condition, item_type, item_id)
 
 
 # 16
@@ -2219,14 +2123,12 @@ def if_player_owns_item(output_condition, item_type, item_id):
     # Includes Bottomless Box.
     # Note: it's seriously pointless for me to make a generic function for
     # item ownership state. I'm never going to call it directly.
-    event_format = ['   3', '16', 'bBiB']
-    return __format_event(event_format, output_condition, item_type, item_id, 1)
+    return __format_event(3, 16, output_condition, item_type, item_id, 1)
 
 
 def if_player_does_not_own_item(output_condition, item_type, item_id):
     # Includes Bottomless Box.
-    event_format = ['   3', '16', 'bBiB']
-    return __format_event(event_format, output_condition, item_type, item_id, 0)
+    return __format_event(3, 16, output_condition, item_type, item_id, 0)
 
 
 # 17
@@ -2242,8 +2144,7 @@ def if_new_game_count_greater_than_or_equal(output_condition, min_completion_cou
 
 def if_new_game_count_comparison(output_condition, comparison_type, completion_count_comparison):
     # Checks count of completed playthroughs and compares to value.
-    event_format = ['   3', '17', 'bBB']
-    return __format_event(event_format, output_condition, comparison_type, completion_count_comparison)
+    return __format_event(3, 17, output_condition, comparison_type, completion_count_comparison)
 
 
 # 18
@@ -2253,8 +2154,7 @@ def if_action_button_state_and_line_segment(output_condition, category, target_e
     # Checks state of action button (A on the Xbox controller) and, I assume,
     # check if player forward line segment intersects entity?
     # TODO: Check usage of this.
-    event_format = ['   3', '19', 'biifhfiBi']
-    return __format_event(event_format, output_condition, category, target_entity_id, reaction_angle, damipoly_id,
+    return __format_event(3, 18, output_condition, category, target_entity_id, reaction_angle, damipoly_id,
                           reaction_distance, help_id, reaction_attribute, pad_id, line_segment_endpoint_id)
 
 
@@ -2266,8 +2166,7 @@ def if_action_button_state_and_line_segment_in_boss(output_condition, category,
     # check if player forward line segment intersects entity? This is the boss
     # room version.
     # TODO: Check usage of this.
-    event_format = ['   3', '19', 'biifhfiBi']
-    return __format_event(event_format, output_condition, category, target_entity_id, reaction_angle, damipoly_id,
+    return __format_event(3, 19, output_condition, category, target_entity_id, reaction_angle, damipoly_id,
                           reaction_distance, help_id, reaction_attribute, pad_id, line_segment_endpoint_id)
 
 
@@ -2275,8 +2174,7 @@ def if_action_button_state_and_line_segment_in_boss(output_condition, category,
 def if_event_flag_value_comparison(output_condition, left_event_flag_id, left_number_bits, comparison_type,
                                    right_event_flag_id, right_number_bits):
     # Check comparison of two event flag values.
-    event_format = ['   3', '20', 'biBBiB']
-    return __format_event(event_format, output_condition, left_event_flag_id, left_number_bits, comparison_type,
+    return __format_event(3, 20, output_condition, left_event_flag_id, left_number_bits, comparison_type,
                           right_event_flag_id, right_number_bits)
 
 
@@ -2284,14 +2182,12 @@ def if_event_flag_value_comparison(output_condition, left_event_flag_id, left_nu
 def if_owns_DLC(output_condition):
     # Check if player owns Artorias of the Abyss DLC expansion.
     # NOTE: Again, no generic function here.
-    event_format = ['   3', '21', 'bB']
-    return __format_event(event_format, output_condition, 1)
+    return __format_event(3, 21, output_condition, 1)
 
 
 def if_does_not_own_DLC(output_condition):
     # Check if player does not own Artorias of the Abyss DLC expansion.
-    event_format = ['   3', '21', 'bB']
-    return __format_event(event_format, output_condition, 0)
+    return __format_event(3, 21, output_condition, 0)
 
 
 # 22
@@ -2305,8 +2201,7 @@ def if_offline(output_condition):
 
 def if_online_state(output_condition, online_state):
     # Check if player is online (1) or offline (0).
-    event_format = ['   3', '22', 'bB']
-    return __format_event(event_format, output_condition, online_state)
+    return __format_event(3, 22, output_condition, online_state)
 
 
 """ 4: EXECUTION CONDITIONS (CHARACTER) """
@@ -2323,8 +2218,7 @@ def if_entity_alive(output_condition, entity_id):
 
 def if_entity_death_state(output_condition, entity_id, required_state):
     # Check if entity is alive (0) or dead (1).
-    event_format = ['   4', '00', 'biB']
-    return __format_event(event_format, output_condition, entity_id, required_state)
+    return __format_event(4, 0, output_condition, entity_id, required_state)
 
 
 # 1
@@ -2332,8 +2226,7 @@ def if_entity_hostile(output_condition, entity_id, attacking_entity_id):
     # Check if entity is hostile toward attacking entity (I assume).
     # TODO: Check usage to confirm that the hostility is directed from the
     # first entity to the second.
-    event_format = ['   4', '01', 'bii']
-    return __format_event(event_format, output_condition, entity_id, attacking_entity_id)
+    return __format_event(4, 1, output_condition, entity_id, attacking_entity_id)
 
 
 # 2
@@ -2378,8 +2271,7 @@ def if_entity_health_comparison(output_condition, entity_id, comparison_type, he
         4: ">=",
         5: "<="
     """
-    event_format = ['   4', '02', 'bibf']
-    return __format_event(event_format, output_condition, entity_id, comparison_type, health_comparison)
+    return __format_event(4, 2, output_condition, entity_id, comparison_type, health_comparison)
 
 
 # 3
@@ -2403,8 +2295,7 @@ def if_character_type(output_condition, entity_id, character_type):
         8: "Gray Ghost",
         12: "Intruder"
     """
-    event_format = ['   4', '03', 'bib']
-    return __format_event(event_format, output_condition, entity_id, character_type)
+    return __format_event(4, 3, output_condition, entity_id, character_type)
 
 
 # 4
@@ -2423,8 +2314,7 @@ def if_entity_target_state(output_condition, entity_id, targeted_entity_id, requ
     # Note this is HPR's speculation. Not sure if player target lock counts as
     # 'targeting' for this, or if it's just for NPC AI targets.
     # TODO: Check usage.
-    event_format = ['   4', '04', 'biiB']
-    return __format_event(event_format, output_condition, entity_id, targeted_entity_id, required_target_state)
+    return __format_event(4, 4, output_condition, entity_id, targeted_entity_id, required_target_state)
 
 
 # 5
@@ -2440,8 +2330,7 @@ def if_entity_does_not_have_special_effect(output_condition, entity_id, special_
 
 def if_entity_special_effect_state(output_condition, entity_id, special_effect_id, required_state):
     # Check if entity has (1) or doesn't have (0) specified special effect.
-    event_format = ['   4', '05', 'biiB']
-    return __format_event(event_format, output_condition, entity_id, special_effect_id, required_state)
+    return __format_event(4, 5, output_condition, entity_id, special_effect_id, required_state)
 
 
 # 6
@@ -2451,8 +2340,7 @@ def if_NPC_part_health_less_than_or_equal(output_condition, entity_id, part_NPC_
 
 def if_NPC_part_health_comparison(output_condition, entity_id, part_NPC_type, health_threshold, comparison_type):
     # Check comparison of NPC health part. I only really plan on copying this.
-    event_format = ['   4', '06', 'biiib']
-    return __format_event(event_format, output_condition, entity_id, part_NPC_type, health_threshold, comparison_type)
+    return __format_event(4, 6, output_condition, entity_id, part_NPC_type, health_threshold, comparison_type)
 
 
 # 7
@@ -2466,8 +2354,7 @@ def if_entity_backread_disabled(output_condition, entity_id):
 
 def if_entity_backread_state(output_condition, entity_id, loaded):
     # Check if entity is loaded in background (presumably) or not.
-    event_format = ['   4', '07', 'biB']
-    return __format_event(event_format, output_condition, entity_id, loaded)
+    return __format_event(4, 7, output_condition, entity_id, loaded)
 
 
 # 8
@@ -2483,8 +2370,7 @@ def if_event_message_ID_match_state(output_condition, entity_id, event_message_i
     # Check if entity event message ID does or does not match another event
     # message ID. Not really sure when I'd use this.
     # TODO: Check current usage for examples.
-    event_format = ['   4', '08', 'biiB']
-    return __format_event(event_format, output_condition, entity_id, event_message_id, match_state)
+    return __format_event(4, 8, output_condition, entity_id, event_message_id, match_state)
 
 
 # 9
@@ -2497,8 +2383,7 @@ def if_ai_state(output_condition, entity_id, required_ai_state):
         2: "Alert",
         3: "Battle"
     """
-    event_format = ['   4', '09', 'biB']
-    return __format_event(event_format, output_condition, entity_id, required_ai_state)
+    return __format_event(4, 9, output_condition, entity_id, required_ai_state)
 
 
 # 10
@@ -2506,16 +2391,14 @@ def if_skull_lantern_activated(output_condition):
     # Check if player is using (holding out) the Skull Lantern. Currently used
     # to alter enemy aggression in Tomb of the Giants, I think. No need for a
     # generic version.
-    event_format = ['   4', '10', 'bB']
-    return __format_event(event_format, output_condition, 1)
+    return __format_event(4, 10, output_condition, 1)
 
 
 def if_skull_lantern_not_activated(output_condition):
     # Check if player is using (holding out) the Skull Lantern. Currently used
     # to alter enemy aggression in Tomb of the Giants, I think. No need for a
     # generic version.
-    event_format = ['   4', '10', 'bB']
-    return __format_event(event_format, output_condition, 0)
+    return __format_event(4, 10, output_condition, 0)
 
 
 # 11
@@ -2543,8 +2426,7 @@ def if_player_class(output_condition, class_name):
             class_name = class_list.index(class_name.lower())
         else:
             raise ValueError('Unrecognized class name.')
-    event_format = ['   4', '11', 'bB']
-    return __format_event(event_format, output_condition, class_name)
+    return __format_event(4, 11, output_condition, class_name)
 
 
 # 12
@@ -2572,9 +2454,8 @@ def if_player_covenant(output_condition, covenant_name):
         if covenant_name.lower() in covenant_list:
             covenant_name = covenant_list.index(covenant_name.lower())
         else:
-            raise ValueError('Unrecognized class name.')
-    event_format = ['   4', '11', 'bB']
-    return __format_event(event_format, output_condition, covenant_name)
+            raise ValueError('Unrecognized covenant name.')
+    return __format_event(4, 12, output_condition, covenant_name)
 
 
 # 13
@@ -2588,8 +2469,7 @@ def if_player_soul_level_less_than_or_equal(output_condition, comparison_value):
 
 def if_player_soul_level_comparison(output_condition, comparison_type, comparison_value):
     # Check if player soul level comparison returns true.
-    event_format = ['   4', '13', 'bBI']
-    return __format_event(event_format, output_condition, comparison_type, comparison_value)
+    return __format_event(4, 13, output_condition, comparison_type, comparison_value)
 
 
 # 14
@@ -2619,8 +2499,7 @@ def if_entity_health_value_less_than_or_equal(output_condition, entity_id, compa
 
 def if_entity_health_value_comparison(output_condition, entity_id, comparison_type, comparison_value):
     # Check if absolute entity health (NOT ratio) comparison returns true.
-    event_format = ['   4', '14', 'biBi']
-    return __format_event(event_format, output_condition, entity_id, comparison_type, comparison_value)
+    return __format_event(4, 14, output_condition, entity_id, comparison_type, comparison_value)
 
 
 """ 5: EXECUTION CONDITIONS (OBJECT) """
@@ -2637,22 +2516,19 @@ def if_object_not_destroyed(output_condition, entity_id):
 
 def if_object_destruction_state(output_condition, required_state, entity_id):
     # Check if object is destroyed or not.
-    event_format = ['   5', '00', 'bBi']
-    return __format_event(event_format, output_condition, required_state, entity_id)
+    return __format_event(5, 0, output_condition, required_state, entity_id)
 
 
 # 1
 def if_entity_damaged_object(output_condition, entity_id, attacker_entity_id):
     # Check if object was damaged by a specific attacker.
-    event_format = ['   5', '01', 'bii']
-    return __format_event(event_format, output_condition, entity_id, attacker_entity_id)
+    return __format_event(5, 1, output_condition, entity_id, attacker_entity_id)
 
 
 # 2
 def if_object_activated(output_condition, execution_event_id):
     # Check if object was activated.
-    event_format = ['   5', '02', 'bi']
-    return __format_event(event_format, output_condition, execution_event_id)
+    return __format_event(5, 2, output_condition, execution_event_id)
 
 
 """ 11: EXECUTION CONDITIONS (HIT) """
@@ -2661,22 +2537,19 @@ def if_object_activated(output_condition, execution_event_id):
 # 0
 def if_player_moving_on_hitbox(output_condition, hitbox_entity_id):
     # Check if a local player is moving on the specified hitbox.
-    event_format = ['   5', '00', 'bi']
-    return __format_event(event_format, output_condition, hitbox_entity_id)
+    return __format_event(11, 0, output_condition, hitbox_entity_id)
 
 
 # 1
 def if_player_running_on_hitbox(output_condition, hitbox_entity_id):
     # Check if a local player is running on the specified hitbox.
-    event_format = ['   5', '01', 'bi']
-    return __format_event(event_format, output_condition, hitbox_entity_id)
+    return __format_event(11, 1, output_condition, hitbox_entity_id)
 
 
 # 2
 def if_player_standing_on_hitbox(output_condition, hitbox_entity_id):
     # Check if a plocal player is standing on the specified hitbox.
-    event_format = ['   5', '02', 'bi']
-    return __format_event(event_format, output_condition, hitbox_entity_id)
+    return __format_event(11, 2, output_condition, hitbox_entity_id)
 
 
 """ PARAMETER SUBSTITUTION INSTRUCTIONS """
@@ -2686,7 +2559,7 @@ def load_arg(write_from_offset, read_from_offset, bytes_length):
     # Loads bytes from event initialization arguments (see 0[00]) into the
     # instruction immediately above. Reading starts at read_from_offset and
     # writing starts at write_from_offset, and bytes_length bytes are written.
-    print('    ^({} <- {}, {})'.format(write_from_offset, read_from_offset, bytes_length))
+    current_sink().write_substitution(write_from_offset, read_from_offset, bytes_length)
 
 
 """
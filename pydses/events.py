@@ -0,0 +1,83 @@
+"""
+@author: grimrhapsody
+"""
+
+
+""" LINE FORMATTING """
+
+
+def format_header(event_id, restart_type):
+    return '{}, {}'.format(event_id, restart_type)
+
+
+def format_instruction(bank, index, arg_format, args):
+    return ' {:>4}[{:02d}] ({}){}'.format(bank, index, arg_format, list(args))
+
+
+def format_substitution(write_from_offset, read_from_offset, bytes_length):
+    return '    ^({} <- {}, {})'.format(write_from_offset, read_from_offset, bytes_length)
+
+
+""" EVENT RECORDS """
+
+
+class Instruction(object):
+    """ One instruction line, plus any ^(X <- Y, Z) substitutions applied to it.
+
+    layout is the shared ArgLayout of the instruction (see layouts.py).
+    substitutions is None (most instructions have none) or a list of
+    (write_from_offset, read_from_offset, bytes_length).
+
+    Instructions use __slots__, so a whole mod's worth of them can be held in
+    memory for analysis.
+    """
+
+    __slots__ = ('bank', 'index', 'layout', 'args', 'substitutions')
+
+    def __init__(self, bank, index, layout, args, substitutions=None):
+        self.bank = bank
+        self.index = index
+        self.layout = layout
+        self.args = tuple(args)
+        self.substitutions = list(substitutions) if substitutions else None
+
+    def add_substitution(self, write_from_offset, read_from_offset, bytes_length):
+        if self.substitutions is None:
+            self.substitutions = []
+        self.substitutions.append((write_from_offset, read_from_offset, bytes_length))
+
+    def lines(self):
+        yield format_instruction(self.bank, self.index, self.layout.arg_format, self.args)
+        if self.substitutions:
+            for substitution in self.substitutions:
+                yield format_substitution(*substitution)
+
+    def __repr__(self):
+        return 'Instruction({}[{:02d}] ({}){})'.format(self.bank, self.index, self.layout.arg_format,
+                                                       list(self.args))
+
+
+class Event(object):
+    """ An event header (ID and restart type) and its instructions.
+
+    event_id is None for instructions written outside of any event header.
+    """
+
+    __slots__ = ('event_id', 'restart_type', 'instructions')
+
+    def __init__(self, event_id, restart_type, instructions=None):
+        self.event_id = event_id
+        self.restart_type = restart_type
+        self.instructions = instructions if instructions is not None else []
+
+    def lines(self):
+        if self.event_id is not None:
+            yield format_header(self.event_id, self.restart_type)
+        for instruction in self.instructions:
+            yield from instruction.lines()
+
+    def render(self):
+        return '\n'.join(self.lines()) + '\n'
+
+    def __repr__(self):
+        return 'Event({}, {}, <{} instructions>)'.format(self.event_id, self.restart_type, len(self.instructions))
@@ -0,0 +1,266 @@
+"""
+@author: grimrhapsody
+"""
+
+import os
+import sys
+import threading
+import warnings
+from bisect import bisect_left, bisect_right
+from contextlib import contextmanager
+from os.path import join
+from .emevd import read_emevd
+from .mapcache import load_unpacked
+from .references import instruction_references
+
+
+"""
+Event flag IDs that are safe to use in a map (see the README): eight digits,
+made of a leading digit (1, 5, 6 or 7), the two-digit area number, the one-digit
+block number, and any four digits:
+
+    m18_01_00_00  ->  1181XXXX, 5181XXXX, 6181XXXX, 7181XXXX
+
+Event IDs are also flags, and custom events use the leading digit 1.
+"""
+
+
+FLAG_PREFIXES = (1, 5, 6, 7)
+FLAGS_PER_MAP = 10000
+
+
+def map_flag_range(map_name, prefix=1):
+    """ (first, last) valid flag of a map ('m18_01_00_00') for a leading digit in FLAG_PREFIXES. """
+    if prefix not in FLAG_PREFIXES:
+        raise ValueError('Flag prefix must be one of {}, not {}.'.format(FLAG_PREFIXES, prefix))
+    try:
+        area, block = int(map_name[1:3]), int(map_name[4:6])
+    except ValueError:
+        raise ValueError('Map name must look like "m18_01_00_00", not {!r}.'.format(map_name))
+    if not 0 <= block <= 9:
+        raise ValueError('Block {} of map {} has no flag range.'.format(block, map_name))
+    first = prefix * 10 ** 7 + area * 10 ** 5 + block * 10 ** 4
+    return first, first + FLAGS_PER_MAP - 1
+
+
+def is_valid_flag(flag):
+    """ True if flag is in one of the eight-digit map ranges above (for any map). """
+    return 10 ** 7 <= flag < 10 ** 8 and flag // 10 ** 7 in FLAG_PREFIXES
+
+
+""" INTERVAL SET """
+
+
+class IntervalSet(object):
+    """ Sorted, merged, inclusive integer intervals, stored as two parallel lists (starts and ends).
+
+    Lookups are binary searches; adding an interval merges it with any
+    intervals it touches.
+    """
+
+    def __init__(self):
+        self.starts = []
+        self.ends = []
+
+    def __len__(self):
+        return len(self.starts)
+
+    def add(self, first, last=None):
+        if last is None:
+            last = first
+        if last < first:
+            first, last = last, first
+        # Intervals that overlap or touch [first, last].
+        low = bisect_left(self.ends, first - 1)
+        high = bisect_right(self.starts, last + 1)
+        if low < high:
+            first = min(first, self.starts[low])
+            last = max(last, self.ends[high - 1])
+        self.starts[low:high] = [first]
+        self.ends[low:high] = [last]
+
+    def __contains__(self, value):
+        i = bisect_right(self.starts, value) - 1
+        return i >= 0 and self.ends[i] >= value
+
+    def overlapping(self, first, last):
+        """ Intervals (clipped to [first, last]) that overlap [first, last]. """
+        low = bisect_left(self.ends, first)
+        high = bisect_right(self.starts, last)
+        return [(max(first, self.starts[i]), min(last, self.ends[i])) for i in range(low, high)]
+
+    def first_gap(self, first, last, count):
+        """ Start of the first run of count values in [first, last] not in this set, or None. """
+        candidate = first
+        i = bisect_right(self.starts, candidate) - 1
+        if i >= 0 and self.ends[i] >= candidate:
+            candidate = self.ends[i] + 1
+        i += 1
+        while candidate + count - 1 <= last:
+            if i >= len(self.starts) or self.starts[i] > candidate + count - 1:
+                return candidate
+            candidate = self.ends[i] + 1
+            i += 1
+        return None
+
+
+""" FLAG ALLOCATOR """
+
+
+class FlagAllocator(object):
+    """ Hands out unused, valid flag and event IDs for each map.
+
+    reserved holds every flag (and event ID) used by the maps it was built from,
+    e.g. the vanilla event files. allocated holds the flags handed out so far.
+    New flags avoid both.
+
+        allocator = FlagAllocator.from_directory('vanilla_event_dir', suffix='.emevd')
+        boss_dead_flag = allocator.allocate('m18_01_00_00')
+        chest_flags = allocator.allocate('m18_01_00_00', count=5, prefix=5)  # first of five
+    """
+
+    def __init__(self):
+        self.reserved = IntervalSet()
+        self.allocated = IntervalSet()
+
+    def reserve(self, first, last=None):
+        self.reserved.add(first, last)
+
+    def reserve_events(self, events):
+        """ Reserve every event ID and flag (including flag ranges) used by events. """
+        for event in events:
+            if event.event_id is not None:
+                self.reserved.add(event.event_id)
+            for instruction in event.instructions:
+                flags = {role: value for kind, value, role in instruction_references(instruction) if kind == 'flag'}
+                if 'first_flag_id' in flags and 'last_flag_id' in flags:
+                    self.reserved.add(flags.pop('first_flag_id'), flags.pop('last_flag_id'))
+                for value in flags.values():
+                    self.reserved.add(value)
+
+    @classmethod
+    def from_maps(cls, map_events):
+        """ Allocator with every flag used in map_events ({map_name: Events}) reserved. """
+        allocator = cls()
+        for events in map_events.values():
+            allocator.reserve_events(events)
+        return allocator
+
+    @classmethod
+    def from_directory(cls, directory, suffix='.unpack.txt'):
+        """ Allocator with every flag used by the unpacked (or, with suffix '.emevd', packed) files in directory. """
+        allocator = cls()
+        for filename in sorted(os.listdir(directory)):
+            if not filename.endswith(suffix):
+                continue
+            path = join(directory, filename)
+            if filename.endswith('.emevd'):
+                with read_emevd(path) as reader:
+                    allocator.reserve_events(reader.events())
+            else:
+                allocator.reserve_events(load_unpacked(path).event_list())
+        return allocator
+
+    def is_used(self, flag):
+        return flag in self.reserved or flag in self.allocated
+
+    def allocate(self, map_name, count=1, prefix=1):
+        """ First flag of a run of count unused, valid flags for map_name, which are then marked as allocated. """
+        first, last = map_flag_range(map_name, prefix)
+        # Both sets are searched for a gap that suits both.
+        candidate = first
+        while True:
+            candidate = self.reserved.first_gap(candidate, last, count)
+            if candidate is None:
+                break
+            other = self.allocated.first_gap(candidate, last, count)
+            if other == candidate:
+                self.allocated.add(candidate, candidate + count - 1)
+                return candidate
+            if other is None:
+                break
+            candidate = other
+        raise ValueError('No run of {} unused flags left in {} to {} ({}).'.format(count, first, last, map_name))
+
+    def allocate_event_id(self, map_name):
+        """ Unused event ID for map_name (event IDs are flags too). """
+        return self.allocate(map_name)
+
+    def conflicts(self, first, last):
+        """ Reserved flags in [first, last], as clipped intervals. """
+        if last < first:
+            first, last = last, first
+        return self.reserved.overlapping(first, last)
+
+
+""" RANGE CHECKS """
+
+
+_PACKAGE_DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+_local = threading.local()
+
+
+def _allocator_stack():
+    try:
+        return _local.stack
+    except AttributeError:
+        _local.stack = []
+        return _local.stack
+
+
+def current_flag_allocator():
+    """ Allocator that flag ranges are checked against in the current thread (None if not checking). """
+    stack = _allocator_stack()
+    return stack[-1] if stack else None
+
+
+def push_flag_allocator(allocator):
+    _allocator_stack().append(allocator)
+
+
+def pop_flag_allocator(allocator):
+    stack = _allocator_stack()
+    if not stack or stack[-1] is not allocator:
+        raise RuntimeError('Flag allocators must be removed in the reverse order they were added.')
+    stack.pop()
+
+
+@contextmanager
+def use_flag_allocator(allocator):
+    """ Check the flag ranges of set_all_flags_in_range() and randomly_set_one_flag_in_range() written inside this
+    block (in this thread) against allocator (None to stop checking). """
+    push_flag_allocator(allocator)
+    try:
+        yield allocator
+    finally:
+        pop_flag_allocator(allocator)
+
+
+def _outside_stacklevel():
+    # stacklevel (for a warning raised in check_flag_range) of the first caller outside of pydses, so the warning
+    # points at your event script however many wrappers (e.g. disable_all_flags_in_range) are in between.
+    frame = sys._getframe(2)
+    level = 2
+    while frame is not None and os.path.dirname(os.path.abspath(frame.f_code.co_filename)) == _PACKAGE_DIRECTORY:
+        frame = frame.f_back
+        level += 1
+    return level
+
+
+def check_flag_range(first, last):
+    """ With an allocator in use, warn if a flag range written by an instruction overlaps reserved flags, or isn't
+    inside one valid map flag range (unless it only covers reserved flags, as when resetting vanilla flags). """
+    allocator = current_flag_allocator()
+    if allocator is None or not isinstance(first, int) or not isinstance(last, int):
+        return  # not checking, or event parameters
+    low, high = min(first, last), max(first, last)
+    conflicts = allocator.conflicts(low, high)
+    stacklevel = _outside_stacklevel()
+    if conflicts:
+        warnings.warn('Flag range {} to {} overlaps flags that are already used: {}.'.format(
+            first, last, ', '.join(str(a) if a == b else '{} to {}'.format(a, b) for a, b in conflicts)),
+            stacklevel=stacklevel)
+    if conflicts != [(low, high)] and not (is_valid_flag(low) and is_valid_flag(high)
+                                           and low // FLAGS_PER_MAP == high // FLAGS_PER_MAP):
+        warnings.warn('Flag range {} to {} is not inside a single valid map flag range.'.format(first, last),
+                      stacklevel=stacklevel)
@@ -0,0 +1,275 @@
+"""
+@author: grimrhapsody
+"""
+
+import os
+from array import array
+from bisect import bisect_right
+from os.path import join
+from .emevd import read_emevd
+from .mapcache import load_unpacked
+from .references import instruction_references
+from .verbose import argument_names
+
+
+"""
+Static graph of the events of one or more maps:
+
+    init      event A initializes event B (2000[00]) in the same map
+    restart   event A restarts event B (2003[08] with state RESTART)
+    cancel    event A ends event B (2003[08] with state END)
+
+plus every event flag each event writes (2000+ banks) and reads (condition,
+skip and terminate instructions). Flags are global, so reads and writes are
+matched across maps. Every event also implicitly writes its own ID when it
+ends, and Event ID 0 read with an Event ID flag type means "this event".
+
+Nodes are (map_name, event_id) pairs numbered in load order, and each kind of
+edge is stored as compact adjacency arrays (offsets, targets): the targets of
+node n are targets[offsets[n]:offsets[n + 1]].
+"""
+
+
+ROOT_EVENTS = (0, 50)
+EDGE_KINDS = ('init', 'restart', 'cancel')
+INITIALIZE = (2000, 0)
+SET_EVENT_STATE = (2003, 8)
+
+
+def _csr(node_count, edges):
+    # (offsets, targets) arrays for a set of (source, target) edges.
+    offsets = array('I', [0] * (node_count + 1))
+    for source, _ in edges:
+        offsets[source + 1] += 1
+    for n in range(node_count):
+        offsets[n + 1] += offsets[n]
+    targets = array('I', [0] * len(edges))
+    fill = array('I', offsets[:-1])
+    for source, target in sorted(edges):
+        targets[fill[source]] = target
+        fill[source] += 1
+    return offsets, targets
+
+
+def _merge_intervals(intervals):
+    merged = []
+    for first, last in sorted(intervals):
+        if merged and first <= merged[-1][1] + 1:
+            merged[-1][1] = max(merged[-1][1], last)
+        else:
+            merged.append([first, last])
+    return [tuple(interval) for interval in merged]
+
+
+class EventGraph(object):
+    """ Initialization, restart and flag dependencies between events, across maps. """
+
+    def __init__(self, map_events):
+        """ map_events maps each map name to its Events (e.g. parse_unpacked(...).event_list() or read_emevd(...)). """
+        self.nodes = []
+        self.node_numbers = {}
+        map_events = {map_name: [event for event in events if event.event_id is not None]
+                      for map_name, events in map_events.items()}
+        for map_name, events in map_events.items():
+            for event in events:
+                key = (map_name, event.event_id)
+                if key not in self.node_numbers:
+                    self.node_numbers[key] = len(self.nodes)
+                    self.nodes.append(key)
+        edges = {kind: set() for kind in EDGE_KINDS}
+        self.missing = []  # (kind, source node, map_name, target event_id) for targets that aren't in the map
+        self.flag_writes = {}  # flag -> set of nodes
+        self.flag_reads = {}
+        self.range_writes = []  # (first_flag, last_flag, node)
+        self.range_reads = []
+        for map_name, events in map_events.items():
+            for event in events:
+                node = self.node_numbers[(map_name, event.event_id)]
+                for instruction in event.instructions:
+                    self._add_instruction(map_name, event.event_id, node, instruction, edges)
+        self.edges = {kind: _csr(len(self.nodes), list(kind_edges)) for kind, kind_edges in edges.items()}
+        self._read_intervals = _merge_intervals([(first, last) for first, last, _ in self.range_reads])
+
+    def _add_instruction(self, map_name, event_id, node, instruction, edges):
+        key = (instruction.bank, instruction.index)
+        references = list(instruction_references(instruction))
+        if key == INITIALIZE or key == SET_EVENT_STATE:
+            targets = [value for kind, value, role in references if role == 'event_id']
+            if not targets:
+                return  # event ID is an event parameter
+            if key == INITIALIZE:
+                kind = 'init'
+            else:
+                kind = 'restart' if instruction.args[2] == 1 else 'cancel'
+            target = self.node_numbers.get((map_name, targets[0]))
+            if target is None:
+                self.missing.append((kind, node, map_name, targets[0]))
+            else:
+                edges[kind].add((node, target))
+            return
+        flags = {}
+        for kind, value, role in references:
+            if kind == 'flag':
+                flags[role] = value
+        if not flags:
+            return
+        names = argument_names(instruction.bank, instruction.index, len(instruction.args))
+        if 'flag_type' in names and instruction.args[names.index('flag_type')] in (1, 2):
+            flags = {role: event_id if value == 0 else value for role, value in flags.items()}  # 0 is this event
+        reading = instruction.bank < 2000
+        if 'first_flag_id' in flags and 'last_flag_id' in flags:
+            interval = (min(flags['first_flag_id'], flags['last_flag_id']),
+                        max(flags['first_flag_id'], flags['last_flag_id']), node)
+            (self.range_reads if reading else self.range_writes).append(interval)
+            return
+        for value in flags.values():
+            (self.flag_reads if reading else self.flag_writes).setdefault(value, set()).add(node)
+
+    @classmethod
+    def from_directory(cls, directory, suffix='.unpack.txt'):
+        """ Graph of every unpacked (*.unpack.txt, through the map cache) or packed (*.emevd) file in directory. """
+        map_events = {}
+        for filename in sorted(os.listdir(directory)):
+            if not filename.endswith(suffix):
+                continue
+            path = join(directory, filename)
+            if filename.endswith('.emevd'):
+                with read_emevd(path) as reader:
+                    map_events[filename.split('.')[0]] = reader.events()
+            else:
+                map_events[filename.split('.')[0]] = load_unpacked(path).event_list()
+        return cls(map_events)
+
+    def successors(self, node, kind='init'):
+        offsets, targets = self.edges[kind]
+        return targets[offsets[node]:offsets[node + 1]]
+
+    def roots(self):
+        return [node for node, (_, event_id) in enumerate(self.nodes) if event_id in ROOT_EVENTS]
+
+    def reachable(self):
+        """ Nodes initialized (directly or indirectly) by Event 0 or Event 50 of their map. """
+        offsets, targets = self.edges['init']
+        seen = bytearray(len(self.nodes))
+        stack = self.roots()
+        for node in stack:
+            seen[node] = 1
+        while stack:
+            node = stack.pop()
+            for target in targets[offsets[node]:offsets[node + 1]]:
+                if not seen[target]:
+                    seen[target] = 1
+                    stack.append(target)
+        return seen
+
+    def dead_events(self):
+        """ (map_name, event_id) of every event that is never initialized from Event 0 or Event 50. """
+        seen = self.reachable()
+        return [self.nodes[node] for node in range(len(self.nodes)) if not seen[node]]
+
+    def _is_read(self, flag):
+        if flag in self.flag_reads:
+            return True
+        i = bisect_right(self._read_intervals, (flag, float('inf'))) - 1
+        return i >= 0 and self._read_intervals[i][0] <= flag <= self._read_intervals[i][1]
+
+    def orphan_flags(self):
+        """ Flags that are written (explicitly) but never read by any event, as {flag: [(map_name, event_id), ...]}.
+
+        Flag ranges that are written but never read are keyed by (first_flag, last_flag). Note that the game itself
+        (or talk scripts) may still read these flags.
+        """
+        orphans = {}
+        for flag, nodes in self.flag_writes.items():
+            if not self._is_read(flag):
+                orphans[flag] = [self.nodes[node] for node in sorted(nodes)]
+        read_flags = sorted(self.flag_reads)
+        for first, last, node in self.range_writes:
+            if any(first <= read_last and read_first <= last for read_first, read_last in self._read_intervals):
+                continue
+            i = bisect_right(read_flags, last)
+            if i and read_flags[i - 1] >= first:
+                continue
+            orphans.setdefault((first, last), []).append(self.nodes[node])
+        return orphans
+
+    def init_cycles(self, kinds=('init',)):
+        """ Groups of events that (re)start each other in a cycle, as lists of (map_name, event_id).
+
+        Strongly connected components of the given edge kinds with more than one
+        event, or a single event that starts itself. Found with an iterative
+        version of Tarjan's algorithm, so long chains don't hit the recursion limit.
+        """
+        node_count = len(self.nodes)
+        successors = [[] for _ in range(node_count)]
+        for kind in kinds:
+            offsets, targets = self.edges[kind]
+            for node in range(node_count):
+                successors[node].extend(targets[offsets[node]:offsets[node + 1]])
+        index = [-1] * node_count
+        low = [0] * node_count
+        on_stack = bytearray(node_count)
+        stack = []
+        cycles = []
+        counter = 0
+        for start in range(node_count):
+            if index[start] != -1:
+                continue
+            work = [(start, 0)]
+            while work:
+                node, i = work.pop()
+                if i == 0:
+                    index[node] = low[node] = counter
+                    counter += 1
+                    stack.append(node)
+                    on_stack[node] = 1
+                recurse = False
+                edges = successors[node]
+                while i < len(edges):
+                    target = edges[i]
+                    i += 1
+                    if index[target] == -1:
+                        work.append((node, i))
+                        work.append((target, 0))
+                        recurse = True
+                        break
+                    if on_stack[target]:
+                        low[node] = min(low[node], index[target])
+                if recurse:
+                    continue
+                if low[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack[member] = 0
+                        component.append(member)
+                        if member == node:
+                            break
+                    if len(component) > 1 or node in successors[node]:
+                        cycles.append([self.nodes[member] for member in sorted(component)])
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[node])
+        return cycles
+
+    def report(self):
+        """ Plain text summary of dead events, orphan flags, init cycles and missing targets. """
+        lines = ['{} events, {} init, {} restart and {} cancel edges.'.format(
+            len(self.nodes), *(len(self.edges[kind][1]) for kind in EDGE_KINDS))]
+        dead = self.dead_events()
+        lines.append('Dead events ({}):'.format(len(dead)))
+        lines.extend('    {} {}'.format(map_name, event_id) for map_name, event_id in dead)
+        orphans = self.orphan_flags()
+        lines.append('Flags written but never read ({}):'.format(len(orphans)))
+        for flag, writers in sorted(orphans.items(), key=lambda item: str(item[0])):
+            lines.append('    {} (written by {})'.format(
+                '{} to {}'.format(*flag) if isinstance(flag, tuple) else flag,
+                ', '.join('{} {}'.format(map_name, event_id) for map_name, event_id in writers)))
+        cycles = self.init_cycles()
+        lines.append('Initialization cycles ({}):'.format(len(cycles)))
+        lines.extend('    ' + ' -> '.join('{} {}'.format(*member) for member in cycle) for cycle in cycles)
+        if self.missing:
+            lines.append('Targets not defined in their map ({}):'.format(len(self.missing)))
+            lines.extend('    {} {} {}s {}'.format(self.nodes[node][0], self.nodes[node][1], kind, target)
+                         for kind, node, _, target in self.missing)
+        return '\n'.join(lines)
@@ -0,0 +1,71 @@
+"""
+@author: grimrhapsody
+"""
+
+from .layouts import field_range
+
+
+""" LABELS """
+
+
+class Label(object):
+    """ A position in an event, used in place of a hard-coded skip count.
+
+    Pass the label as the number_lines argument of any skip instruction, then
+    mark() it where the skip should land:
+
+        past_reward = Label()
+        skip_if_event_flag_on(past_reward, flag_type.event_flag, 11810000)
+        award_item_lot(1234)
+        mark(past_reward)
+
+    The skip count is filled in by link_events() when the EventBuilder holding
+    the event is closed. A label can only be marked once, and EMEVD skips only
+    go forward, so it must be marked after every instruction that uses it.
+    """
+
+    __slots__ = ('name', 'event', 'position')
+
+    def __init__(self, name=None):
+        self.name = name
+        self.event = None
+        self.position = None
+
+    def __repr__(self):
+        return 'Label({})'.format(self.name if self.name is not None else hex(id(self)))
+
+
+""" LINKING """
+
+
+def link_events(unlinked):
+    """ Replace every Label argument with its skip count, in one pass.
+
+    unlinked is a list of (event, instruction_position) pairs whose
+    instructions have Label arguments (EventBuilder records these as they are
+    written). The count is the number of instructions between the instruction
+    and the label's position. Raises ValueError for unmarked labels, labels in
+    another event, backward skips, and counts that don't fit the argument type.
+    """
+    for event, position in unlinked:
+        instruction = event.instructions[position]
+        args = list(instruction.args)
+        for i, arg in enumerate(args):
+            if not isinstance(arg, Label):
+                continue
+            where = 'Event {}, line {} ({}[{:02d}])'.format(event.event_id, position, instruction.bank,
+                                                             instruction.index)
+            if arg.event is None:
+                raise ValueError('{}: {!r} was never marked.'.format(where, arg))
+            if arg.event is not event:
+                raise ValueError('{}: {!r} is marked in a different event.'.format(where, arg))
+            count = arg.position - position - 1
+            if count < 0:
+                raise ValueError('{}: {!r} is marked before the instruction that uses it, and EMEVD skips can only '
+                                 'go forward.'.format(where, arg))
+            minimum, maximum = field_range(instruction.layout.arg_format[i])
+            if not minimum <= count <= maximum:
+                raise ValueError('{}: skip of {} lines to {!r} overflows its ({}) argument (maximum {}).'.format(
+                    where, count, arg, instruction.layout.arg_format[i], maximum))
+            args[i] = count
+        instruction.args = tuple(args)
@@ -0,0 +1,330 @@
+"""
+@author: grimrhapsody
+"""
+
+import struct
+
+
+""" ARGUMENT LAYOUTS """
+
+
+# Size (and alignment) in bytes of each argument type used in event formats.
+FIELD_SIZES = {'b': 1, 'B': 1, 'h': 2, 'H': 2, 'i': 4, 'I': 4, 'f': 4}
+
+
+def field_range(field):
+    """ (minimum, maximum) integer value of an integer field type. """
+    bits = FIELD_SIZES[field] * 8
+    if field.isupper():
+        return 0, 2 ** bits - 1
+    return -2 ** (bits - 1), 2 ** (bits - 1) - 1
+
+
+class ArgLayout(object):
+    """ Packed layout of an instruction's arguments, e.g. 'iiBBB'.
+
+    EMEVD arguments are little-endian, each field is aligned to its own size,
+    and the whole block is padded to a multiple of four bytes. offsets holds the
+    byte offset of each field (which is also what load_arg() refers to).
+    """
+
+    __slots__ = ('arg_format', 'struct', 'size', 'offsets')
+
+    def __init__(self, arg_format):
+        struct_format = '<'
+        offsets = []
+        offset = 0
+        for field in arg_format:
+            try:
+                field_size = FIELD_SIZES[field]
+            except KeyError:
+                raise ValueError('Unknown argument type {!r} in format {!r}.'.format(field, arg_format))
+            padding = -offset % field_size
+            struct_format += 'x' * padding + field
+            offset += padding
+            offsets.append(offset)
+            offset += field_size
+        struct_format += 'x' * (-offset % 4)
+        self.arg_format = arg_format
+        self.struct = struct.Struct(struct_format)
+        self.size = self.struct.size
+        self.offsets = tuple(offsets)
+
+    def __repr__(self):
+        return 'ArgLayout({!r})'.format(self.arg_format)
+
+
+_layouts = {}
+
+
+def get_layout(arg_format):
+    """ Cached ArgLayout for the given format string (built once per format). """
+    try:
+        return _layouts[arg_format]
+    except KeyError:
+        layout = _layouts[arg_format] = ArgLayout(arg_format)
+        return layout
+
+
+def infer_format(values):
+    # Format for arguments with no fixed type (e.g. event initialization
+    # arguments): floats are 'f', negative integers 'i', and everything else 'I'.
+    return ''.join('f' if isinstance(value, float) else 'i' if value < 0 else 'I' for value in values)
+
+
+""" INSTRUCTION REGISTRY """
+
+
+# Argument format of every instruction wrapped by pydses, keyed by (bank, index).
+INSTRUCTION_FORMATS = {
+    # 2000: SYSTEM
+    (2000, 0): 'iI',
+    (2000, 2): 'B',
+    (2000, 4): 'I',
+    (2000, 5): 'B',
+    # 2002: CUTSCENES
+    (2002, 2): 'iIiBB',
+    (2002, 3): 'iIi',
+    (2002, 4): 'iIiBBi',
+    (2002, 5): 'iIffifi',
+    # 2003: EVENT
+    (2003, 1): 'iiBB',
+    (2003, 2): 'iB',
+    (2003, 3): 'iB',
+    (2003, 4): 'i',
+    (2003, 5): 'iiiiiii',
+    (2003, 8): 'iiB',
+    (2003, 11): 'bihh',
+    (2003, 12): 'i',
+    (2003, 13): 'iIB',
+    (2003, 14): 'BBi',
+    (2003, 16): 'i',
+    (2003, 17): 'IIB',
+    (2003, 18): 'iiBBB',
+    (2003, 19): 'hh',
+    (2003, 21): 'B',
+    (2003, 22): 'iiB',
+    (2003, 23): 'i',
+    (2003, 24): 'iii',
+    (2003, 25): 'iiiii',
+    (2003, 26): 'iB',
+    (2003, 28): 'i',
+    (2003, 30): 'B',
+    (2003, 31): 'iII',
+    (2003, 32): 'iI',
+    (2003, 33): 'i',
+    (2003, 34): 'iiii',
+    (2003, 35): 'ii',
+    (2003, 36): 'i',
+    (2003, 41): 'iifi',
+    # 2004: CHARACTER
+    (2004, 1): 'iB',
+    (2004, 2): 'ib',
+    (2004, 3): 'iBii',
+    (2004, 4): 'iB',
+    (2004, 5): 'ib',
+    (2004, 6): 'iiB',
+    (2004, 7): 'i',
+    (2004, 8): 'ii',
+    (2004, 9): 'iiiiii',
+    (2004, 10): 'iB',
+    (2004, 12): 'iB',
+    (2004, 13): 'ii',
+    (2004, 14): 'ii',
+    (2004, 15): 'iB',
+    (2004, 16): 'i',
+    (2004, 17): 'iiB',
+    (2004, 18): 'iif',
+    (2004, 19): 'ii',
+    (2004, 20): 'i',
+    (2004, 21): 'ii',
+    (2004, 22): 'ihhiffBB',
+    (2004, 23): 'iiiB',
+    (2004, 24): 'iiii',
+    (2004, 25): 'iif',
+    (2004, 26): 'iBB',
+    (2004, 27): 'iBB',
+    (2004, 28): 'ii',
+    (2004, 29): 'iB',
+    (2004, 30): 'iB',
+    (2004, 31): 'iB',
+    (2004, 32): 'iiBii',
+    (2004, 33): 'ii',
+    (2004, 34): 'iBb',
+    (2004, 35): 'iB',
+    (2004, 36): 'iii',
+    (2004, 37): 'i',
+    (2004, 38): 'B',
+    (2004, 39): 'iB',
+    (2004, 40): 'iBiii',
+    (2004, 41): 'iBii',
+    (2004, 42): 'iBiii',
+    (2004, 43): 'iB',
+    (2004, 44): 'iB',
+    (2004, 45): 'ii',
+    (2004, 46): 'B',
+    (2004, 47): '',
+    # 2005: OBJECT
+    (2005, 1): 'ib',
+    (2005, 2): 'i',
+    (2005, 3): 'iB',
+    (2005, 4): 'iB',
+    (2005, 5): 'iii',
+    (2005, 6): 'iiB',
+    (2005, 7): 'ii',
+    (2005, 8): 'ib',
+    (2005, 9): 'iiiiifff',
+    (2005, 10): 'iBBB',
+    (2005, 11): 'iih',
+    (2005, 12): 'i',
+    (2005, 13): 'iB',
+    (2005, 14): 'iiiB',
+    (2005, 15): 'i',
+    # 2006: SFX
+    (2006, 1): 'iB',
+    (2006, 2): 'i',
+    (2006, 3): 'iiii',
+    (2006, 4): 'iii',
+    (2006, 5): 'ii',
+    # 2007: MESSAGE
+    (2007, 1): 'ihhif',
+    (2007, 2): 'B',
+    (2007, 3): 'iB',
+    (2007, 4): 'iB',
+    # 2008: CAMERA
+    (2008, 3): 'BBH',
+    # 2009: SCRIPT
+    (2009, 0): 'iii',
+    (2009, 3): 'iiffi',
+    (2009, 4): 'i',
+    (2009, 6): 'B',
+    # 2010: SOUND
+    (2010, 2): 'iii',
+    (2010, 3): 'iB',
+    # 2011: HIT
+    (2011, 1): 'iB',
+    # 2012: MAP
+    (2012, 1): 'iB',
+    # 1000: EXECUTION CONTROL (SYSTEM)
+    (1000, 1): 'BBb',
+    (1000, 2): 'BBb',
+    (1000, 3): 'B',
+    (1000, 4): 'B',
+    (1000, 5): 'Bbii',
+    (1000, 6): 'Bbii',
+    (1000, 7): 'BBb',
+    (1000, 8): 'BBb',
+    (1000, 9): 'f',
+    # 1001: EXECUTION CONTROL (TIMER)
+    (1001, 0): 'f',
+    (1001, 1): 'i',
+    (1001, 2): 'ff',
+    # 1003: EXECUTION CONTROL (EVENT)
+    (1003, 1): 'BBBi',
+    (1003, 2): 'BBBi',
+    (1003, 3): 'BBBii',
+    (1003, 4): 'BBBii',
+    (1003, 5): 'Bb',
+    (1003, 6): 'Bb',
+    (1003, 7): 'BBBB',
+    # 1005: EXECUTION CONTROL (OBJECT)
+    (1005, 1): 'BBi',
+    (1005, 2): 'BBi',
+    # 0: EXECUTION CONDITIONS (SYSTEM)
+    (0, 0): 'bBb',
+    # 1: EXECUTION CONDITIONS (TIME)
+    (1, 0): 'bf',
+    (1, 1): 'bi',
+    # 3: EXECUTION CONDITIONS (EVENT)
+    (3, 0): 'bBBi',
+    (3, 1): 'bBBii',
+    (3, 2): 'bBii',
+    (3, 3): 'bBiif',
+    (3, 4): 'bBiB',
+    (3, 5): 'biifhfiBi',
+    (3, 6): 'bb',
+    (3, 7): 'bBi',
+    (3, 8): 'bBBB',
+    (3, 9): 'bI',
+    (3, 10): 'bBiibi',
+    (3, 11): 'bBBB',
+    (3, 12): 'biBBI',
+    (3, 13): 'biifhfiBi',
+    (3, 14): 'bi',
+    (3, 15): 'bii',
+    (3, 16): 'bBiB',
+    (3, 17): 'bBB',
+    (3, 18): 'biifhfiBii',
+    (3, 19): 'biifhfiBii',
+    (3, 20): 'biBBiB',
+    (3, 21): 'bB',
+    (3, 22): 'bB',
+    # 4: EXECUTION CONDITIONS (CHARACTER)
+    (4, 0): 'biB',
+    (4, 1): 'bii',
+    (4, 2): 'bibf',
+    (4, 3): 'bib',
+    (4, 4): 'biiB',
+    (4, 5): 'biiB',
+    (4, 6): 'biiib',
+    (4, 7): 'biB',
+    (4, 8): 'biiB',
+    (4, 9): 'biB',
+    (4, 10): 'bB',
+    (4, 11): 'bB',
+    (4, 12): 'bB',
+    (4, 13): 'bBI',
+    (4, 14): 'biBi',
+    # 5: EXECUTION CONDITIONS (OBJECT)
+    (5, 0): 'bBi',
+    (5, 1): 'bii',
+    (5, 2): 'bi',
+    # 11: EXECUTION CONDITIONS (HIT)
+    (11, 0): 'bi',
+    (11, 1): 'bi',
+    (11, 2): 'bi',
+}
+
+# Instructions whose format above is only a prefix. Any further arguments (the
+# event arguments of 2000[00]) are typed with infer_format().
+VARIADIC_INSTRUCTIONS = {(2000, 0)}
+
+# Instructions with arguments (target, state) whose effect is fully replaced by
+# the same instruction on the same target, mapped to the state value that
+# toggles (and so depends on the previous state), if any.
+STATE_INSTRUCTIONS = {
+    (2003, 2): 2,  # set_event_flag (2 = CHANGE)
+    (2004, 1): None,  # set_ai
+    (2004, 5): None,  # set_character_state (enable/disable)
+    (2004, 10): None,  # set_gravity
+    (2004, 15): None,  # set_invincibility
+    (2004, 31): None,  # set_collision
+    (2005, 3): None,  # set_object_state
+    (2005, 4): None,  # set_treasure_state
+    (2011, 1): None,  # set_hitbox_state
+    (2012, 1): None,  # set_map_part_state
+}
+
+_opcode_layouts = {}
+
+
+def opcode_layout(bank, index, args=()):
+    """ Cached ArgLayout of instruction bank[index], built on first use.
+
+    Both the unpacked text writer and the binary packer share these objects, so
+    the packed size of every instruction is known before anything is written.
+    args is only needed for variadic instructions.
+    """
+    key = (bank, index)
+    try:
+        return _opcode_layouts[key]
+    except KeyError:
+        pass
+    try:
+        arg_format = INSTRUCTION_FORMATS[key]
+    except KeyError:
+        raise ValueError('Unknown instruction {}[{:02d}].'.format(bank, index))
+    if key in VARIADIC_INSTRUCTIONS:
+        return get_layout(arg_format + infer_format(args[len(arg_format):]))
+    layout = _opcode_layouts[key] = get_layout(arg_format)
+    return layout
@@ -0,0 +1,212 @@
+"""
+@author: grimrhapsody
+"""
+
+import mmap
+import os
+import struct
+from .events import Event, Instruction
+from .layouts import get_layout
+from .unpacked import UnpackedScript, parse_unpacked
+
+
+"""
+Binary cache of a parsed unpacked EMEVD file, stored next to it as
+'<name>.unpack.txt.cache'. Little-endian:
+
+    header              (CACHE_HEADER_STRUCT: source mtime and size, then table counts)
+    strings             (argument formats, then tags, each followed by '\\n')
+    item table          (one ITEM_STRUCT per event or top-level tag, in file order)
+    event table         (one EVENT_STRUCT per event)
+    instruction table   (one INSTRUCTION_STRUCT per instruction)
+    substitution table  (one SUBSTITUTION_STRUCT per ^(X <- Y, Z) line)
+    event tag table     (one EVENT_TAG_STRUCT per tag inside an event)
+    float table         (every 'f' argument, in order, as a double)
+    argument data       (each instruction's packed arguments, as in a packed EMEVD)
+
+The argument format of every instruction is stored as written, and float
+arguments are stored again as doubles (packed arguments only keep 32 bits), so
+loading the cache gives back exactly what parse_unpacked() would.
+"""
+
+
+CACHE_MAGIC = b'PDSC'
+CACHE_VERSION = 2
+CACHE_SUFFIX = '.cache'
+
+CACHE_HEADER_STRUCT = struct.Struct('<4sIqq' + 'I' * 9)
+ITEM_STRUCT = struct.Struct('<BI')  # (0, event number) or (1, tag number)
+EVENT_STRUCT = struct.Struct('<iII')  # event_id, restart_type, instruction count
+INSTRUCTION_STRUCT = struct.Struct('<HHHH')  # bank, index, format number, substitution count
+SUBSTITUTION_STRUCT = struct.Struct('<III')
+EVENT_TAG_STRUCT = struct.Struct('<III')  # event number, instruction position, tag number
+FLOAT_STRUCT = struct.Struct('<d')
+
+
+def _float_positions(arg_format):
+    return [i for i, field in enumerate(arg_format) if field == 'f']
+
+
+""" WRITING """
+
+
+def _source_stamp(unpacked_filename):
+    stat = os.stat(unpacked_filename)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def pack_script(script, stamp):
+    """ Pack an UnpackedScript into the cache layout. stamp is the (mtime_ns, size) of its source file. """
+    formats = {}
+    tags = {}
+    items = bytearray()
+    events = bytearray()
+    instructions = bytearray()
+    substitutions = bytearray()
+    event_tags = bytearray()
+    floats = []
+    args = bytearray()
+    event_numbers = {}
+    float_positions = {}  # arg_format -> positions of its 'f' fields
+    for item in script.items:
+        if isinstance(item, Event):
+            event_numbers[item.event_id] = len(event_numbers)
+            items += ITEM_STRUCT.pack(0, event_numbers[item.event_id])
+            events += EVENT_STRUCT.pack(item.event_id, item.restart_type, len(item.instructions))
+            for instruction in item.instructions:
+                layout = instruction.layout
+                format_number = formats.setdefault(layout.arg_format, len(formats))
+                instruction_substitutions = instruction.substitutions or ()
+                instructions += INSTRUCTION_STRUCT.pack(instruction.bank, instruction.index, format_number,
+                                                        len(instruction_substitutions))
+                for substitution in instruction_substitutions:
+                    substitutions += SUBSTITUTION_STRUCT.pack(*substitution)
+                args += layout.struct.pack(*instruction.args)
+                positions = float_positions.get(layout.arg_format)
+                if positions is None:
+                    positions = float_positions[layout.arg_format] = _float_positions(layout.arg_format)
+                floats.extend(instruction.args[i] for i in positions)
+        else:
+            items += ITEM_STRUCT.pack(1, tags.setdefault(item, len(tags)))
+    for event_id, positions in script.event_tags.items():
+        for position, tag in positions:
+            event_tags += EVENT_TAG_STRUCT.pack(event_numbers[event_id], position, tags.setdefault(tag, len(tags)))
+    strings = ''.join(string + '\n' for string in list(formats) + list(tags)).encode('utf-8')
+    header = CACHE_HEADER_STRUCT.pack(
+        CACHE_MAGIC, CACHE_VERSION, stamp[0], stamp[1], len(strings), len(formats), len(tags),
+        len(items) // ITEM_STRUCT.size, len(events) // EVENT_STRUCT.size,
+        len(instructions) // INSTRUCTION_STRUCT.size, len(substitutions) // SUBSTITUTION_STRUCT.size,
+        len(event_tags) // EVENT_TAG_STRUCT.size, len(floats))
+    float_table = struct.pack('<{}d'.format(len(floats)), *floats)
+    return b''.join((header, strings, items, events, instructions, substitutions, event_tags, float_table, args))
+
+
+def write_cache(script, unpacked_filename, stamp=None):
+    """ Write the cache file of unpacked_filename. Returns False if it couldn't be written, including when the
+    script has arguments that don't fit their field types (the game couldn't load those either). """
+    if stamp is None:
+        stamp = _source_stamp(unpacked_filename)
+    cache_filename = unpacked_filename + CACHE_SUFFIX
+    temp_filename = cache_filename + '.tmp{}'.format(os.getpid())
+    try:
+        data = pack_script(script, stamp)
+    except (struct.error, ValueError, OverflowError):
+        return False
+    try:
+        with open(temp_filename, 'wb') as file:
+            file.write(data)
+        os.replace(temp_filename, cache_filename)
+    except OSError:
+        try:
+            os.remove(temp_filename)
+        except OSError:
+            pass
+        return False
+    return True
+
+
+""" READING """
+
+
+def unpack_script(data):
+    """ Rebuild an UnpackedScript from packed cache data (bytes, or an mmap). """
+    header = CACHE_HEADER_STRUCT.unpack_from(data, 0)
+    (magic, version, _, _, strings_size, format_count, tag_count, item_count, event_count, instruction_count,
+     substitution_total, event_tag_count, float_count) = header
+    if magic != CACHE_MAGIC or version != CACHE_VERSION:
+        raise ValueError('Not a pydses map cache (version {}).'.format(CACHE_VERSION))
+    offset = CACHE_HEADER_STRUCT.size
+    strings = bytes(data[offset:offset + strings_size]).decode('utf-8').split('\n')
+    offset += strings_size
+    layouts = [get_layout(arg_format) for arg_format in strings[:format_count]]
+    tags = strings[format_count:format_count + tag_count]
+
+    def table(table_struct, count):
+        nonlocal offset
+        rows = list(table_struct.iter_unpack(data[offset:offset + table_struct.size * count]))
+        offset += table_struct.size * count
+        return rows
+
+    items = table(ITEM_STRUCT, item_count)
+    event_rows = table(EVENT_STRUCT, event_count)
+    instruction_rows = table(INSTRUCTION_STRUCT, instruction_count)
+    substitution_rows = table(SUBSTITUTION_STRUCT, substitution_total)
+    event_tag_rows = table(EVENT_TAG_STRUCT, event_tag_count)
+    floats = iter(struct.unpack_from('<{}d'.format(float_count), data, offset))
+    offset += FLOAT_STRUCT.size * float_count
+    float_positions = [_float_positions(layout.arg_format) for layout in layouts]
+
+    instructions = []
+    substitution_position = 0
+    for bank, index, format_number, substitution_count in instruction_rows:
+        layout = layouts[format_number]
+        if substitution_count:
+            substitutions = substitution_rows[substitution_position:substitution_position + substitution_count]
+            substitution_position += substitution_count
+        else:
+            substitutions = None
+        args = layout.struct.unpack_from(data, offset)
+        offset += layout.size
+        if float_positions[format_number]:
+            args = list(args)
+            for i in float_positions[format_number]:
+                args[i] = next(floats)
+        instructions.append(Instruction(bank, index, layout, args, substitutions))
+    events = []
+    first = 0
+    for event_id, restart_type, count in event_rows:
+        events.append(Event(event_id, restart_type, instructions[first:first + count]))
+        first += count
+
+    script = UnpackedScript()
+    for kind, number in items:
+        script.append(events[number] if kind == 0 else tags[number])
+    for event_number, position, tag_number in event_tag_rows:
+        script.add_event_tag(events[event_number].event_id, tags[tag_number], position)
+    return script
+
+
+def load_unpacked(unpacked_filename, write=True):
+    """ Parse an unpacked EMEVD file, using its binary cache if the file hasn't changed since it was cached.
+
+    The cache is read with a single mmap. If it is missing or stale, the file is parsed normally and (if write is True)
+    a new cache is written next to it.
+    """
+    stamp = _source_stamp(unpacked_filename)
+    try:
+        with open(unpacked_filename + CACHE_SUFFIX, 'rb') as file:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                if CACHE_HEADER_STRUCT.unpack_from(data, 0)[2:4] == stamp:
+                    return unpack_script(data)
+    except (OSError, ValueError, struct.error):
+        pass  # missing, empty or unreadable cache
+    script = parse_unpacked(unpacked_filename)
+    if write:
+        write_cache(script, unpacked_filename, stamp)
+    return script
+
+
+def load_unpacked_directory(directory, suffix='.unpack.txt', write=True):
+    """ Load every unpacked EMEVD in directory (through the cache), as {map_name: UnpackedScript}. """
+    return {filename.split('.')[0]: load_unpacked(os.path.join(directory, filename), write)
+            for filename in sorted(os.listdir(directory)) if filename.endswith(suffix)}
@@ -0,0 +1,178 @@
+"""
+@author: grimrhapsody
+"""
+
+from enum import Enum
+from functools import lru_cache
+from types import CodeType, FunctionType, ModuleType
+from .builder import EventBuilder, render_events
+
+
+""" FUNCTION FINGERPRINTS """
+
+
+# Plain values whose current value is part of a fingerprint (e.g. flag constants
+# in your event module, or read as consts.BOSS_ID or Flags.BOSS_DEAD). Anything
+# else referenced by name is ignored, apart from functions, modules and classes,
+# which are followed.
+_CONSTANT_TYPES = (int, float, str, bytes, bool, type(None), Enum)
+_PACKAGE = __name__.rpartition('.')[0]
+
+_code_shapes = {}  # code object -> (structure, referenced names)
+_MISSING = object()
+
+
+def _code_shape(code):
+    # Code objects are immutable, so their structure only has to be computed once.
+    try:
+        return _code_shapes[code]
+    except KeyError:
+        pass
+    consts = []
+    names = list(code.co_names)
+    for const in code.co_consts:
+        if isinstance(const, CodeType):
+            nested_structure, nested_names = _code_shape(const)
+            consts.append(nested_structure)
+            names.extend(nested_names)
+        else:
+            consts.append(const)
+    shape = (code.co_code, tuple(consts), code.co_names), tuple(dict.fromkeys(names))
+    _code_shapes[code] = shape
+    return shape
+
+
+def _is_own(value):
+    # pydses's own functions and classes don't change during a session, so they aren't walked.
+    module = getattr(value, '__module__', None) or ''
+    return module == _PACKAGE or module.startswith(_PACKAGE + '.')
+
+
+def _follow(label, name, value, pending, namespaces, parts):
+    if isinstance(value, FunctionType):
+        if not _is_own(value):
+            pending.append(value)
+    elif isinstance(value, ModuleType):
+        namespaces.append(value)  # e.g. the consts of pkg.consts.BOSS_ID
+    elif isinstance(value, type):
+        if not _is_own(value):
+            namespaces.append(value)  # e.g. the Flags of Flags.BOSS_DEAD
+    elif isinstance(value, _CONSTANT_TYPES):
+        parts.append((label, name, value))
+
+
+def function_fingerprint(function):
+    """ Hashable summary of the code that calling function will run.
+
+    Covers the function's own bytecode, constants and names, plus (recursively)
+    every function it refers to by global name, through a closure, or as an
+    attribute of a module or class, and the current value of any plain
+    constants it refers to (in the same ways). Redefining or reloading any of
+    them gives a different fingerprint.
+
+    Values read any other way are not covered: items of lists and dicts,
+    attributes of instances (such as EventParameters), and anything computed
+    or read from files at run time. Call clear_render_cache() after changing
+    those. pydses's own functions are not walked.
+    """
+    parts = []
+    visited = set()
+    pending = [function]
+    while pending:
+        function = pending.pop()
+        if id(function) in visited:
+            continue
+        visited.add(id(function))
+        code = function.__code__
+        structure, names = _code_shape(code)
+        parts.append((function.__module__, function.__qualname__, structure, function.__defaults__))
+        namespaces = []
+        for name, cell in zip(code.co_freevars, function.__closure__ or ()):
+            try:
+                value = cell.cell_contents
+            except ValueError:
+                continue  # not assigned yet
+            _follow(function.__qualname__, name, value, pending, namespaces, parts)
+        namespace = function.__globals__
+        for name in names:
+            value = namespace.get(name, _MISSING)
+            if value is not _MISSING:
+                _follow(None, name, value, pending, namespaces, parts)
+        seen_namespaces = set()
+        while namespaces:
+            owner = namespaces.pop()
+            if id(owner) in seen_namespaces:
+                continue
+            seen_namespaces.add(id(owner))
+            label = getattr(owner, '__qualname__', owner.__name__)
+            for name in names:
+                value = getattr(owner, name, _MISSING)
+                if value is not _MISSING:
+                    _follow(label, name, value, pending, namespaces, parts)
+    return tuple(parts)
+
+
+""" RENDER CACHE """
+
+
+def _build(event_function, args, optimize):
+    with EventBuilder() as builder:
+        event_function(*args)
+    if optimize:
+        builder.optimize()
+    return tuple(builder.events)
+
+
+@lru_cache(maxsize=1024)
+def _cached_build(event_function, fingerprint, args, optimize):
+    return _build(event_function, args, optimize)
+
+
+@lru_cache(maxsize=1024)
+def _render(event_function, fingerprint, args, optimize):
+    return render_events(_cached_build(event_function, fingerprint, args, optimize))
+
+
+def _cache_key(event_function, args):
+    # (fingerprint, args) if event_function(*args) can be cached, else None.
+    if not isinstance(event_function, FunctionType):
+        return None
+    key = (function_fingerprint(event_function), args)
+    try:
+        hash(key)
+    except TypeError:
+        return None  # unhashable arguments (or defaults)
+    return key
+
+
+def build_event(event_function, *args, optimize=False):
+    """ The Events written by event_function(*args), as a tuple, reusing earlier builds.
+
+    Builds are cached like render_event() renders (and render_event() renders
+    these same Events), so treat them as read-only.
+    """
+    key = _cache_key(event_function, args)
+    if key is None:
+        return _build(event_function, args, optimize)
+    return _cached_build(event_function, *key, optimize)
+
+
+def render_event(event_function, *args, optimize=False):
+    """ Render event_function(*args) to unpacked EMEVD text, reusing earlier renders.
+
+    Results are kept in an LRU cache keyed by the function, its fingerprint and
+    its arguments, so a shared event is only run once per session unless its
+    code (or anything it calls) changes. Calls with unhashable arguments are
+    rendered every time. If optimize is True, the peephole optimizer (see
+    optimize.py) is run before rendering.
+    """
+    key = _cache_key(event_function, args)
+    if key is None:
+        return render_events(_build(event_function, args, optimize))
+    return _render(event_function, *key, optimize)
+
+
+def clear_render_cache():
+    """ Forget every cached build and render, e.g. after changing data your event functions read at run time. """
+    _render.cache_clear()
+    _cached_build.cache_clear()
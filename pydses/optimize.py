@@ -0,0 +1,148 @@
+"""
+@author: grimrhapsody
+"""
+
+from .layouts import STATE_INSTRUCTIONS
+from .verbose import argument_names
+
+
+"""
+Optional peephole optimizer for linked events (Event objects with real skip
+counts, e.g. EventBuilder.events after the builder is closed). Removes:
+
+    - skips of zero lines
+    - instructions that can never run (after an unconditional end/restart or
+      inside an unconditional skip, unless another skip lands there)
+    - a state instruction (set_event_flag, enable/disable, etc.) that is
+      immediately overwritten by another one with the same target
+    - a condition (if_* instruction) added to an AND/OR register again, in the
+      same straight run of instructions, before MAIN is next evaluated
+
+and then fixes up every skip count. Instructions with parameter substitutions
+are never removed or merged, and events whose skip counts are substituted are
+left alone entirely.
+"""
+
+
+SKIP = (1000, 3)
+TERMINATE = (1000, 4)
+
+
+def _line_count_index(instruction):
+    # Argument index of the line count of a skip instruction, or None.
+    names = argument_names(instruction.bank, instruction.index)
+    if names and 'line_count' in names:
+        return names.index('line_count')
+    return None
+
+
+def _output_condition(instruction):
+    # Output register of a condition instruction (bank < 1000), or None.
+    if instruction.bank >= 1000:
+        return None
+    names = argument_names(instruction.bank, instruction.index, len(instruction.args))
+    if names and 'condition' in names:
+        return instruction.args[names.index('condition')]
+    return None
+
+
+def _remove_pass(instructions, skips):
+    # Positions to remove in one pass. skips maps the position of every skip
+    # instruction to its line count argument index.
+    count = len(instructions)
+    targets = {position + 1 + instructions[position].args[i] for position, i in skips.items()}
+
+    reachable = [False] * count
+    stack = [0] if count else []
+    while stack:
+        position = stack.pop()
+        while position < count and not reachable[position]:
+            reachable[position] = True
+            instruction = instructions[position]
+            key = (instruction.bank, instruction.index)
+            if key == TERMINATE:
+                break
+            if position in skips:
+                target = position + 1 + instruction.args[skips[position]]
+                if key == SKIP:
+                    position = target
+                    continue
+                stack.append(target)
+            position += 1
+
+    remove = set()
+    previous = None  # last kept position
+    conditions = set()  # (bank, index, args) added to registers in this run
+    for position, instruction in enumerate(instructions):
+        if position in targets or previous is None:
+            conditions.clear()
+        if instruction.substitutions:
+            previous = position
+            conditions.clear()
+            continue
+        key = (instruction.bank, instruction.index)
+        if not reachable[position] or (position in skips and instruction.args[skips[position]] == 0):
+            remove.add(position)
+            continue
+        if previous is not None and previous not in skips:
+            earlier = instructions[previous]
+            if ((earlier.bank, earlier.index) == key and key in STATE_INSTRUCTIONS and not earlier.substitutions
+                    and earlier.args[0] == instruction.args[0] and instruction.args[1] != STATE_INSTRUCTIONS[key]):
+                remove.add(previous)
+        output_condition = _output_condition(instruction)
+        if output_condition is not None:
+            if output_condition == 0:
+                conditions.clear()  # MAIN evaluated, so every register is cleared
+            else:
+                signature = (instruction.bank, instruction.index, instruction.args)
+                if signature in conditions:
+                    remove.add(position)
+                    continue
+                conditions.add(signature)
+        previous = position
+    return remove
+
+
+def optimize_event(event):
+    """ Optimize one event in place. Returns the number of instructions removed. """
+    removed = 0
+    while True:
+        instructions = event.instructions
+        skips = {}
+        for position, instruction in enumerate(instructions):
+            i = _line_count_index(instruction)
+            if i is not None:
+                if instruction.substitutions:
+                    return removed  # skip counts are only known at run time
+                skips[position] = i
+        remove = _remove_pass(instructions, skips)
+        if not remove:
+            return removed
+        # new_positions[p] is the new position of old position p (or of the
+        # next kept instruction, if p is removed).
+        new_positions = []
+        kept = 0
+        for position in range(len(instructions)):
+            new_positions.append(kept)
+            if position not in remove:
+                kept += 1
+        for position, i in skips.items():
+            if position in remove:
+                continue
+            instruction = instructions[position]
+            target = position + 1 + instruction.args[i]
+            if target < len(instructions):
+                new_target = new_positions[target]
+            else:
+                new_target = kept + target - len(instructions)
+            args = list(instruction.args)
+            args[i] = new_target - new_positions[position] - 1
+            instruction.args = tuple(args)
+        event.instructions = [instruction for position, instruction in enumerate(instructions)
+                              if position not in remove]
+        removed += len(remove)
+
+
+def optimize_events(events):
+    """ Optimize every event in place. Returns the total number of instructions removed. """
+    return sum(optimize_event(event) for event in events)
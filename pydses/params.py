@@ -0,0 +1,106 @@
+"""
+@author: grimrhapsody
+"""
+
+import struct
+from .layouts import FIELD_SIZES, get_layout
+
+
+"""
+Symbolic event parameters, so you never have to work out load_arg() offsets:
+
+    BOSS_DOOR = EventParameters(param('boss', 'i'), param('door_flag', 'I'), param('delay', 'f'))
+
+    def event11810300():
+        event(11810300, 0)
+        if_entity_dead(CONT, BOSS_DOOR.boss)
+        wait(BOSS_DOOR.delay)
+        set_event_flag(BOSS_DOOR.door_flag, 1)
+
+    def event0():
+        ...
+        initialize_event_with_slot(0, 11810300, *BOSS_DOOR.pack(boss=1810800, door_flag=11810301, delay=1.5))
+
+A Param can be passed to any instruction wrapper. It is written as 0 with a
+^(X <- Y, Z) line that loads it from the event arguments, using the offset of
+the instruction field (from the instruction's ArgLayout) and the offset of the
+parameter (from the EventParameters layout, which packs parameters in order
+like any instruction's arguments).
+"""
+
+
+class Param(object):
+    """ A named event parameter. Declare it in an EventParameters to give it an offset. """
+
+    __slots__ = ('name', 'arg_format', 'offset')
+
+    def __init__(self, name, arg_format='i'):
+        if arg_format not in FIELD_SIZES:
+            raise ValueError('Unknown parameter type {!r}.'.format(arg_format))
+        self.name = name
+        self.arg_format = arg_format
+        self.offset = None
+
+    def __repr__(self):
+        return 'param({!r}, {!r})'.format(self.name, self.arg_format)
+
+
+def param(name, arg_format='i'):
+    return Param(name, arg_format)
+
+
+class EventParameters(object):
+    """ The argument layout of one parameterized event. Parameters are attributes (BOSS_DOOR.boss). """
+
+    def __init__(self, *params):
+        names = [p.name for p in params]
+        if len(set(names)) != len(names):
+            raise ValueError('Parameter names must be unique: {}'.format(names))
+        self.params = params
+        self.layout = get_layout(''.join(p.arg_format for p in params))
+        for p, offset in zip(params, self.layout.offsets):
+            if p.offset is not None:
+                raise ValueError('{!r} is already part of another EventParameters.'.format(p))
+            p.offset = offset
+        self._by_name = dict(zip(names, params))
+
+    def __getattr__(self, name):
+        try:
+            return self.__dict__['_by_name'][name]
+        except KeyError:
+            raise AttributeError('No event parameter named {!r}.'.format(name))
+
+    def pack(self, **values):
+        """ Event arguments for initialize_event_with_slot(), as four-byte values.
+
+        Parameters that fill a whole four-byte word are passed through as given;
+        smaller ones are packed together into integer words.
+        """
+        missing = [p.name for p in self.params if p.name not in values]
+        unknown = [name for name in values if name not in self._by_name]
+        if missing or unknown:
+            raise ValueError('Event parameters missing: {}. Unknown: {}.'.format(missing, unknown))
+        if not self.params:
+            return ()
+        data = self.layout.struct.pack(*(values[p.name] for p in self.params))
+        whole_words = {p.offset: values[p.name] for p in self.params if FIELD_SIZES[p.arg_format] == 4}
+        return tuple(whole_words.get(4 * i, word)
+                     for i, word in enumerate(struct.unpack('<{}i'.format(len(data) // 4), data)))
+
+
+def substitute_parameters(bank, index, layout, args):
+    """ Replace Param arguments of an instruction with zero. Returns (args, substitutions). """
+    args = list(args)
+    substitutions = []
+    for i, arg in enumerate(args):
+        if not isinstance(arg, Param):
+            continue
+        field = layout.arg_format[i]
+        if arg.offset is None:
+            raise ValueError('{!r} has no offset. Declare it in an EventParameters first.'.format(arg))
+        if FIELD_SIZES[arg.arg_format] < FIELD_SIZES[field] or (arg.arg_format == 'f') != (field == 'f'):
+            raise ValueError("{!r} can't be loaded into argument {} ({!r}) of {}[{:02d}].".format(
+                arg, i, field, bank, index))
+        args[i] = 0.0 if field == 'f' else 0
+        substitutions.append((layout.offsets[i], arg.offset, FIELD_SIZES[field]))
+    return args, substitutions
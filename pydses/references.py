@@ -0,0 +1,162 @@
+"""
+@author: grimrhapsody
+"""
+
+import json
+import os
+from os.path import join
+from .emevd import read_emevd
+from .mapcache import load_unpacked
+from .verbose import argument_names
+
+
+INDEX_VERSION = 1
+
+
+""" ARGUMENT ROLES """
+
+
+def instruction_references(instruction):
+    """ Yield (kind, id, role) for every entity and event flag argument of an instruction.
+
+    kind is 'entity' or 'flag'. role is the argument name from verbose.INSTRUCTION_INFO
+    (e.g. 'area_entity_id' or 'first_flag_id'). Event IDs are also flags, so they
+    are reported as flags. Arguments replaced by event parameters are skipped,
+    since their real value is only known when the event is initialized.
+    """
+    names = argument_names(instruction.bank, instruction.index, len(instruction.args))
+    if names is None:
+        return
+    substituted = set()
+    for write_from_offset, _, _ in instruction.substitutions or ():
+        if write_from_offset in instruction.layout.offsets:
+            substituted.add(instruction.layout.offsets.index(write_from_offset))
+    for i, (name, value) in enumerate(zip(names, instruction.args)):
+        if i in substituted:
+            continue
+        if name.endswith('entity_id'):
+            yield 'entity', value, name
+        elif name.endswith('flag_id') or name == 'event_id':
+            yield 'flag', value, name
+
+
+def event_references(events):
+    """ Index section of one map: {'entity': {id: [[event_id, line, role], ...]}, 'flag': {...}}. """
+    section = {'entity': {}, 'flag': {}}
+    for event in events:
+        for line, instruction in enumerate(event.instructions):
+            for kind, value, role in instruction_references(instruction):
+                section[kind].setdefault(value, []).append([event.event_id, line, role])
+    return section
+
+
+""" REFERENCE INDEX """
+
+
+class ReferenceIndex(object):
+    """ Every reference to each entity ID and event flag ID, across maps.
+
+    The index is kept as one section per map, so a single changed map can be
+    re-indexed without touching the others, and as merged lookup tables, so
+    entity() and flag() are single dictionary lookups. Each occurrence is a
+    (map_name, event_id, instruction_index, argument_role) tuple.
+    """
+
+    def __init__(self):
+        self.sections = {}  # map_name -> event_references() section
+        self.stamps = {}  # map_name -> (mtime_ns, size) of the indexed source file, if any
+        self._lookup = {'entity': {}, 'flag': {}}
+
+    def entity(self, entity_id):
+        return self._lookup['entity'].get(entity_id, [])
+
+    def flag(self, flag_id):
+        return self._lookup['flag'].get(flag_id, [])
+
+    def update_map(self, map_name, events, stamp=None):
+        """ (Re-)index the events of one map, replacing anything indexed for it before. """
+        self.remove_map(map_name)
+        section = self.sections[map_name] = event_references(events)
+        if stamp is not None:
+            self.stamps[map_name] = tuple(stamp)
+        self._add_section(map_name, section)
+
+    def remove_map(self, map_name):
+        section = self.sections.pop(map_name, None)
+        self.stamps.pop(map_name, None)
+        if section is None:
+            return
+        for kind, references in section.items():
+            lookup = self._lookup[kind]
+            for value in references:
+                remaining = [occurrence for occurrence in lookup[value] if occurrence[0] != map_name]
+                if remaining:
+                    lookup[value] = remaining
+                else:
+                    del lookup[value]
+
+    def _add_section(self, map_name, section):
+        for kind, references in section.items():
+            lookup = self._lookup[kind]
+            for value, occurrences in references.items():
+                lookup.setdefault(value, []).extend(
+                    (map_name, event_id, line, role) for event_id, line, role in occurrences)
+
+    def update_file(self, filename, map_name=None):
+        """ Index an unpacked (*.unpack.txt) or packed (*.emevd) file, unless it is unchanged since it was indexed.
+
+        map_name defaults to the file name up to its first dot (e.g. 'm18_01_00_00'). Template tags are ignored.
+        Returns True if the file was (re-)indexed.
+        """
+        if map_name is None:
+            map_name = os.path.basename(filename).split('.')[0]
+        stat = os.stat(filename)
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        if self.stamps.get(map_name) == stamp:
+            return False
+        if filename.endswith('.emevd'):
+            with read_emevd(filename) as reader:
+                events = reader.events()
+        else:
+            events = load_unpacked(filename).events.values()
+        self.update_map(map_name, events, stamp)
+        return True
+
+    def update_directory(self, directory, suffix='.unpack.txt', prefix=''):
+        """ Index every file ending in suffix in directory, skipping unchanged maps. Returns the re-indexed names.
+
+        prefix is added to every map name, e.g. 'vanilla:' to index packed vanilla files alongside your own maps.
+        """
+        updated = []
+        for filename in sorted(os.listdir(directory)):
+            if filename.endswith(suffix):
+                map_name = prefix + filename.split('.')[0]
+                if self.update_file(join(directory, filename), map_name):
+                    updated.append(map_name)
+        return updated
+
+    def save(self, path):
+        sections = {map_name: {kind: {str(value): occurrences for value, occurrences in references.items()}
+                               for kind, references in section.items()}
+                    for map_name, section in self.sections.items()}
+        with open(path, 'w') as file:
+            json.dump({'version': INDEX_VERSION, 'maps': sections, 'stamps': self.stamps}, file)
+
+    @classmethod
+    def load(cls, path):
+        """ Load a saved index. Returns an empty index if path doesn't exist or was saved by another version. """
+        index = cls()
+        try:
+            with open(path) as file:
+                saved = json.load(file)
+        except FileNotFoundError:
+            return index
+        if saved.get('version') != INDEX_VERSION:
+            return index
+        for map_name, section in saved['maps'].items():
+            section = {kind: {int(value): occurrences for value, occurrences in references.items()}
+                       for kind, references in section.items()}
+            index.sections[map_name] = section
+            index._add_section(map_name, section)
+        index.stamps = {map_name: tuple(stamp) for map_name, stamp in saved['stamps'].items()}
+        return index
@@ -0,0 +1,153 @@
+"""
+@author: grimrhapsody
+"""
+
+from bisect import bisect_left
+from .verbose import argument_names
+
+
+"""
+Symbolic condition registers. Use a Register anywhere an instruction takes a
+condition register (the output_condition of the if_* instructions, or the
+input condition of if_condition_state, skip_if_condition_state, etc.):
+
+    door_ready = all_of()
+    if_event_flag_on(door_ready, flag_type.event_flag, 11810000)
+    if_entity_alive(door_ready, 1810800)
+    if_condition_true(CONT, door_ready)
+
+When the EventBuilder is closed, each Register is given a physical AND or OR
+register that is free for every instruction between its first and last use.
+Conditions stay in a register until MAIN is next evaluated, so a register is
+only free again once it has been used for the last time AND a condition
+instruction writing to MAIN has run since, on every path: a MAIN evaluation
+that a skip (taken or not) could jump over after the register was first used
+doesn't count. Registers written by hand (AND1, OR2, ...) are left alone and
+never handed out in that event.
+"""
+
+
+REGISTER_COUNT = 7  # of each kind
+CONDITION_ARGUMENTS = ('condition', 'input_condition')
+
+
+class Register(object):
+    """ A symbolic AND (all of its conditions) or OR (any of its conditions) register. """
+
+    __slots__ = ('kind', 'name')
+
+    def __init__(self, kind, name=None):
+        if kind not in ('AND', 'OR'):
+            raise ValueError("Register kind must be 'AND' or 'OR', not {!r}.".format(kind))
+        self.kind = kind
+        self.name = name
+
+    def __repr__(self):
+        return '<{} register {}>'.format(self.kind, self.name if self.name is not None else hex(id(self)))
+
+
+def _register_arguments(event, position):
+    # (argument index, Register) pairs of one instruction, checking they are
+    # only used as condition registers.
+    instruction = event.instructions[position]
+    names = argument_names(instruction.bank, instruction.index, len(instruction.args)) or ()
+    for i, arg in enumerate(instruction.args):
+        if isinstance(arg, Register):
+            if i >= len(names) or names[i] not in CONDITION_ARGUMENTS:
+                raise ValueError('Event {}, line {} ({}[{:02d}]): {!r} can only be used as a condition '
+                                 'register.'.format(event.event_id, position, instruction.bank, instruction.index, arg))
+            yield i, arg
+
+
+def _scan_event(event):
+    # Physical register numbers (positive for AND, negative for OR) used
+    # directly anywhere in the event, the positions of condition instructions
+    # (banks below 1000) that write to MAIN, and (position, target) of every
+    # skip instruction. Skips whose line count is substituted could land
+    # anywhere, so their target is the end of the event.
+    used = set()
+    main_positions = []
+    skips = []
+    for position, instruction in enumerate(event.instructions):
+        names = argument_names(instruction.bank, instruction.index, len(instruction.args)) or ()
+        for name, arg in zip(names, instruction.args):
+            if name in CONDITION_ARGUMENTS and isinstance(arg, int):
+                if arg != 0:
+                    used.add(arg)
+                elif name == 'condition' and instruction.bank < 1000:
+                    main_positions.append(position)
+            elif name == 'line_count':
+                if isinstance(arg, int) and not instruction.substitutions:
+                    skips.append((position, position + 1 + arg))
+                else:
+                    skips.append((position, len(event.instructions)))
+    return used, main_positions, skips
+
+
+def _cleared(main_positions, skips, first_use, last_use, position):
+    # True if MAIN is evaluated at or after last_use and before position on
+    # every path from first_use, i.e. no skip from first_use onwards jumps over
+    # that evaluation.
+    i = bisect_left(main_positions, last_use)
+    while i < len(main_positions) and main_positions[i] < position:
+        main = main_positions[i]
+        if not any(first_use <= source < main < target for source, target in skips):
+            return True
+        i += 1
+    return False
+
+
+def allocate_event_registers(event, positions):
+    """ Replace the Register arguments of event.instructions[position] (for each position) with physical registers.
+
+    Registers are assigned in order of first use (linear scan), each taking the
+    lowest free register of its kind. Raises ValueError if more than seven of
+    one kind would be in use at once.
+    """
+    first_use = {}
+    last_use = {}
+    for position in sorted(positions):
+        for _, register in _register_arguments(event, position):
+            first_use.setdefault(register, position)
+            last_use[register] = position
+    if not first_use:
+        return
+    hand_written, main_positions, skips = _scan_event(event)
+    free = {kind: [number for number in range(1, REGISTER_COUNT + 1) if sign * number not in hand_written]
+            for kind, sign in (('AND', 1), ('OR', -1))}
+    live = {'AND': [], 'OR': []}
+    assigned = {}
+    for register in sorted(first_use, key=first_use.get):
+        start = first_use[register]
+        kind_live, kind_free = live[register.kind], free[register.kind]
+        for other in [other for other in kind_live
+                      if _cleared(main_positions, skips, first_use[other], last_use[other], start)]:
+            kind_live.remove(other)
+            kind_free.append(abs(assigned[other]))
+        if not kind_free:
+            raise ValueError(
+                'Event {}, line {}: no {} register is free for {!r}. Live: {}{}. At most {} {} registers can be '
+                'live at once.'.format(
+                    event.event_id, start, register.kind, register, ', '.join(repr(other) for other in kind_live),
+                    ''.join(', {}{} (written by hand)'.format(register.kind, abs(number)) for number in
+                            sorted(hand_written) if (number > 0) == (register.kind == 'AND')),
+                    REGISTER_COUNT, register.kind))
+        number = min(kind_free)
+        kind_free.remove(number)
+        assigned[register] = number if register.kind == 'AND' else -number
+        kind_live.append(register)
+    for position in positions:
+        instruction = event.instructions[position]
+        args = list(instruction.args)
+        for i, register in _register_arguments(event, position):
+            args[i] = assigned[register]
+        instruction.args = tuple(args)
+
+
+def allocate_registers(unlinked):
+    """ Allocate registers for every (event, instruction position) pair in unlinked, one event at a time. """
+    events = {}
+    for event, position in unlinked:
+        events.setdefault(id(event), (event, []))[1].append(position)
+    for event, positions in events.values():
+        allocate_event_registers(event, positions)
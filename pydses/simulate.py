@@ -0,0 +1,668 @@
+"""
+@author: grimrhapsody
+"""
+
+import heapq
+import math
+import operator
+import os
+import random
+import struct
+from array import array
+from os.path import join
+from .emevd import read_emevd
+from .layouts import STATE_INSTRUCTIONS
+from .mapcache import load_unpacked
+
+
+"""
+Headless event interpreter, for testing events without launching the game.
+
+    with EventBuilder() as builder:
+        event0()
+        event11810300()
+
+    sim = EventSimulator(builder.events)
+    sim.start()  # initializes Event 0 and Event 50
+    sim.set_flag(16, True)
+    sim.tick(60)  # two seconds at 30 frames per second
+    assert not sim.is_enabled(1810800)
+
+Events can also come from parse_unpacked(...).event_list() or read_emevd(...).
+
+Each frame, every running event executes until it waits. Condition
+instructions (banks below 1000) add their result to an AND (1 to 7) or OR (-1
+to -7) register, or wait on MAIN (0): if MAIN is false, the event waits, and
+next frame every condition added since MAIN was last evaluated is checked
+again, as in the game. Once MAIN is true, the registers are cleared and their
+final values are kept for the "finished register" instructions. wait() and
+wait_frames() put an event to sleep, and if_time_elapsed() counts frames
+since the event started (or restarted).
+
+Instructions are dispatched through two dictionaries keyed by (bank, index):
+sim.conditions (functions (sim, instance, args) returning True or False) and
+sim.commands (functions (sim, instance, args) returning None to go on to the
+next line, a number of lines to skip, or STOP if the event is no longer
+running). Add your own before starting, e.g. to pretend the player has an item:
+
+    sim.conditions[(3, 4)] = lambda sim, instance, args: True
+
+Conditions with no handler are never true, and commands with no handler do
+nothing (they are still recorded in sim.log). The world state the built-in
+handlers use is set directly: set_flag(), kill(), destroy(), enter_area() and
+leave_area(). Commands that set a state (enable/disable, set_ai, etc.) are
+stored in sim.states and can be checked with state() or is_enabled().
+
+To see which events of a map cost the most each frame, profile it. Every event
+initialized (directly or not) from Event 0 and Event 50 runs for a number of
+frames with nothing else happening, so events waiting on conditions are
+checked every frame:
+
+    sim = profile_map(parse_unpacked('m18_01_00_00.unpack.txt').event_list(), frames=FPS * 60)
+    print(sim.report())
+
+sim.evaluations counts the instructions (including condition checks) evaluated
+by each event ID, and sim.frame_evaluations the total for each frame. Sleeping
+events wait in a heap ordered by wake-up frame and cost nothing until then.
+"""
+
+
+FPS = 30
+MAIN = 0
+PLAYER = 10000
+ROOT_EVENTS = (0, 50)
+END, RESTART = 0, 1
+STOP = -1
+
+# comparison_type values.
+COMPARISONS = (operator.eq, operator.ne, operator.gt, operator.lt, operator.ge, operator.le)
+
+# Instance states.
+RUNNING, WAITING, SLEEPING, DONE = range(4)
+
+
+def _frames(seconds):
+    return max(0, int(math.ceil(seconds * FPS - 1e-6)))
+
+
+class EventInstance(object):
+    """ One initialized event (event ID and slot) and where it is in its instructions.
+
+    program is a list of ((bank, index), handler, args) tuples, with any
+    ^(X <- Y, Z) substitutions already applied from the event arguments.
+    """
+
+    __slots__ = ('event_id', 'slot', 'event_args', 'program', 'position', 'state', 'start_frame', 'wake_frame',
+                 'registers', 'finished', 'pending')
+
+    def __init__(self, event_id, slot, event_args, program):
+        self.event_id = event_id
+        self.slot = slot
+        self.event_args = event_args
+        self.program = program
+        self.position = 0
+        self.state = RUNNING
+        self.start_frame = 0
+        self.wake_frame = 0
+        self.registers = {}  # register -> current value
+        self.finished = {}  # register -> value when MAIN was last true
+        self.pending = []  # positions of conditions added to registers since MAIN was last evaluated
+
+    def __repr__(self):
+        return '<EventInstance {} (slot {}) at line {}, {}>'.format(
+            self.event_id, self.slot, self.position, ('running', 'waiting', 'sleeping', 'done')[self.state])
+
+
+""" FLAGS AND REGISTERS """
+
+
+def _flag(instance, flag_type, flag_id):
+    # Flag ID checked by an instruction. Event ID 0 is this event, and Event
+    # ID flags with slots add the slot number.
+    if flag_type == 0:
+        return flag_id
+    if flag_id == 0:
+        flag_id = instance.event_id
+    return flag_id + instance.slot if flag_type == 2 else flag_id
+
+
+def _range_state(sim, range_state, first, last):
+    states = [sim.get_flag(flag) for flag in range(min(first, last), max(first, last) + 1)]
+    if range_state == 0:
+        return all(states)
+    if range_state == 1:
+        return not any(states)
+    if range_state == 2:
+        return any(states)
+    return not all(states)
+
+
+def _add_to_register(registers, register, result):
+    if register > 0:
+        registers[register] = registers.get(register, True) and result
+    else:
+        registers[register] = registers.get(register, False) or result
+
+
+""" CONDITIONS """
+
+
+def _if_condition_state(sim, instance, args):
+    return instance.registers.get(args[2], False) == bool(args[1])
+
+
+def _if_time_elapsed(sim, instance, args):
+    return sim.frame - instance.start_frame >= _frames(args[1])
+
+
+def _if_frames_elapsed(sim, instance, args):
+    return sim.frame - instance.start_frame >= args[1]
+
+
+def _if_event_flag_state(sim, instance, args):
+    return sim.get_flag(_flag(instance, args[2], args[3])) == bool(args[1])
+
+
+def _if_event_flag_range_state(sim, instance, args):
+    return _range_state(sim, args[1], _flag(instance, args[2], args[3]), _flag(instance, args[2], args[4]))
+
+
+def _if_entity_inside_or_outside_area(sim, instance, args):
+    return ((args[2], args[3]) in sim.inside) == bool(args[1])
+
+
+def _if_all_players_inside_or_outside_area(sim, instance, args):
+    return ((PLAYER, args[2]) in sim.inside) == bool(args[1])
+
+
+def _if_number_of_flags_on(sim, instance, args):
+    first, last = _flag(instance, args[1], args[2]), _flag(instance, args[1], args[3])
+    count = sum(sim.get_flag(flag) for flag in range(min(first, last), max(first, last) + 1))
+    return COMPARISONS[args[4]](count, args[5])
+
+
+def _if_entity_death_state(sim, instance, args):
+    return (args[1] in sim.dead) == bool(args[2])
+
+
+def _if_object_destruction_state(sim, instance, args):
+    return (args[2] in sim.destroyed) == bool(args[1])
+
+
+CONDITIONS = {
+    (0, 0): _if_condition_state,
+    (1, 0): _if_time_elapsed,
+    (1, 1): _if_frames_elapsed,
+    (3, 0): _if_event_flag_state,
+    (3, 1): _if_event_flag_range_state,
+    (3, 2): _if_entity_inside_or_outside_area,
+    (3, 7): _if_all_players_inside_or_outside_area,
+    (3, 10): _if_number_of_flags_on,
+    (4, 0): _if_entity_death_state,
+    (5, 0): _if_object_destruction_state,
+}
+
+
+def _never(sim, instance, args):
+    return False
+
+
+""" COMMANDS """
+
+
+def _skip_or_end(sim, instance, skip, line_count_or_end_type):
+    # Skip line_count lines, or end/restart the event, if this is a skip/terminate instruction that passed.
+    if skip:
+        return line_count_or_end_type
+    sim.end_event(instance, line_count_or_end_type)
+    return STOP
+
+
+def _condition_command(skip, finished=False):
+    def command(sim, instance, args):
+        registers = instance.finished if finished else instance.registers
+        if registers.get(args[2], False) == bool(args[1]):
+            return _skip_or_end(sim, instance, skip, args[0])
+    return command
+
+
+def _unconditional_command(skip):
+    def command(sim, instance, args):
+        return _skip_or_end(sim, instance, skip, args[0])
+    return command
+
+
+def _comparison_command(skip):
+    def command(sim, instance, args):
+        if COMPARISONS[args[1]](args[2], args[3]):
+            return _skip_or_end(sim, instance, skip, args[0])
+    return command
+
+
+def _flag_command(skip):
+    def command(sim, instance, args):
+        if sim.get_flag(_flag(instance, args[2], args[3])) == bool(args[1]):
+            return _skip_or_end(sim, instance, skip, args[0])
+    return command
+
+
+def _flag_range_command(skip):
+    def command(sim, instance, args):
+        if _range_state(sim, args[1], _flag(instance, args[2], args[3]), _flag(instance, args[2], args[4])):
+            return _skip_or_end(sim, instance, skip, args[0])
+    return command
+
+
+def _destruction_command(skip):
+    def command(sim, instance, args):
+        if (args[2] in sim.destroyed) == bool(args[1]):
+            return _skip_or_end(sim, instance, skip, args[0])
+    return command
+
+
+def _sleep(sim, instance, frames):
+    if frames <= 0:
+        return None
+    instance.position += 1
+    sim.schedule(instance, sim.frame + frames)
+    return STOP
+
+
+def _wait(sim, instance, args):
+    return _sleep(sim, instance, _frames(args[0]))
+
+
+def _wait_frames(sim, instance, args):
+    return _sleep(sim, instance, args[0])
+
+
+def _wait_random_range(sim, instance, args):
+    return _sleep(sim, instance, _frames(sim.random.uniform(args[0], args[1])))
+
+
+def _initialize_event(sim, instance, args):
+    sim.initialize(args[1], args[0], args[2:])
+
+
+def _set_event_flag(sim, instance, args):
+    sim.set_flag(args[0], not sim.get_flag(args[0]) if args[1] == 2 else bool(args[1]))
+
+
+def _set_event_state(sim, instance, args):
+    target = sim.instances.get((args[0], args[1]))
+    if target is None:
+        return None
+    if args[2] == RESTART:
+        sim.restart_event(target)
+    elif target.state != DONE:
+        sim.end_event(target, END)
+    if target is instance:
+        return STOP
+
+
+def _randomly_set_one_flag_in_range(sim, instance, args):
+    first, last = min(args[0], args[1]), max(args[0], args[1])
+    sim.set_flag(sim.random.randint(first, last), bool(args[2]))
+
+
+def _set_flags_in_range(sim, instance, args):
+    for flag in range(min(args[0], args[1]), max(args[0], args[1]) + 1):
+        sim.set_flag(flag, bool(args[2]))
+
+
+def _state_command(key):
+    def command(sim, instance, args):
+        sim.states[key + (args[0],)] = args[1]
+    return command
+
+
+COMMANDS = {
+    (1000, 1): _condition_command(True),
+    (1000, 2): _condition_command(False),
+    (1000, 3): _unconditional_command(True),
+    (1000, 4): _unconditional_command(False),
+    (1000, 5): _comparison_command(True),
+    (1000, 6): _comparison_command(False),
+    (1000, 7): _condition_command(True, finished=True),
+    (1000, 8): _condition_command(False, finished=True),
+    (1001, 0): _wait,
+    (1001, 1): _wait_frames,
+    (1001, 2): _wait_random_range,
+    (1003, 1): _flag_command(True),
+    (1003, 2): _flag_command(False),
+    (1003, 3): _flag_range_command(True),
+    (1003, 4): _flag_range_command(False),
+    (1005, 1): _destruction_command(True),
+    (1005, 2): _destruction_command(False),
+    (2000, 0): _initialize_event,
+    (2003, 2): _set_event_flag,
+    (2003, 8): _set_event_state,
+    (2003, 17): _randomly_set_one_flag_in_range,
+    (2003, 22): _set_flags_in_range,
+}
+COMMANDS.update({key: _state_command(key) for key in STATE_INSTRUCTIONS if key not in COMMANDS})
+
+
+def _nothing(sim, instance, args):
+    return None
+
+
+def _pack_words(args):
+    # Event arguments as packed by 2000[00]: one four-byte word each.
+    return b''.join(struct.pack('<f' if isinstance(arg, float) else '<i' if arg < 0 else '<I', arg) for arg in args)
+
+
+""" FLAG BITSET """
+
+
+PAGE_BITS = 16
+PAGE_MASK = (1 << PAGE_BITS) - 1
+
+
+class FlagBitset(object):
+    """ Event flags as bits, in pages of 65536 flags (8 KiB bytearrays) that are only allocated once a flag in them
+    is set. Flag IDs are spread over eight digits, but each map only uses a few ranges. """
+
+    __slots__ = ('pages',)
+
+    def __init__(self):
+        self.pages = {}
+
+    def __getitem__(self, flag):
+        page = self.pages.get(flag >> PAGE_BITS)
+        if page is None:
+            return False
+        bit = flag & PAGE_MASK
+        return page[bit >> 3] >> (bit & 7) & 1 == 1
+
+    def __setitem__(self, flag, state):
+        page = self.pages.get(flag >> PAGE_BITS)
+        if page is None:
+            if not state:
+                return
+            page = self.pages[flag >> PAGE_BITS] = bytearray(1 << PAGE_BITS >> 3)
+        bit = flag & PAGE_MASK
+        if state:
+            page[bit >> 3] |= 1 << (bit & 7)
+        else:
+            page[bit >> 3] &= ~(1 << (bit & 7)) & 0xFF
+
+    def __iter__(self):
+        """ Every flag that is on, in order. """
+        for number in sorted(self.pages):
+            page = self.pages[number]
+            for byte_index, byte in enumerate(page):
+                if byte:
+                    for bit in range(8):
+                        if byte >> bit & 1:
+                            yield (number << PAGE_BITS) + (byte_index << 3) + bit
+
+
+""" SIMULATOR """
+
+
+class EventSimulator(object):
+    """ Runs events frame by frame against a flag store and a simple world state. """
+
+    def __init__(self, events, seed=0, record=True):
+        self.events = {event.event_id: event for event in events if event.event_id is not None}
+        self.conditions = dict(CONDITIONS)
+        self.commands = dict(COMMANDS)
+        self.random = random.Random(seed)
+        self.frame = 0
+        self.flags = FlagBitset()
+        self.states = {}  # (bank, index, target) -> state of the last state command on that target
+        self.dead = set()
+        self.destroyed = set()
+        self.inside = set()  # (entity_id, area_entity_id)
+        self.instances = {}  # (event_id, slot) -> EventInstance
+        self.running = []  # instances that are running or waiting on conditions, in initialization order
+        self.sleeping = []  # heap of (wake_frame, sequence, instance)
+        self._sequence = 0
+        self.missing_events = set()  # initialized event IDs that aren't defined
+        self.instructions_executed = 0
+        self.evaluations = {}  # event_id -> instructions evaluated
+        self.frame_evaluations = array('I')  # instructions evaluated in each frame
+        self.log = [] if record else None  # (frame, event_id, slot, bank, index, args) of every command run
+
+    """ WORLD STATE """
+
+    def get_flag(self, flag):
+        return self.flags[flag]
+
+    def set_flag(self, flag, state=True):
+        self.flags[flag] = state
+
+    def kill(self, entity_id):
+        self.dead.add(entity_id)
+
+    def destroy(self, entity_id):
+        self.destroyed.add(entity_id)
+
+    def enter_area(self, area_entity_id, entity_id=PLAYER):
+        self.inside.add((entity_id, area_entity_id))
+
+    def leave_area(self, area_entity_id, entity_id=PLAYER):
+        self.inside.discard((entity_id, area_entity_id))
+
+    def state(self, bank, index, target, default=None):
+        """ State last set by a state command (see layouts.STATE_INSTRUCTIONS) on target, e.g. state(2004, 1, 1810800)
+        for set_ai. """
+        return self.states.get((bank, index, target), default)
+
+    def is_enabled(self, entity_id):
+        """ False if the last enable/disable command on a character or object disabled it. """
+        for key in ((2004, 5, entity_id), (2005, 3, entity_id)):
+            if key in self.states:
+                return bool(self.states[key])
+        return True
+
+    """ EVENTS """
+
+    def _compile(self, event, event_args):
+        program = []
+        for line, instruction in enumerate(event.instructions):
+            key = (instruction.bank, instruction.index)
+            args = instruction.args
+            if instruction.substitutions:
+                args = self._substitute(event, line, instruction, event_args)
+            handlers = self.conditions if instruction.bank < 1000 else self.commands
+            program.append((key, handlers.get(key, _never if instruction.bank < 1000 else _nothing), args))
+        return program
+
+    @staticmethod
+    def _substitute(event, line, instruction, event_args):
+        # Arguments of an instruction with its ^(X <- Y, Z) substitutions applied.
+        layout = instruction.layout
+        try:
+            data = bytearray(layout.struct.pack(*instruction.args))
+        except struct.error as e:
+            raise ValueError('Event {}, line {}: cannot pack {!r}: {}'.format(event.event_id, line, instruction, e))
+        for write_from, read_from, length in instruction.substitutions:
+            if write_from < 0 or write_from + length > layout.size:
+                raise ValueError('Event {}, line {}: substitution ^({} <- {}, {}) is outside the {} argument bytes of '
+                                 '{!r}.'.format(event.event_id, line, write_from, read_from, length, layout.size,
+                                                instruction))
+            data[write_from:write_from + length] = event_args[read_from:read_from + length].ljust(length, b'\0')
+        return layout.struct.unpack(bytes(data))
+
+    def initialize(self, event_id, slot=0, args=()):
+        """ Initialize an event (like 2000[00]), which starts running on the next tick (or later this frame).
+
+        args are the event arguments, as four-byte integers or floats. Events that are already initialized in that
+        slot are left alone, and undefined events are added to missing_events.
+        """
+        if (event_id, slot) in self.instances:
+            return self.instances[(event_id, slot)]
+        event = self.events.get(event_id)
+        if event is None:
+            self.missing_events.add(event_id)
+            return None
+        event_args = _pack_words(args)
+        instance = EventInstance(event_id, slot, event_args, self._compile(event, event_args))
+        instance.start_frame = self.frame
+        self.instances[(event_id, slot)] = instance
+        self.running.append(instance)
+        return instance
+
+    def start(self):
+        """ Initialize Event 0 and Event 50, as when the map loads. """
+        for event_id in ROOT_EVENTS:
+            if event_id in self.events:
+                self.initialize(event_id)
+
+    def end_event(self, instance, end_type=END):
+        """ End (setting the event's flag) or restart an event instance. """
+        if end_type == RESTART:
+            self.restart_event(instance)
+            return
+        instance.state = DONE
+        self.set_flag(_flag(instance, 2 if instance.slot else 1, 0))
+
+    def restart_event(self, instance):
+        """ Run an event instance again from its first line, starting next frame. """
+        instance.position = 0
+        instance.registers = {}
+        instance.finished = {}
+        instance.pending = []
+        instance.start_frame = self.frame + 1
+        self.schedule(instance, self.frame + 1)
+
+    def schedule(self, instance, wake_frame):
+        """ Put an event instance to sleep until wake_frame. """
+        instance.state = SLEEPING
+        instance.wake_frame = wake_frame
+        self._sequence += 1
+        heapq.heappush(self.sleeping, (wake_frame, self._sequence, instance))
+
+    """ EXECUTION """
+
+    def _run(self, instance):
+        # Execute an instance until it waits, sleeps or ends. Returns the number of instructions evaluated.
+        program = instance.program
+        count = len(program)
+        position = instance.position
+        evaluated = 0
+        if instance.state == WAITING:
+            # Check every pending condition again, then MAIN.
+            instance.registers = {}
+            for pending_position in instance.pending:
+                _, condition, args = program[pending_position]
+                _add_to_register(instance.registers, args[0], condition(self, instance, args))
+            evaluated = len(instance.pending) + 1
+            _, condition, args = program[position]
+            if not condition(self, instance, args):
+                return evaluated
+            instance.finished, instance.registers, instance.pending = instance.registers, {}, []
+            position += 1
+        instance.state = RUNNING
+        log = self.log
+        while position < count:
+            evaluated += 1
+            key, handler, args = program[position]
+            instance.position = position
+            if key[0] < 1000:
+                register = args[0]
+                result = handler(self, instance, args)
+                if register != MAIN:
+                    _add_to_register(instance.registers, register, result)
+                    instance.pending.append(position)
+                elif result:
+                    instance.finished, instance.registers, instance.pending = instance.registers, {}, []
+                else:
+                    instance.state = WAITING
+                    return evaluated
+                position += 1
+                continue
+            if log is not None and key[0] >= 2000:
+                log.append((self.frame, instance.event_id, instance.slot) + key + (args,))
+            result = handler(self, instance, args)
+            if result == STOP:
+                return evaluated
+            position += 1 + (result or 0)
+        instance.position = position
+        self.end_event(instance, END)
+        return evaluated
+
+    def tick(self, frames=1):
+        """ Run every event for a number of frames. """
+        evaluations = self.evaluations
+        for _ in range(frames):
+            running = self.running
+            sleeping = self.sleeping
+            while sleeping and sleeping[0][0] <= self.frame:
+                wake_frame, _, instance = heapq.heappop(sleeping)
+                if instance.state == SLEEPING and instance.wake_frame == wake_frame:  # else restarted or ended since
+                    instance.state = RUNNING
+                    running.append(instance)
+            frame_total = 0
+            i = 0
+            while i < len(running):  # events initialized this frame also run this frame
+                instance = running[i]
+                i += 1
+                if instance.state == RUNNING or instance.state == WAITING:
+                    evaluated = self._run(instance)
+                    frame_total += evaluated
+                    evaluations[instance.event_id] = evaluations.get(instance.event_id, 0) + evaluated
+            self.running = [instance for instance in dict.fromkeys(running)
+                            if instance.state == RUNNING or instance.state == WAITING]
+            self.instructions_executed += frame_total
+            self.frame_evaluations.append(frame_total)
+            self.frame += 1
+
+    def tick_until(self, predicate, max_frames=FPS * 60):
+        """ Tick until predicate(sim) is true. Returns the number of frames run, or None if max_frames ran out. """
+        for frames in range(max_frames + 1):
+            if predicate(self):
+                return frames
+            self.tick()
+        return None
+
+    def report(self, top=20):
+        """ Plain text summary of the instructions evaluated per frame, and the events that evaluated the most. """
+        frames = len(self.frame_evaluations)
+        if not frames:
+            return 'No frames run.'
+        lines = ['{} frames, {} instructions evaluated ({:.1f} per frame, at most {} in one frame).'.format(
+            frames, self.instructions_executed, self.instructions_executed / frames, max(self.frame_evaluations))]
+        waiting = {}
+        for instance in self.running:
+            if instance.state == WAITING:
+                waiting[instance.event_id] = waiting.get(instance.event_id, 0) + 1
+        busiest = sorted(self.evaluations.items(), key=lambda item: (-item[1], item[0]))[:top]
+        lines.append('Events that evaluated the most instructions:')
+        lines.extend('    {:>10} {:>10} ({:.2f} per frame){}'.format(
+            event_id, count, count / frames, ', waiting on conditions' if event_id in waiting else '')
+            for event_id, count in busiest)
+        if self.missing_events:
+            lines.append('Initialized events not defined in this map: {}'.format(
+                ', '.join(str(event_id) for event_id in sorted(self.missing_events))))
+        return '\n'.join(lines)
+
+
+""" MAP PROFILING """
+
+
+def profile_map(events, frames=FPS * 60, seed=0):
+    """ Simulator that has run every event initialized from Event 0 and Event 50 of a map for a number of frames. """
+    sim = EventSimulator(events, seed=seed, record=False)
+    sim.start()
+    sim.tick(frames)
+    return sim
+
+
+def profile_directory(directory, frames=FPS * 60, suffix='.unpack.txt'):
+    """ profile_map() for every unpacked (*.unpack.txt, through the map cache) or packed (*.emevd) file in directory,
+    as {map_name: EventSimulator}. """
+    simulators = {}
+    for filename in sorted(os.listdir(directory)):
+        if not filename.endswith(suffix):
+            continue
+        path = join(directory, filename)
+        if filename.endswith('.emevd'):
+            with read_emevd(path) as reader:
+                events = reader.events()
+        else:
+            events = load_unpacked(path).event_list()
+        simulators[filename.split('.')[0]] = profile_map(events, frames)
+    return simulators
@@ -0,0 +1,49 @@
+"""
+@author: grimrhapsody
+"""
+
+import re
+
+
+TAG = re.compile(r'(<[^<>\n]*>)')
+
+
+class Template(object):
+    """ Template text split once on its <...> markers.
+
+    tokens alternates between literal text (even positions) and tags (odd
+    positions), so substituting every tag is a single pass over the tokens and
+    one final join, no matter how many tags the template has.
+
+    Every tag is expected to sit on its own line. A substituted tag keeps the
+    indentation of its line, and a tag with no substitution is removed along
+    with its line.
+    """
+
+    def __init__(self, text):
+        self.tokens = TAG.split(text)
+
+    @property
+    def tags(self):
+        return self.tokens[1::2]
+
+    def render(self, substitutions):
+        """ Substitute tags from the substitutions dict. Returns (text, unused_tags). """
+        parts = []
+        unused_tags = []
+        drop_newline = False
+        for i, token in enumerate(self.tokens):
+            if i % 2 == 0:
+                if drop_newline and token.startswith('\n'):
+                    token = token[1:]
+                drop_newline = False
+                parts.append(token)
+            else:
+                try:
+                    parts.append(substitutions[token])
+                except KeyError:
+                    unused_tags.append(token)
+                    if parts:
+                        parts[-1] = parts[-1].rstrip(' \t')
+                    drop_newline = True
+        return ''.join(parts), unused_tags
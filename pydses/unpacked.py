@@ -0,0 +1,205 @@
+"""
+@author: grimrhapsody
+"""
+
+import re
+from .events import Event, Instruction, format_header
+from .layouts import get_layout
+
+
+""" UNPACKED EMEVD SCRIPTS """
+
+
+HEADER_LINE = re.compile(r'(-?\d+), (\d+)$')
+INSTRUCTION_LINE = re.compile(r'(\d+)\[(\d+)\] \(([a-zA-Z]*)\)\[(.*)\]$')
+SUBSTITUTION_LINE = re.compile(r'\^\((\d+) <- (\d+), (\d+)\)$')
+TAG_LINE = re.compile(r'(<[^<>]*>)$')
+
+
+class UnpackedScript(object):
+    """ Events of an unpacked EMEVD file (HPR's *.unpack.txt), indexed by event ID.
+
+    items holds the events and any top-level template tags (e.g. '<11810001>')
+    in file order. Tags inside an event (e.g. '<INIT0>' in Event 0) are kept in
+    event_tags as [instruction_position, tag] pairs, so the instruction lists
+    themselves only ever contain real instructions.
+
+    Looking up, replacing or appending an event is O(1); rendering is O(n).
+    """
+
+    def __init__(self):
+        self.items = []
+        self.events = {}
+        self.event_tags = {}
+        self._item_positions = {}
+        self._tags = set()
+
+    def append(self, item):
+        """ Add an Event or a top-level tag to the end of the script. """
+        if isinstance(item, Event):
+            if item.event_id in self.events:
+                raise ValueError('Event {} is defined more than once.'.format(item.event_id))
+            self.events[item.event_id] = item
+            self._item_positions[item.event_id] = len(self.items)
+        else:
+            self._tags.add(item)
+        self.items.append(item)
+
+    def add_event_tag(self, event_id, tag, position=None):
+        """ Add a tag inside an event, before instruction `position` (default: at the end). """
+        if position is None:
+            position = len(self.events[event_id].instructions)
+        self.event_tags.setdefault(event_id, []).append([position, tag])
+        self._tags.add(tag)
+
+    def insert_tag_after(self, existing_tag, new_tag):
+        """ Insert new_tag on the line after existing_tag (which must be inside an event). """
+        for event_id, tags in self.event_tags.items():
+            for i, (position, tag) in enumerate(tags):
+                if tag == existing_tag:
+                    tags.insert(i + 1, [position, new_tag])
+                    self._tags.add(new_tag)
+                    return
+        raise KeyError('Tag {} is not inside any event.'.format(existing_tag))
+
+    def replace_event(self, event_id, item):
+        """ Replace event_id (in place) with another Event or a top-level tag. """
+        position = self._item_positions.pop(event_id)
+        del self.events[event_id]
+        for _, tag in self.event_tags.pop(event_id, ()):
+            self._tags.discard(tag)
+        if isinstance(item, Event):
+            self.events[item.event_id] = item
+            self._item_positions[item.event_id] = position
+        else:
+            self._tags.add(item)
+        self.items[position] = item
+
+    def has_tag(self, tag):
+        return tag in self._tags
+
+    @property
+    def tags(self):
+        return frozenset(self._tags)
+
+    def event_list(self):
+        """ Events only (in file order), e.g. for packing. Fails if any template tags remain. """
+        if self._tags:
+            raise ValueError('Script still contains template tags: {}'.format(', '.join(sorted(self._tags))))
+        return [item for item in self.items if isinstance(item, Event)]
+
+    def _event_lines(self, event):
+        tags = self.event_tags.get(event.event_id)
+        if not tags:
+            yield from event.lines()
+            return
+        tags = sorted(tags, key=lambda position_tag: position_tag[0])  # stable, so insertion order is kept
+        t = 0
+        if event.event_id is not None:
+            yield format_header(event.event_id, event.restart_type)
+        for position, instruction in enumerate(event.instructions):
+            while t < len(tags) and tags[t][0] <= position:
+                yield ' ' + tags[t][1]
+                t += 1
+            yield from instruction.lines()
+        for _, tag in tags[t:]:
+            yield ' ' + tag
+
+    def lines(self):
+        for i, item in enumerate(self.items):
+            if i:
+                yield ''
+            if isinstance(item, Event):
+                yield from self._event_lines(item)
+            else:
+                yield item
+
+    def render(self):
+        return '\n'.join(self.lines()) + '\n'
+
+
+""" PARSING """
+
+
+def _parse_args(arg_format, arg_string, line_number):
+    arg_string = arg_string.strip()
+    values = arg_string.split(',') if arg_string else []
+    if len(values) != len(arg_format):
+        raise ValueError('Line {}: format ({}) does not match arguments [{}].'.format(
+            line_number, arg_format, arg_string))
+    try:
+        return [float(value) if field == 'f' else int(value) for field, value in zip(arg_format, values)]
+    except ValueError:
+        raise ValueError('Line {}: invalid arguments [{}] for format ({}).'.format(
+            line_number, arg_string, arg_format))
+
+
+def iter_unpacked(lines):
+    """ Parse unpacked EMEVD lines one at a time.
+
+    Yields ('event', Event) once each event is complete, ('tag', tag) for
+    top-level tags and ('event_tag', (event_id, position, tag)) for tags inside
+    events. Only the current event is held in memory.
+    """
+    event = None
+    for line_number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line:
+            if event is not None:
+                yield 'event', event
+                event = None
+            continue
+        match = INSTRUCTION_LINE.match(line)
+        if match:
+            if event is None:
+                raise ValueError('Line {}: instruction outside of an event.'.format(line_number))
+            bank, index, arg_format, arg_string = match.groups()
+            event.instructions.append(Instruction(int(bank), int(index), get_layout(arg_format),
+                                                  _parse_args(arg_format, arg_string, line_number)))
+            continue
+        match = SUBSTITUTION_LINE.match(line)
+        if match:
+            if event is None or not event.instructions:
+                raise ValueError('Line {}: parameter substitution must follow an instruction.'.format(line_number))
+            event.instructions[-1].add_substitution(*(int(value) for value in match.groups()))
+            continue
+        match = HEADER_LINE.match(line)
+        if match:
+            if event is not None:
+                yield 'event', event
+            event = Event(int(match.group(1)), int(match.group(2)))
+            continue
+        match = TAG_LINE.match(line)
+        if match:
+            if event is None:
+                yield 'tag', match.group(1)
+            else:
+                yield 'event_tag', (event.event_id, len(event.instructions), match.group(1))
+            continue
+        raise ValueError('Line {}: unrecognized line in unpacked EMEVD: {!r}'.format(line_number, line))
+    if event is not None:
+        yield 'event', event
+
+
+def parse_unpacked_lines(lines):
+    """ Parse an iterable of lines (e.g. an open file) into an UnpackedScript. """
+    script = UnpackedScript()
+    pending_tags = []
+    for kind, value in iter_unpacked(lines):
+        if kind == 'event':
+            script.append(value)
+            for event_id, position, tag in pending_tags:
+                script.add_event_tag(event_id, tag, position)
+            pending_tags = []
+        elif kind == 'tag':
+            script.append(value)
+        else:
+            # Event tags are only added once their event has been appended.
+            pending_tags.append(value)
+    return script
+
+
+def parse_unpacked(unpacked_filename):
+    """ Parse an unpacked EMEVD file (*.unpack.txt) line by line into an UnpackedScript. """
+    with open(unpacked_filename) as file:
+        return parse_unpacked_lines(file)
@@ -0,0 +1,85 @@
+"""
+@author: grimrhapsody
+"""
+
+from .layouts import field_range
+from .verbose import argument_names
+
+try:
+    import numpy as np
+except ImportError:
+    np = None  # NumPy is optional; the same checks run as plain loops without it.
+
+
+""" ARGUMENT VALIDATION """
+
+
+FLOAT_MAX = 3.4028234663852886e+38  # largest finite 32-bit float
+
+
+def _wrong_type(field, values):
+    # Rows whose value can't be packed as this field type at all.
+    if field == 'f':
+        return [row for row, value in enumerate(values) if not isinstance(value, (int, float))]
+    if set(map(type, values)) <= {int, bool}:
+        return []
+    return [row for row, value in enumerate(values) if not isinstance(value, int)]
+
+
+def _out_of_range(field, values, rows):
+    # Rows (of the given rows, whose types are valid) with values outside the range of this field type.
+    if field == 'f':
+        minimum, maximum = -FLOAT_MAX, FLOAT_MAX
+    else:
+        minimum, maximum = field_range(field)
+    if np is not None and rows:
+        try:
+            column = np.array([values[row] for row in rows], dtype=np.float64 if field == 'f' else np.int64)
+        except OverflowError:
+            pass  # integers beyond 64 bits; checked below
+        else:
+            # Written like the loop below, so NaN is out of range either way.
+            return np.asarray(rows)[~((column >= minimum) & (column <= maximum))].tolist()
+    return [row for row in rows if not minimum <= values[row] <= maximum]
+
+
+def find_violations(events):
+    """ Every argument that doesn't fit its field type, as (event_id, line, message) tuples in event order.
+
+    Instructions are grouped by argument format, and each field of a group is
+    checked as one column (with NumPy, if it is installed).
+    """
+    groups = {}  # arg_format -> (locations, argument tuples)
+    for event_number, event in enumerate(events):
+        for line, instruction in enumerate(event.instructions):
+            locations, arg_rows = groups.setdefault(instruction.layout.arg_format, ([], []))
+            locations.append((event_number, event.event_id, line, instruction))
+            arg_rows.append(instruction.args)
+    violations = []
+    for arg_format, (locations, arg_rows) in groups.items():
+        for i, (field, values) in enumerate(zip(arg_format, zip(*arg_rows))):
+            wrong_type = _wrong_type(field, values)
+            skipped = set(wrong_type)
+            out_of_range = _out_of_range(field, values, [row for row in range(len(values)) if row not in skipped])
+            type_problem = 'is not a number' if field == 'f' else 'is not an integer'
+            range_problem = 'is out of range for a {!r} field ({})'.format(
+                field, '32-bit float' if field == 'f' else '{} to {}'.format(*field_range(field)))
+            for row, problem in [(row, type_problem) for row in wrong_type] + [(row, range_problem)
+                                                                                for row in out_of_range]:
+                event_number, event_id, line, instruction = locations[row]
+                names = argument_names(instruction.bank, instruction.index, len(instruction.args))
+                name = names[i] if names and i < len(names) else 'argument {}'.format(i)
+                message = 'Event {}, line {} ({}[{:02d}]): {} = {!r} {}.'.format(
+                    event_id, line, instruction.bank, instruction.index, name, values[row], problem)
+                violations.append(((event_number, line, i), event_id, line, message))
+    violations.sort(key=lambda violation: violation[0])
+    return [violation[1:] for violation in violations]
+
+
+def check_events(events, source=None):
+    """ Raise a ValueError listing every invalid argument in events (see find_violations). """
+    violations = find_violations(events)
+    if violations:
+        raise ValueError('{} invalid argument{}{}:\n    {}'.format(
+            len(violations), '' if len(violations) == 1 else 's', ' in {}'.format(source) if source else '',
+            '\n    '.join(message for _, _, message in violations)))
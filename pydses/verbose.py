@@ -0,0 +1,586 @@
+"""
+@author: grimrhapsody
+"""
+
+from .event_enums import (ai_status_type, button_number, button_type, character_type, class_type,
+                          damage_target_type, sound_type, statue_type, team_type, text_banner_type)
+
+
+""" INSTRUCTION METADATA """
+
+
+# Verbose text and argument names of every instruction in layouts.INSTRUCTION_FORMATS. The names are in argument order
+# and are also the text fields. Names ending in 'entity_id' are entities and names ending in 'flag_id' are event flags
+# (or events, depending on a flag_type argument); event_id is always an event.
+# A name starting with '*' collects any remaining (variadic) arguments.
+INSTRUCTION_INFO = {
+    # 2000: SYSTEM
+    (2000, 0): ('Initialize Event (Event ID: {event_id}, Slot Number: {slot}, Arguments: {event_args})',
+                ('slot', 'event_id', '*event_args')),
+    (2000, 2): ('{enabled} network sync.', ('enabled',)),
+    (2000, 4): ('Issue prefetch request (Request ID: {request_id})', ('request_id',)),
+    (2000, 5): ('Save Request', ('unused',)),
+    # 2002: CUTSCENES
+    (2002, 2): ('Play Cutscene (Cutscene ID: {cutscene_id}, Playback Method: {cutscene_type}) and Warp Player to '
+                '(Warp Point ID: {point_entity_id}, Map<{area_id}><{block_id}>)',
+                ('cutscene_id', 'cutscene_type', 'point_entity_id', 'area_id', 'block_id')),
+    (2002, 3): ('Play Cutscene (Cutscene ID: {cutscene_id}, Playback Method: {cutscene_type}) to Player Entity ID: '
+                '{player_entity_id}',
+                ('cutscene_id', 'cutscene_type', 'player_entity_id')),
+    (2002, 4): ('Play Cutscene (Cutscene ID: {cutscene_id}, Playback Method: {cutscene_type}) and Warp Player Entity '
+                'ID: {player_entity_id} to (Warp Point ID: {point_entity_id}, Map<{area_id}><{block_id}>)',
+                ('cutscene_id', 'cutscene_type', 'point_entity_id', 'area_id', 'block_id', 'player_entity_id')),
+    (2002, 5): ('Play Cutscene (Cutscene ID: {cutscene_id}, Playback Method: {cutscene_type}) and Rotate Player Entity '
+                'ID: {player_entity_id} (X-Axis: {axis_x}, Z-Axis: {axis_z}, Rotation: {rotation}, Y-Translation: '
+                '{translation_y})',
+                ('cutscene_id', 'cutscene_type', 'axis_x', 'axis_z', 'rotation', 'translation_y', 'player_entity_id')),
+    # 2003: EVENT
+    (2003, 1): ('"Reproduction of object animation" (Object Entity ID: {entity_id}, Animation ID: {animation_id}, '
+                'Loop: {loop}, Wait for completion: {wait})',
+                ('entity_id', 'animation_id', 'loop', 'wait')),
+    (2003, 2): ('SET Event Flag ID {flag_id} to {state}', ('flag_id', 'state')),
+    (2003, 3): ('{enabled} Spawner with Entity ID: {entity_id}', ('entity_id', 'enabled')),
+    (2003, 4): ('Award Items (Item Lot ID: {item_lot_id})', ('item_lot_id',)),
+    (2003, 5): ('Shoot Projectile (Owner Entity ID: {owner_entity_id}, Projectile Entity ID: {projectile_entity_id}, '
+                'Damipoly ID: {damipoly_id}, Behavior ID: {behavior_id}, Launch Angle XYZ: ({angle_x}, {angle_y}, '
+                '{angle_z}))',
+                ('owner_entity_id', 'projectile_entity_id', 'damipoly_id', 'behavior_id', 'angle_x', 'angle_y',
+                 'angle_z')),
+    (2003, 8): ('{event_state} Slot Number {slot} of Event ID {event_id}', ('event_id', 'slot', 'event_state')),
+    (2003, 11): ('{enabled} Boss Health Bar of Entity ID: {entity_id} (Slot Number: {slot}, Name ID: {name_id})',
+                 ('enabled', 'entity_id', 'slot', 'name_id')),
+    (2003, 12): ('Kill Boss (Entity ID: {entity_id})', ('entity_id',)),
+    (2003, 13): ('{bit_operation} Bit# {navmesh_type} for Navimesh Entity ID: {navmesh_entity_id}',
+                 ('navmesh_entity_id', 'navmesh_type', 'bit_operation')),
+    (2003, 14): ('Warp Player to Map<{area_id}><{block_id}> (Warp Point Entity ID: {point_entity_id})',
+                 ('area_id', 'block_id', 'point_entity_id')),
+    (2003, 16): ('Trigger Multiplayer Event ID: {multiplayer_event_id}', ('multiplayer_event_id',)),
+    (2003, 17): ('Randomly SET one Event Flag ID from {first_flag_id} to {last_flag_id} to {state}',
+                 ('first_flag_id', 'last_flag_id', 'state')),
+    (2003, 18): ('Force Entity ID: {entity_id} to play Animation ID: {animation_id} (Loop: {loop}, Wait for '
+                 'completion: {wait}, Do not wait for transition: {skip_transition})',
+                 ('entity_id', 'animation_id', 'loop', 'wait', 'skip_transition')),
+    (2003, 19): ('Set Area Texture (Area ID: {area_id}, Texture Parambank Slot Index: {slot})', ('area_id', 'slot')),
+    (2003, 21): ('Increment New Game Cycle counter', ('unused',)),
+    (2003, 22): ('Batch SET Event Flag IDs from {first_flag_id} to {last_flag_id} to {state}',
+                 ('first_flag_id', 'last_flag_id', 'state')),
+    (2003, 23): ('Set Player Respawn Point (Respawn Point ID: {respawn_point_id})', ('respawn_point_id',)),
+    (2003, 24): ('Remove Items from Player (Item Type: {item_type}, Item ID: {item_id}, Quantity: {quantity})',
+                 ('item_type', 'item_id', 'quantity')),
+    (2003, 25): ('Place NPC Summon Sign (Sign Type: {sign_type}, Entity ID: {entity_id}, Summon Point Entity ID: '
+                 '{point_entity_id}, Summon Event Flag ID: {summon_flag_id}, Dismissal Event Flag ID: '
+                 '{dismissal_flag_id})',
+                 ('sign_type', 'entity_id', 'point_entity_id', 'summon_flag_id', 'dismissal_flag_id')),
+    (2003, 26): ('Set visibility of Tip Message (Entity ID: {entity_id}) to {state}', ('entity_id', 'state')),
+    (2003, 28): ('Award Achievement (Achievement ID: {achievement_id})', ('achievement_id',)),
+    (2003, 30): ('{enabled} vagrant spawning', ('enabled',)),
+    (2003, 31): ('Increment Event Value (Event Flag ID: {flag_id}, Number of Bits: {bit_count}, Max Value: '
+                 '{max_value})',
+                 ('flag_id', 'bit_count', 'max_value')),
+    (2003, 32): ('Clear Event Value (Event Flag ID: {flag_id}, Number of Bits: {bit_count})', ('flag_id', 'bit_count')),
+    (2003, 33): ('Set Snuggly next trade (Event Flag ID: {flag_id})', ('flag_id',)),
+    (2003, 34): ('Snuggly item drop (Item Lot ID: {item_lot_id}, Area Entity ID: {area_entity_id}, Event Flag ID: '
+                 '{flag_id}, Hitbox Entity ID: {hitbox_entity_id})',
+                 ('item_lot_id', 'area_entity_id', 'flag_id', 'hitbox_entity_id')),
+    (2003, 35): ('Move dropped items and bloodstains from Area Entity ID: {source_area_entity_id} to Area Entity ID: '
+                 '{destination_area_entity_id}',
+                 ('source_area_entity_id', 'destination_area_entity_id')),
+    (2003, 36): ('Award Items (Item Lot ID: {item_lot_id}) (Except to Clients)', ('item_lot_id',)),
+    (2003, 41): ('Activate player killplane (Map<{area_id}><{block_id}>, Y Threshold: {threshold_y}, Target Model ID: '
+                 '{model_id})',
+                 ('area_id', 'block_id', 'threshold_y', 'model_id')),
+    # 2004: CHARACTER
+    (2004, 1): ('{enabled} AI of Entity ID: {entity_id}', ('entity_id', 'enabled')),
+    (2004, 2): ('Switch Entity ID: {entity_id} to team {team_type}', ('entity_id', 'team_type')),
+    (2004, 3): ('Issue Warp request for Entity ID: {entity_id} (Warp Destination Type: {category}, Destination Target '
+                'ID: {destination_entity_id}, Damipoly ID: {damipoly_id})',
+                ('entity_id', 'category', 'destination_entity_id', 'damipoly_id')),
+    (2004, 4): ('Request forced death of Entity ID: {entity_id} (Yields souls: {yields_souls})',
+                ('entity_id', 'yields_souls')),
+    (2004, 5): ('{enabled} Entity ID: {entity_id}', ('entity_id', 'enabled')),
+    (2004, 6): ('Issue EzState instruction request to Entity ID: {entity_id} (Command ID: {command_id}, Slot Number: '
+                '{slot})',
+                ('entity_id', 'command_id', 'slot')),
+    (2004, 7): ('Create spawner for Entity ID: {entity_id}', ('entity_id',)),
+    (2004, 8): ('Set Special Effect (Entity ID: {entity_id}, Special Effect ID: {special_effect_id})',
+                ('entity_id', 'special_effect_id')),
+    (2004, 9): ('Special Standby Setting (Entity ID: {entity_id}, Standby Animation: {standby_animation}, Damage '
+                'Animation: {damage_animation}, Cancel Animation: {cancel_animation}, Death Animation: '
+                '{death_animation}, Standby Return Animation: {standby_return_animation})',
+                ('entity_id', 'standby_animation', 'damage_animation', 'cancel_animation', 'death_animation',
+                 'standby_return_animation')),
+    (2004, 10): ('{enabled} Gravity of Entity ID: {entity_id}', ('entity_id', 'enabled')),
+    (2004, 12): ('{enabled} Immortality for Entity ID: {entity_id}', ('entity_id', 'enabled')),
+    (2004, 13): ('Set "Nest" of Entity ID: {entity_id} to Area Entity ID: {area_entity_id}',
+                 ('entity_id', 'area_entity_id')),
+    (2004, 14): ('Rotate Entity ID: {entity_id} to face Entity ID: {target_entity_id}',
+                 ('entity_id', 'target_entity_id')),
+    (2004, 15): ('{enabled} Invincibility for Entity ID: {entity_id}', ('entity_id', 'enabled')),
+    (2004, 16): ('Clear AI Target List of Entity ID: {entity_id}', ('entity_id',)),
+    (2004, 17): ('Issue AI instruction request to Entity ID: {entity_id} (Command ID: {command_id}, Slot Number: '
+                 '{slot})',
+                 ('entity_id', 'command_id', 'slot')),
+    (2004, 18): ('Set Event Point of Entity ID: {entity_id} to Area Entity ID: {area_entity_id} (Reaction Range: '
+                 '{reaction_range})',
+                 ('entity_id', 'area_entity_id', 'reaction_range')),
+    (2004, 19): ('Set AI ID of Entity ID: {entity_id} to {ai_id}', ('entity_id', 'ai_id')),
+    (2004, 20): ('Issue AI Re-plan request to Entity ID: {entity_id}', ('entity_id',)),
+    (2004, 21): ('Cancel Special Effect (Entity ID: {entity_id}, Special Effect ID: {special_effect_id})',
+                 ('entity_id', 'special_effect_id')),
+    (2004, 22): ('Create multipart-NPC part (Entity ID: {entity_id}, Part NPC Type: {part_npc_type}, Part Index: '
+                 '{part_index}, Part HP: {part_health}, Damage Correction: {damage_correction}, Body Damage '
+                 'Correction: {body_damage_correction}, Invincible: {invincible}, Starts in stopped state: '
+                 '{start_stopped})',
+                 ('entity_id', 'part_npc_type', 'part_index', 'part_health', 'damage_correction',
+                  'body_damage_correction', 'invincible', 'start_stopped')),
+    (2004, 23): ('Set HP of multipart-NPC part (Entity ID: {entity_id}, Part NPC Type: {part_npc_type}) to {hp} '
+                 '(Overwrite max HP if required: {overwrite_max})',
+                 ('entity_id', 'part_npc_type', 'hp', 'overwrite_max')),
+    (2004, 24): ('Set multipart-NPC (Entity ID: {entity_id}, Part NPC Type: {part_npc_type}) defense material SE and '
+                 'SFX (SE ID: {material_se_id}, SFX ID: {material_sfx_id})',
+                 ('entity_id', 'part_npc_type', 'material_se_id', 'material_sfx_id')),
+    (2004, 25): ('Set multipart-NPC (Entity ID: {entity_id}, Part NPC Type: {part_npc_type}) bullet damage '
+                 'magnification to {scaling}',
+                 ('entity_id', 'part_npc_type', 'scaling')),
+    (2004, 26): ('Set display mask of character (Entity ID: {entity_id}, Number of Bits: {bit_number}) to {state}',
+                 ('entity_id', 'bit_number', 'state')),
+    (2004, 27): ('Set hitbox mask of character (Entity ID: {entity_id}, Number of Bits: {bit_number}) to {state}',
+                 ('entity_id', 'bit_number', 'state')),
+    (2004, 28): ('Set Network Update Authority of Entity ID: {entity_id} to {authority}', ('entity_id', 'authority')),
+    (2004, 29): ('??? "Setting to remove from back lead" (Entity ID: {entity_id}, Should be removed: {remove})',
+                 ('entity_id', 'remove')),
+    (2004, 30): ('{enabled} Health Bar for Entity ID: {entity_id}', ('entity_id', 'enabled')),
+    (2004, 31): ('Set collision of Entity ID: {entity_id} (No collision: {no_collision})',
+                 ('entity_id', 'no_collision')),
+    (2004, 32): ('Issue AI event request to Entity ID: {entity_id} (Command ID: {command_id}, Slot Number: {slot}, '
+                 'First Event Flag ID: {first_flag_id}, Last Event Flag ID: {last_flag_id})',
+                 ('entity_id', 'command_id', 'slot', 'first_flag_id', 'last_flag_id')),
+    (2004, 33): ('Refer damage of Entity ID: {entity_id} to Entity ID: {target_entity_id}',
+                 ('entity_id', 'target_entity_id')),
+    (2004, 34): ('Set Network Update Rate of Entity ID: {entity_id} (Fixed: {fixed}, Frequency: {update_rate})',
+                 ('entity_id', 'fixed', 'update_rate')),
+    (2004, 35): ('??? "Setting to remove from back lead" (alternate) (Entity ID: {entity_id}, Should be removed: '
+                 '{remove})',
+                 ('entity_id', 'remove')),
+    (2004, 36): ('Hellkite breath control (Entity ID: {entity_id}, Object Entity ID: {object_entity_id}, Animation '
+                 'ID: {animation_id})',
+                 ('entity_id', 'object_entity_id', 'animation_id')),
+    (2004, 37): ('Mandatory treasure at Entity ID: {entity_id}', ('entity_id',)),
+    (2004, 38): ('Betray current covenant', ('unused',)),
+    (2004, 39): ('{enabled} animation of Entity ID: {entity_id}', ('entity_id', 'enabled')),
+    (2004, 40): ('Issue Warp request for Entity ID: {entity_id} (Warp Destination Type: {category}, Destination Target '
+                 'ID: {destination_entity_id}, Damipoly ID: {damipoly_id}) and set floor to Hitbox Entity ID: '
+                 '{floor_entity_id}',
+                 ('entity_id', 'category', 'destination_entity_id', 'damipoly_id', 'floor_entity_id')),
+    (2004, 41): ('Issue short-range Warp request for Entity ID: {entity_id} (Warp Destination Type: {category}, '
+                 'Destination Target ID: {destination_entity_id}, Damipoly ID: {damipoly_id})',
+                 ('entity_id', 'category', 'destination_entity_id', 'damipoly_id')),
+    (2004, 42): ('Issue Warp request for Entity ID: {entity_id} (Warp Destination Type: {category}, Destination Target '
+                 'ID: {destination_entity_id}, Damipoly ID: {damipoly_id}) and copy "floor setting" from Entity ID: '
+                 '{copy_floor_entity_id}',
+                 ('entity_id', 'category', 'destination_entity_id', 'damipoly_id', 'copy_floor_entity_id')),
+    (2004, 43): ('Reset animation of Entity ID: {entity_id} (Disable interpolation: {no_interpolation})',
+                 ('entity_id', 'no_interpolation')),
+    (2004, 44): ('Switch character (Entity ID: {entity_id}) to team {team_type} and exit forced standby animation',
+                 ('entity_id', 'team_type')),
+    (2004, 45): ('Humanity Registration for Entity ID: {entity_id} ("First Event Flag ID to retain humanity ID": '
+                 '{flag_id})',
+                 ('entity_id', 'flag_id')),
+    (2004, 46): ('Increment player PvP sin', ('unused',)),
+    (2004, 47): ('Equal recovery', ()),
+    # 2005: OBJECT
+    (2005, 1): ('Request destruction of object (Entity ID: {entity_id}, Slot Number: {slot})', ('entity_id', 'slot')),
+    (2005, 2): ('Restore object (Entity ID: {entity_id})', ('entity_id',)),
+    (2005, 3): ('{enabled} Object with Entity ID: {entity_id}', ('entity_id', 'enabled')),
+    (2005, 4): ('{enabled} Treasure of Entity ID: {entity_id}', ('entity_id', 'enabled')),
+    (2005, 5): ('ObjAct Activation (Entity ID: {entity_id}, Object Parameter ID: {obj_act_param_id}, Relative IDX: '
+                '{relative_index})',
+                ('entity_id', 'obj_act_param_id', 'relative_index')),
+    (2005, 6): ('ObjAct Activation (Entity ID: {entity_id}, Object Parameter ID: {obj_act_param_id}, State: '
+                '{enabled})',
+                ('entity_id', 'obj_act_param_id', 'enabled')),
+    (2005, 7): ('Skip to end of animation (Object Entity ID: {entity_id}, Animation ID: {animation_id})',
+                ('entity_id', 'animation_id')),
+    (2005, 8): ('Skip to end of object destruction (Entity ID: {entity_id}, Slot Number: {slot})',
+                ('entity_id', 'slot')),
+    (2005, 9): ('Create Damage-Dealing Object (Event Flag ID: {flag_id}, Entity ID: {entity_id}, Damipoly ID: '
+                '{damipoly_id}, Behavior ID: {behavior_id}, Target Type: {damage_target_type}, Radius: {radius}, Life: '
+                '{life}, Repetition Time: {repetition_time})',
+                ('flag_id', 'entity_id', 'damipoly_id', 'behavior_id', 'damage_target_type', 'radius', 'life',
+                 'repetition_time')),
+    (2005, 10): ('Register statue object (Entity ID: {entity_id}, Map<{area_id}><{block_id}>, Statue Type: '
+                 '{statue_type})',
+                 ('entity_id', 'area_id', 'block_id', 'statue_type')),
+    (2005, 11): ('Warp object (Entity ID: {entity_id}) to character (Entity ID: {character_entity_id}, Damipoly ID: '
+                 '{damipoly_id})',
+                 ('entity_id', 'character_entity_id', 'damipoly_id')),
+    (2005, 12): ('Remove Object Event Flag ID: {flag_id}', ('flag_id',)),
+    (2005, 13): ('{enabled} invulnerability of object (Entity ID: {entity_id})', ('entity_id', 'enabled')),
+    (2005, 14): ('ObjAct Activation (IDX Designation) (Entity ID: {entity_id}, Object Parameter ID: '
+                 '{obj_act_param_id}, Relative IDX: {relative_index}, State: {enabled})',
+                 ('entity_id', 'obj_act_param_id', 'relative_index', 'enabled')),
+    (2005, 15): ('Enable treasure collection (Entity ID: {entity_id})', ('entity_id',)),
+    # 2006: SFX
+    (2006, 1): ('Delete Map SFX (Entity ID: {entity_id}, Deletes only root: {root_only})', ('entity_id', 'root_only')),
+    (2006, 2): ('Create Map SFX (Entity ID: {entity_id})', ('entity_id',)),
+    (2006, 3): ('Create One-Off SFX (SFX Type: {category}, Entity ID: {entity_id}, Damipoly ID: {damipoly_id}, SFX '
+                'ID: {sfx_id})',
+                ('category', 'entity_id', 'damipoly_id', 'sfx_id')),
+    (2006, 4): ('Create Object SFX (Entity ID: {entity_id}, Damipoly ID: {damipoly_id}, SFX ID: {sfx_id})',
+                ('entity_id', 'damipoly_id', 'sfx_id')),
+    (2006, 5): ('Delete Object SFX (Entity ID: {entity_id}, Delete root: {root_only})', ('entity_id', 'root_only')),
+    # 2007: MESSAGE
+    (2007, 1): ('Display Generic Dialog (Message ID: {message_id}, Button Type: {button_type}, Number of Buttons: '
+                '{button_number}, Entity ID: {entity_id}, Display Distance: {display_distance})',
+                ('message_id', 'button_type', 'button_number', 'entity_id', 'display_distance')),
+    (2007, 2): ('Display Text Banner ({text_banner_type})', ('text_banner_type',)),
+    (2007, 3): ('Display Status Explanation Message (Message ID: {message_id}, Pad Enabled: {pad_enabled})',
+                ('message_id', 'pad_enabled')),
+    (2007, 4): ('Display Battlefield Message (Message ID: {message_id}, Display Location Index: {display_location})',
+                ('message_id', 'display_location')),
+    # 2008: CAMERA
+    (2008, 3): ('Set Locked Camera Slot Number (Map<{area_id}><{block_id}>, Slot Number: {camera_slot})',
+                ('area_id', 'block_id', 'camera_slot')),
+    # 2009: SCRIPT
+    (2009, 0): ('? Register Ladder (Entity ID: {entity_id}, Unknown Event Flag ID: {flag_id}, Unknown Event Flag ID: '
+                '{other_flag_id})',
+                ('flag_id', 'other_flag_id', 'entity_id')),
+    (2009, 3): ('Register Bonfire (Event Flag ID: {flag_id}, Entity ID: {entity_id}, Reaction Distance: '
+                '{reaction_distance}, Reaction Angle: {reaction_angle}, Initial Kindle Level: {kindle_level})',
+                ('flag_id', 'entity_id', 'reaction_distance', 'reaction_angle', 'kindle_level')),
+    (2009, 4): ('Activate buffs for NPC ID: {entity_id}', ('entity_id',)),
+    (2009, 6): ('Issue Boss Room entry notification', ('unused',)),
+    # 2010: SOUND
+    (2010, 2): ('Play Sound Effect (Entity ID: {entity_id}, Sound Type: {sound_type}, Sound ID: {sound_id})',
+                ('entity_id', 'sound_type', 'sound_id')),
+    (2010, 3): ('{enabled} Map Sound (Entity ID: {entity_id})', ('entity_id', 'enabled')),
+    # 2011: HIT
+    (2011, 1): ('{enabled} Hitbox of Entity ID: {hitbox_entity_id}', ('hitbox_entity_id', 'enabled')),
+    # 2012: MAP
+    (2012, 1): ('{enabled} Map Part with Entity ID: {map_part_entity_id}', ('map_part_entity_id', 'enabled')),
+    # 1000: EXECUTION CONTROL (SYSTEM)
+    (1000, 1): ('SKIP {line_count} lines IF register {condition} is {result}', ('line_count', 'result', 'condition')),
+    (1000, 2): ('{end_type} event IF register {condition} is {result}', ('end_type', 'result', 'condition')),
+    (1000, 3): ('SKIP {line_count} lines', ('line_count',)),
+    (1000, 4): ('{end_type} event', ('end_type',)),
+    (1000, 5): ('SKIP {line_count} lines IF {left} {comparison} {right}',
+                ('line_count', 'comparison', 'left', 'right')),
+    (1000, 6): ('{end_type} event IF {left} {comparison} {right}', ('end_type', 'comparison', 'left', 'right')),
+    (1000, 7): ('SKIP {line_count} lines IF finished register {condition} is {result}',
+                ('line_count', 'result', 'condition')),
+    (1000, 8): ('{end_type} event IF finished register {condition} is {result}', ('end_type', 'result', 'condition')),
+    (1000, 9): ('WAIT for network approval (Timeout: {seconds}s)', ('seconds',)),
+    # 1001: EXECUTION CONTROL (TIMER)
+    (1001, 0): ('WAIT {seconds}s', ('seconds',)),
+    (1001, 1): ('WAIT {frames} frames', ('frames',)),
+    (1001, 2): ('WAIT random time between {min_seconds}s and {max_seconds}s', ('min_seconds', 'max_seconds')),
+    # 1003: EXECUTION CONTROL (EVENT)
+    (1003, 1): ('SKIP {line_count} lines IF {flag_type} {flag_id} is {state}',
+                ('line_count', 'state', 'flag_type', 'flag_id')),
+    (1003, 2): ('{end_type} event IF {flag_type} {flag_id} is {state}', ('end_type', 'state', 'flag_type', 'flag_id')),
+    (1003, 3): ('SKIP {line_count} lines IF {flag_type} {first_flag_id} to {last_flag_id} are {range_state}',
+                ('line_count', 'range_state', 'flag_type', 'first_flag_id', 'last_flag_id')),
+    (1003, 4): ('{end_type} event IF {flag_type} {first_flag_id} to {last_flag_id} are {range_state}',
+                ('end_type', 'range_state', 'flag_type', 'first_flag_id', 'last_flag_id')),
+    (1003, 5): ('SKIP {line_count} lines IF multiplayer status is {multiplayer_state}',
+                ('line_count', 'multiplayer_state')),
+    (1003, 6): ('{end_type} event IF multiplayer status is {multiplayer_state}', ('end_type', 'multiplayer_state')),
+    (1003, 7): ('SKIP {line_count} lines IF player is {inside} Map<{area_id}><{block_id}>',
+                ('line_count', 'inside', 'area_id', 'block_id')),
+    # 1005: EXECUTION CONTROL (OBJECT)
+    (1005, 1): ('SKIP {line_count} lines IF Object with Entity ID: {entity_id} is {destroyed}',
+                ('line_count', 'destroyed', 'entity_id')),
+    (1005, 2): ('{end_type} event IF Object with Entity ID: {entity_id} is {destroyed}',
+                ('end_type', 'destroyed', 'entity_id')),
+    # 0: EXECUTION CONDITIONS (SYSTEM)
+    (0, 0): ('CONDITION: IF register {input_condition} is {result} --> Register {condition}',
+             ('condition', 'result', 'input_condition')),
+    # 1: EXECUTION CONDITIONS (TIME)
+    (1, 0): ('CONDITION: IF {seconds}s have elapsed --> Register {condition}', ('condition', 'seconds')),
+    (1, 1): ('CONDITION: IF {frames} frames have elapsed --> Register {condition}', ('condition', 'frames')),
+    # 3: EXECUTION CONDITIONS (EVENT)
+    (3, 0): ('CONDITION: IF {flag_type} {flag_id} is {state} --> Register {condition}',
+             ('condition', 'state', 'flag_type', 'flag_id')),
+    (3, 1): ('CONDITION: IF {flag_type} {first_flag_id} to {last_flag_id} are {range_state} --> Register {condition}',
+             ('condition', 'range_state', 'flag_type', 'first_flag_id', 'last_flag_id')),
+    (3, 2): ('CONDITION: IF Entity ID: {entity_id} is {inside} Area Entity ID: {area_entity_id} --> Register '
+             '{condition}',
+             ('condition', 'inside', 'entity_id', 'area_entity_id')),
+    (3, 3): ('CONDITION: IF Entity ID: {entity_id} is {inside} radius {distance} of Entity ID: {other_entity_id} --> '
+             'Register {condition}',
+             ('condition', 'inside', 'entity_id', 'other_entity_id', 'distance')),
+    (3, 4): ('CONDITION: IF player {has} item (Item Type: {item_type}, Item ID: {item_id}) --> Register {condition}',
+             ('condition', 'item_type', 'item_id', 'has')),
+    (3, 5): ('CONDITION: IF Action Button State (Target Type: {category}, Target Entity ID: {target_entity_id}, '
+             'Reaction Angle: {reaction_angle}, Damipoly ID: {damipoly_id}, Reaction Distance: {reaction_distance}, '
+             'Help ID: {help_id}, Reaction Attribute: {reaction_attribute}, Pad ID: {pad_id}) --> Register '
+             '{condition}',
+             ('condition', 'category', 'target_entity_id', 'reaction_angle', 'damipoly_id', 'reaction_distance',
+              'help_id', 'reaction_attribute', 'pad_id')),
+    (3, 6): ('CONDITION: IF player Multiplayer State is {multiplayer_state} --> Register {condition}',
+             ('condition', 'multiplayer_state')),
+    (3, 7): ('CONDITION: IF all players are {inside} Area Entity ID: {area_entity_id} --> Register {condition}',
+             ('condition', 'inside', 'area_entity_id')),
+    (3, 8): ('CONDITION: IF player is {inside} Map<{area_id}><{block_id}> --> Register {condition}',
+             ('condition', 'inside', 'area_id', 'block_id')),
+    (3, 9): ('CONDITION: IF Multiplayer Event ID: {multiplayer_event_id} has occurred --> Register {condition}',
+             ('condition', 'multiplayer_event_id')),
+    (3, 10): ('CONDITION: IF number of ON flags in {flag_type} {first_flag_id} to {last_flag_id} {comparison} '
+              '{value} --> Register {condition}',
+              ('condition', 'flag_type', 'first_flag_id', 'last_flag_id', 'comparison', 'value')),
+    (3, 11): ('CONDITION: IF Area {tendency_type} Tendency {comparison} {value} --> Register {condition}',
+              ('condition', 'tendency_type', 'comparison', 'value')),
+    (3, 12): ('CONDITION: IF Event Value (Event Flag ID: {flag_id}, Number of Bits: {bit_count}) {comparison} '
+              '{value} --> Register {condition}',
+              ('condition', 'flag_id', 'bit_count', 'comparison', 'value')),
+    (3, 13): ('CONDITION: IF Action Button State (Target Type: {category}, Target Entity ID: {target_entity_id}, '
+              'Reaction Angle: {reaction_angle}, Damipoly ID: {damipoly_id}, Reaction Distance: {reaction_distance}, '
+              'Help ID: {help_id}, Reaction Attribute: {reaction_attribute}, Pad ID: {pad_id}) (BOSS ROOM VERSION) '
+              '--> Register {condition}',
+              ('condition', 'category', 'target_entity_id', 'reaction_angle', 'damipoly_id', 'reaction_distance',
+               'help_id', 'reaction_attribute', 'pad_id')),
+    (3, 14): ('CONDITION: IF any item has been dropped in Area Entity ID: {area_entity_id} --> Register {condition}',
+              ('condition', 'area_entity_id')),
+    (3, 15): ('CONDITION: IF item (Item Type: {item_type}, Item ID: {item_id}) has been dropped --> Register '
+              '{condition}',
+              ('condition', 'item_type', 'item_id')),
+    (3, 16): ('CONDITION: IF player {has} item (Item Type: {item_type}, Item ID: {item_id}) (including storage) --> '
+              'Register {condition}',
+              ('condition', 'item_type', 'item_id', 'has')),
+    (3, 17): ('CONDITION: IF New Game Cycle {comparison} {value} --> Register {condition}',
+              ('condition', 'comparison', 'value')),
+    (3, 18): ('CONDITION: IF Action Button State (Target Type: {category}, Target Entity ID: {target_entity_id}, '
+              'Reaction Angle: {reaction_angle}, Damipoly ID: {damipoly_id}, Reaction Distance: {reaction_distance}, '
+              'Help ID: {help_id}, Reaction Attribute: {reaction_attribute}, Pad ID: {pad_id}) and Line Segment '
+              'Direction (Line Segment Endpoint Entity ID: {endpoint_entity_id}) --> Register {condition}',
+              ('condition', 'category', 'target_entity_id', 'reaction_angle', 'damipoly_id', 'reaction_distance',
+               'help_id', 'reaction_attribute', 'pad_id', 'endpoint_entity_id')),
+    (3, 19): ('CONDITION: IF Action Button State (Target Type: {category}, Target Entity ID: {target_entity_id}, '
+              'Reaction Angle: {reaction_angle}, Damipoly ID: {damipoly_id}, Reaction Distance: {reaction_distance}, '
+              'Help ID: {help_id}, Reaction Attribute: {reaction_attribute}, Pad ID: {pad_id}) and Line Segment '
+              'Direction (Line Segment Endpoint Entity ID: {endpoint_entity_id}) (BOSS ROOM VERSION) --> Register '
+              '{condition}',
+              ('condition', 'category', 'target_entity_id', 'reaction_angle', 'damipoly_id', 'reaction_distance',
+               'help_id', 'reaction_attribute', 'pad_id', 'endpoint_entity_id')),
+    (3, 20): ('CONDITION: IF Event Value (Event Flag ID: {left_flag_id}, Number of Bits: {left_bit_count}) '
+              '{comparison} Event Value (Event Flag ID: {right_flag_id}, Number of Bits: {right_bit_count}) --> '
+              'Register {condition}',
+              ('condition', 'left_flag_id', 'left_bit_count', 'comparison', 'right_flag_id', 'right_bit_count')),
+    (3, 21): ('CONDITION: IF player {has} DLC --> Register {condition}', ('condition', 'has')),
+    (3, 22): ('CONDITION: IF player online state is {result} --> Register {condition}', ('condition', 'result')),
+    # 4: EXECUTION CONDITIONS (CHARACTER)
+    (4, 0): ('CONDITION: IF Entity ID: {entity_id} is {dead} --> Register {condition}',
+             ('condition', 'entity_id', 'dead')),
+    (4, 1): ('CONDITION: IF Entity ID: {entity_id} is hostile toward Entity ID: {other_entity_id} --> Register '
+             '{condition}',
+             ('condition', 'entity_id', 'other_entity_id')),
+    (4, 2): ('CONDITION: IF Entity ID: {entity_id} has Health Ratio {comparison} {value} --> Register {condition}',
+             ('condition', 'entity_id', 'comparison', 'value')),
+    (4, 3): ('CONDITION: IF Entity ID: {entity_id} is of Character Type {character_type} --> Register {condition}',
+             ('condition', 'entity_id', 'character_type')),
+    (4, 4): ('CONDITION: IF Entity ID: {entity_id} targeting Entity ID: {target_entity_id} is {result} --> Register '
+             '{condition}',
+             ('condition', 'entity_id', 'target_entity_id', 'result')),
+    (4, 5): ('CONDITION: IF Entity ID: {entity_id} has Special Effect ID: {special_effect_id} is {result} --> '
+             'Register {condition}',
+             ('condition', 'entity_id', 'special_effect_id', 'result')),
+    (4, 6): ('CONDITION: IF multipart-NPC part (Entity ID: {entity_id}, Part NPC Type: {part_npc_type}) HP '
+             '{comparison} {value} --> Register {condition}',
+             ('condition', 'entity_id', 'part_npc_type', 'value', 'comparison')),
+    (4, 7): ('??? CONDITION: IF Entity ID: {entity_id} "Back lead" status is {result} --> Register {condition}',
+             ('condition', 'entity_id', 'result')),
+    (4, 8): ('CONDITION: IF it is {result} that Entity ID: {entity_id} has Event Message ID: {event_message_id} --> '
+             'Register {condition}',
+             ('condition', 'entity_id', 'event_message_id', 'result')),
+    (4, 9): ('CONDITION: IF Entity ID: {entity_id} AI state is {ai_status_type} --> Register {condition}',
+             ('condition', 'entity_id', 'ai_status_type')),
+    (4, 10): ('CONDITION: IF Skull Lantern activated is {result} --> Register {condition}', ('condition', 'result')),
+    (4, 11): ('CONDITION: IF player class is {class_type} --> Register {condition}', ('condition', 'class_type')),
+    (4, 12): ('CONDITION: IF player covenant is {covenant} --> Register {condition}', ('condition', 'covenant')),
+    (4, 13): ('CONDITION: IF player Soul Level {comparison} {value} --> Register {condition}',
+              ('condition', 'comparison', 'value')),
+    (4, 14): ('CONDITION: IF Entity ID: {entity_id} has HP {comparison} {value} --> Register {condition}',
+              ('condition', 'entity_id', 'comparison', 'value')),
+    # 5: EXECUTION CONDITIONS (OBJECT)
+    (5, 0): ('CONDITION: IF Object with Entity ID: {entity_id} is {destroyed} --> Register {condition}',
+             ('condition', 'destroyed', 'entity_id')),
+    (5, 1): ('CONDITION: IF Object with Entity ID: {entity_id} has been damaged by Entity ID: {attacker_entity_id} '
+             '--> Register {condition}',
+             ('condition', 'entity_id', 'attacker_entity_id')),
+    (5, 2): ('CONDITION: IF ObjAct Execution Event ID: {obj_act_flag_id} --> Register {condition}',
+             ('condition', 'obj_act_flag_id')),
+    # 11: EXECUTION CONDITIONS (HIT)
+    (11, 0): ('CONDITION: IF player is moving on Hitbox Entity ID: {hitbox_entity_id} --> Register {condition}',
+              ('condition', 'hitbox_entity_id')),
+    (11, 1): ('CONDITION: IF player is running on Hitbox Entity ID: {hitbox_entity_id} --> Register {condition}',
+              ('condition', 'hitbox_entity_id')),
+    (11, 2): ('CONDITION: IF player is standing on Hitbox Entity ID: {hitbox_entity_id} --> Register {condition}',
+              ('condition', 'hitbox_entity_id')),
+}
+
+
+def argument_names(bank, index, arg_count=None):
+    """ Names of the arguments of bank[index] (see INSTRUCTION_INFO), or None if the instruction is unknown.
+
+    If arg_count is given, a variadic name ('*event_args') is expanded to 'event_args[0]', 'event_args[1]', etc.
+    """
+    try:
+        names = INSTRUCTION_INFO[(bank, index)][1]
+    except KeyError:
+        return None
+    if names and names[-1].startswith('*'):
+        fixed = names[:-1]
+        if arg_count is not None:
+            variadic = names[-1][1:]
+            return fixed + tuple('{}[{}]'.format(variadic, i) for i in range(arg_count - len(fixed)))
+        return fixed
+    return names
+
+
+""" ARGUMENT DISPLAY """
+
+
+def _register(value):
+    if value == 0:
+        return 'MAIN'
+    return '{}({:02d})'.format('AND' if value > 0 else 'OR', abs(value))
+
+
+def _enum_name(enum_class):
+    def display(value):
+        try:
+            return enum_class(value).name.replace('_', ' ').title()
+        except ValueError:
+            return str(value)
+    return display
+
+
+def _choice(*names, **named):
+    # Display integer arguments as names, by position (or by value for non-sequential values).
+    table = dict(enumerate(names))
+    table.update((int(key[1:]), name) for key, name in named.items())
+    return lambda value: table.get(value, str(value))
+
+
+_TRUE_FALSE = _choice('FALSE', 'TRUE')
+
+COVENANTS = ('None', 'Way of White', "Princess's Guard", 'Warrior of Sunlight', 'Darkwraith', 'Path of the Dragon',
+             'Gravelord Servant', 'Forest Hunter', 'Darkmoon Blade', 'Chaos Servant')
+
+ARGUMENT_DISPLAY = {
+    'condition': _register,
+    'input_condition': _register,
+    'state': _choice('OFF', 'ON', 'CHANGE'),
+    'enabled': _choice('DISABLE', 'ENABLE'),
+    'event_state': _choice('END', 'RESTART'),
+    'end_type': _choice('END', 'RESTART'),
+    'result': _TRUE_FALSE,
+    'flag_type': _choice('Event Flag ID:', 'Event ID:', 'Event ID with Slot Number:'),
+    'range_state': _choice('all ON', 'all OFF', 'not all OFF', 'not all ON'),
+    'comparison': _choice('==', '!=', '>', '<', '>=', '<='),
+    'inside': _choice('Outside', 'Inside'),
+    'has': _choice('does not have', 'has'),
+    'dead': _choice('Alive', 'Dead'),
+    'destroyed': _choice('Not Destroyed', 'Destroyed'),
+    'multiplayer_state': _choice('Host', 'Client', 'Multiplayer', 'Singleplayer'),
+    'category': _choice('Object', 'Area', 'Character'),
+    'cutscene_type': _choice('Skippable', 'Unskippable', v8='Skippable with Fade Out', v10='Unskippable with Fade Out'),
+    'bit_operation': _choice('Add', 'Delete', 'Invert'),
+    'tendency_type': _choice('White', 'Black'),
+    'reaction_attribute': _choice(v48='Survival & Gray', v255='All'),
+    'authority': _choice('Normal', v4095='Forced'),
+    'covenant': _choice(*COVENANTS),
+    'team_type': _enum_name(team_type),
+    'character_type': _enum_name(character_type),
+    'class_type': _enum_name(class_type),
+    'ai_status_type': _enum_name(ai_status_type),
+    'button_type': _enum_name(button_type),
+    'button_number': _enum_name(button_number),
+    'damage_target_type': _enum_name(damage_target_type),
+    'sound_type': _enum_name(sound_type),
+    'statue_type': _enum_name(statue_type),
+    'text_banner_type': _enum_name(text_banner_type),
+}
+for _name in ('loop', 'wait', 'skip_transition', 'yields_souls', 'invincible', 'start_stopped', 'overwrite_max',
+              'remove', 'no_collision', 'fixed', 'no_interpolation', 'root_only', 'pad_enabled'):
+    ARGUMENT_DISPLAY[_name] = _TRUE_FALSE
+
+
+def _display(name, value):
+    try:
+        return ARGUMENT_DISPLAY[name](value)
+    except KeyError:
+        return '{:.3f}'.format(value) if isinstance(value, float) else str(value)
+
+
+""" VERBOSE RENDERING """
+
+
+def _parameter_name(read_from_offset, bytes_length):
+    return 'X{}:{}'.format(read_from_offset, read_from_offset + bytes_length - 1)
+
+
+def format_verbose_instruction(instruction):
+    """ One instruction as verbose text, e.g. 'SKIP 1 lines IF Event Flag ID: 11810000 is OFF'.
+
+    Substituted arguments are shown as the event parameter they are read from (e.g. 'X0:3').
+    """
+    offsets = instruction.layout.offsets
+    parameters = {}
+    for write_from_offset, read_from_offset, bytes_length in instruction.substitutions or ():
+        if write_from_offset in offsets:
+            parameters[offsets.index(write_from_offset)] = _parameter_name(read_from_offset, bytes_length)
+    names = argument_names(instruction.bank, instruction.index, len(instruction.args))
+    if names is None or len(names) != len(instruction.args):
+        args = ', '.join(parameters.get(i, _display(None, arg)) for i, arg in enumerate(instruction.args))
+        return '{}[{:02d}] ({}) ({})'.format(instruction.bank, instruction.index, instruction.layout.arg_format, args)
+    fields = {}
+    variadic = []
+    for i, (name, arg) in enumerate(zip(names, instruction.args)):
+        text = parameters[i] if i in parameters else _display(name, arg)
+        if name.endswith(']'):
+            variadic.append(text)
+        else:
+            fields[name] = text
+    template, template_names = INSTRUCTION_INFO[(instruction.bank, instruction.index)]
+    if template_names and template_names[-1].startswith('*'):
+        fields[template_names[-1][1:]] = '{' + ', '.join(variadic) + '}'
+    return template.format(**fields)
+
+
+def _parameter_format(bytes_length):
+    return {1: 'B', 2: 'h'}.get(bytes_length, 'i')
+
+
+def verbose_lines(event):
+    """ Verbose lines of one Event: an 'Event ID' header, its parameters, and numbered instructions. """
+    parameters = {}
+    for instruction in event.instructions:
+        for _, read_from_offset, bytes_length in instruction.substitutions or ():
+            parameters[read_from_offset] = bytes_length
+    parameter_offsets = sorted(parameters)
+    yield 'Event ID: {}, Int: {}'.format(event.event_id, event.restart_type)
+    yield 'Parameters: {{{}}} ({})'.format(
+        ', '.join(_parameter_name(offset, parameters[offset]) for offset in parameter_offsets),
+        ''.join(_parameter_format(parameters[offset]) for offset in parameter_offsets))
+    for line_number, instruction in enumerate(event.instructions):
+        yield '{:>7} {}'.format(line_number, format_verbose_instruction(instruction))
+
+
+def write_verbose(events, stream):
+    """ Write events to a text stream in verbose form, with a blank line between events. """
+    for i, event in enumerate(events):
+        if i:
+            stream.write('\n')
+        for line in verbose_lines(event):
+            stream.write(line + '\n')
+
+
+def render_verbose(events):
+    """ Verbose text of events, as a single string. """
+    lines = []
+    for i, event in enumerate(events):
+        if i:
+            lines.append('')
+        lines.extend(verbose_lines(event))
+    return '\n'.join(lines) + '\n' if lines else ''
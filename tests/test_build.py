@@ -0,0 +1,56 @@
+"""
+@author: grimrhapsody
+"""
+
+import pytest
+from pydses import build_emevd_from_template, clear_render_cache, disable, event, set_event_flag
+
+TEMPLATE = """0, 0
+ <INIT0>
+ 1000[04] (B)[0]
+
+11810001, 0
+ 2003[02] (iB)[16, 1]
+"""
+
+
+def event11810001():
+    event(11810001, 0)
+    set_event_flag(1.5, 1)
+    disable(1810800.5)
+
+
+def test_template_build_reports_every_invalid_argument(tmp_path):
+    directories = [tmp_path / name for name in ('template', 'built', 'verbose', 'emevd')]
+    for directory in directories:
+        directory.mkdir()
+    (directories[0] / 'm18_01_00_00.unpack.txt').write_text(TEMPLATE)
+    with pytest.raises(ValueError) as error:
+        build_emevd_from_template([event11810001], 'm18_01_00_00', *map(str, directories), prompt=lambda question: 'y',
+                                  report=lambda message: None)
+    message = str(error.value)
+    assert '2 invalid arguments in m18_01_00_00' in message
+    assert 'Event 11810001, line 0 (2003[02]): flag_id = 1.5' in message
+    assert 'Event 11810001, line 1 (2004[05]): entity_id = 1810800.5' in message
+    assert not any(list(directory.iterdir()) for directory in directories[1:])
+
+
+CALLS = []
+
+
+def event11810002():
+    CALLS.append(1)
+    event(11810001, 0)
+    set_event_flag(11810500, 1)
+
+
+def test_template_build_runs_each_event_once(tmp_path):
+    clear_render_cache()
+    directories = [tmp_path / name for name in ('template', 'built', 'verbose', 'emevd')]
+    for directory in directories:
+        directory.mkdir()
+    (directories[0] / 'm18_01_00_00.unpack.txt').write_text(TEMPLATE)
+    assert build_emevd_from_template([event11810002], 'm18_01_00_00', *map(str, directories),
+                                     prompt=lambda question: 'y', report=lambda message: None)
+    assert len(CALLS) == 1
+    assert '2003[02] (iB)[11810500, 1]' in (directories[1] / 'm18_01_00_00.unpack.txt').read_text()
@@ -0,0 +1,67 @@
+"""
+@author: grimrhapsody
+"""
+
+from pydses import EventBuilder, end, event, initialize_event_with_slot, set_event_flag
+from pydses.control import Elif, Else, If, flag_on
+from pydses.simulate import EventSimulator
+
+
+def _run(event_function, flags):
+    with EventBuilder() as builder:
+        event(0, 0)
+        initialize_event_with_slot(0, 11810100)
+        event(11810100, 0)
+        event_function()
+    sim = EventSimulator(builder.events)
+    for flag in flags:
+        sim.set_flag(flag)
+    sim.start()
+    sim.tick(2)
+    return sim
+
+
+def _nested_end():
+    with If(flag_on(16)):
+        with If(flag_on(17)):
+            end()
+    with Else():
+        set_event_flag(99, 1)
+    set_event_flag(98, 1)
+
+
+def test_else_after_nested_end_is_skipped():
+    sim = _run(_nested_end, [16])
+    assert not sim.get_flag(99)
+    assert sim.get_flag(98)
+
+
+def test_nested_end_still_ends_event():
+    sim = _run(_nested_end, [16, 17])
+    assert not sim.get_flag(99)
+    assert not sim.get_flag(98)
+
+
+def test_else_runs_when_test_is_false():
+    sim = _run(_nested_end, [])
+    assert sim.get_flag(99)
+    assert sim.get_flag(98)
+
+
+def test_block_ending_in_end_needs_no_skip():
+    def event_function():
+        with If(flag_on(16)):
+            end()
+        with Elif(flag_on(17)):
+            set_event_flag(97, 1)
+        with Else():
+            set_event_flag(99, 1)
+
+    with EventBuilder() as builder:
+        event(11810100, 0)
+        event_function()
+    assert [(instruction.bank, instruction.index) for instruction in builder.events[0].instructions].count(
+        (1000, 3)) == 1
+    assert _run(event_function, [17]).get_flag(97)
+    assert not _run(event_function, [17]).get_flag(99)
+    assert not _run(event_function, [16]).get_flag(99)
@@ -0,0 +1,49 @@
+"""
+@author: grimrhapsody
+"""
+
+from pydses import EventBuilder, disable, event, initialize_event_with_slot
+from pydses.dedupe import find_duplicate_events, merge_duplicate_events
+from pydses.simulate import EventSimulator
+
+
+def _build(event_ids):
+    with EventBuilder() as builder:
+        event(0, 0)
+        for event_id in event_ids:
+            initialize_event_with_slot(0, event_id)
+        for i, event_id in enumerate(event_ids):
+            event(event_id, 0)
+            disable(1810100 + i)
+    return builder.events
+
+
+def _completion_flags(events, event_ids):
+    sim = EventSimulator(events)
+    sim.start()
+    sim.tick(2)
+    return {event_id for event_id in event_ids if sim.get_flag(event_id)}
+
+
+def test_merged_events_keep_their_completion_flags():
+    event_ids = [11810100, 11810101, 11810102]
+    events = _build(event_ids)
+    merged, merged_ids = merge_duplicate_events(events)
+    assert merged_ids == {11810100: event_ids}
+    assert _completion_flags(merged, event_ids + [11810103]) == set(event_ids)
+
+
+def test_non_consecutive_ids_are_not_merged():
+    event_ids = [11810100, 11810200]
+    events = _build(event_ids)
+    assert find_duplicate_events(events) == []
+    merged, merged_ids = merge_duplicate_events(events)
+    assert merged_ids == {}
+    assert _completion_flags(merged, event_ids + [11810101]) == set(event_ids)
+
+
+def test_consecutive_runs_are_merged_separately():
+    event_ids = [11810100, 11810101, 11810200, 11810201]
+    merged, merged_ids = merge_duplicate_events(_build(event_ids))
+    assert merged_ids == {11810100: [11810100, 11810101], 11810200: [11810200, 11810201]}
+    assert _completion_flags(merged, event_ids + [11810102, 11810202]) == set(event_ids)
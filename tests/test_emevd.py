@@ -0,0 +1,43 @@
+"""
+@author: grimrhapsody
+"""
+
+import pytest
+from pydses import EventBuilder, disable, event, initialize_event_with_slot, set_event_flag, wait
+from pydses.emevd import pack_events, read_emevd, write_emevd
+from pydses.params import EventParameters, param
+
+DOOR = EventParameters(param('door_flag', 'I'), param('delay', 'f'))
+LINKED_FILES = ['N:\\FRPG\\data\\Event\\common.emevd']
+
+
+def _build():
+    with EventBuilder() as builder:
+        event(0, 0)
+        initialize_event_with_slot(0, 11810300, *DOOR.pack(door_flag=11810301, delay=1.5))
+        event(11810300, 1)
+        wait(DOOR.delay)
+        set_event_flag(DOOR.door_flag, 1)
+        disable(1810800)
+    return builder.events
+
+
+def test_pack_read_repack_is_byte_identical(tmp_path):
+    path = str(tmp_path / 'm18_01_00_00.emevd')
+    write_emevd(_build(), path, LINKED_FILES)
+    with open(path, 'rb') as file:
+        packed = file.read()
+    with read_emevd(path) as reader:
+        assert reader.event_ids == [0, 11810300]
+        assert reader.linked_files == LINKED_FILES
+        assert bytes(pack_events(reader.events(), reader.linked_files)) == packed
+
+
+def test_unterminated_linked_file_name_is_rejected(tmp_path):
+    path = str(tmp_path / 'm18_01_00_00.emevd')
+    data = pack_events(_build(), LINKED_FILES)
+    data[-2:] = 'x'.encode('utf-16-le')
+    with open(path, 'wb') as file:
+        file.write(data)
+    with pytest.raises(ValueError, match='not terminated'):
+        read_emevd(path)
@@ -0,0 +1,33 @@
+"""
+@author: grimrhapsody
+"""
+
+import threading
+import warnings
+from pydses import EventBuilder, FlagAllocator, disable_all_flags_in_range, event, use_flag_allocator
+from pydses.flags import check_flag_range, current_flag_allocator
+
+
+def test_range_warning_points_at_the_event_script():
+    allocator = FlagAllocator()
+    allocator.reserve(11810000, 11810009)
+    with use_flag_allocator(allocator), warnings.catch_warnings(record=True) as caught, EventBuilder():
+        warnings.simplefilter('always')
+        event(11810100, 0)
+        disable_all_flags_in_range(11810005, 11810020)
+    assert [warning.filename for warning in caught] == [__file__]
+    assert 'overlaps flags that are already used: 11810005 to 11810009' in str(caught[0].message)
+
+
+def test_allocator_is_only_used_by_its_own_thread():
+    allocator = FlagAllocator()
+    allocator.reserve(11810000, 11810009)
+    with use_flag_allocator(allocator):
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            thread = threading.Thread(target=check_flag_range, args=(11810005, 11810020))
+            thread.start()
+            thread.join()
+        assert current_flag_allocator() is allocator
+    assert caught == []
+    assert current_flag_allocator() is None
@@ -0,0 +1,53 @@
+"""
+@author: grimrhapsody
+"""
+
+import os
+from pydses.events import Event
+from pydses.mapcache import CACHE_SUFFIX, load_unpacked
+from pydses.unpacked import parse_unpacked
+
+SCRIPT = """0, 0
+ 2009[03] (iiffi)[11810992, 1811960, 0.1, 180.0, 0]
+ <INIT0>
+ 1000[04] (B)[0]
+
+11810090, 0
+ 1001[00] (f)[2.3]
+ 2005[03] (iB)[0, 0]
+    ^(0 <- 0, 4)
+
+<11810100>
+"""
+
+
+def _summary(script):
+    items = []
+    for item in script.items:
+        if isinstance(item, Event):
+            items.append((item.event_id, item.restart_type, [
+                (i.bank, i.index, i.layout.arg_format, i.args, i.substitutions) for i in item.instructions]))
+        else:
+            items.append(item)
+    return items, script.event_tags
+
+
+def test_cached_load_matches_parse(tmp_path):
+    path = str(tmp_path / 'm18_01_00_00.unpack.txt')
+    with open(path, 'w') as file:
+        file.write(SCRIPT)
+    parsed = _summary(parse_unpacked(path))
+    assert _summary(load_unpacked(path)) == parsed
+    assert os.path.exists(path + CACHE_SUFFIX)
+    cached = load_unpacked(path)
+    assert _summary(cached) == parsed
+    assert cached.events[11810090].instructions[0].args == (2.3,)
+
+
+def test_unpackable_arguments_are_not_cached(tmp_path):
+    path = str(tmp_path / 'm.txt')
+    with open(path, 'w') as file:
+        file.write('11810001, 0\n 2003[02] (iB)[5000000000, 1]\n')
+    script = load_unpacked(path)
+    assert script.events[11810001].instructions[0].args == (5000000000, 1)
+    assert os.listdir(str(tmp_path)) == ['m.txt']
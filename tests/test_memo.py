@@ -0,0 +1,55 @@
+"""
+@author: grimrhapsody
+"""
+
+from types import ModuleType
+from pydses import disable, event
+from pydses.memo import render_event
+
+consts = ModuleType('consts')
+consts.BOSS_ID = 1810800
+
+
+def event11810100():
+    event(11810100, 0)
+    disable(consts.BOSS_ID)
+
+
+def test_module_attribute_constants_are_part_of_the_fingerprint():
+    assert '[1810800, 0]' in render_event(event11810100)
+    consts.BOSS_ID = 1810801
+    assert '[1810801, 0]' in render_event(event11810100)
+
+
+class Flags:
+    class Boss:
+        DEAD = 11810900
+
+
+def event11810101():
+    event(11810101, 0)
+    disable(Flags.Boss.DEAD)
+
+
+def test_class_attribute_constants_are_part_of_the_fingerprint():
+    assert '[11810900, 0]' in render_event(event11810101)
+    Flags.Boss.DEAD = 11810901
+    assert '[11810901, 0]' in render_event(event11810101)
+
+
+def _make_event(entity_id):
+    def event11810102():
+        event(11810102, 0)
+        disable(entity_id)
+
+    def set_entity(value):
+        nonlocal entity_id
+        entity_id = value
+    return event11810102, set_entity
+
+
+def test_closure_constants_are_part_of_the_fingerprint():
+    event11810102, set_entity = _make_event(1810810)
+    assert '[1810810, 0]' in render_event(event11810102)
+    set_entity(1810811)
+    assert '[1810811, 0]' in render_event(event11810102)
@@ -0,0 +1,32 @@
+"""
+@author: grimrhapsody
+"""
+
+from pydses import (CONT, EventBuilder, event, if_condition_true, if_event_flag_on, set_event_flag,
+                    skip_if_event_flag_on)
+from pydses.registers import Register
+
+
+def _output_registers(skip_main):
+    with EventBuilder() as builder:
+        event(11810100, 0)
+        first = Register('AND', 'first')
+        if_event_flag_on(first, 0, 16)
+        if skip_main:
+            skip_if_event_flag_on(1, 0, 17)
+        if_condition_true(CONT, first)
+        set_event_flag(11810500, 1)
+        second = Register('AND', 'second')
+        if_event_flag_on(second, 0, 18)
+        if_condition_true(CONT, second)
+    instructions = builder.events[0].instructions
+    return [instruction.args[0] for instruction in instructions
+            if (instruction.bank, instruction.index) == (3, 0)]
+
+
+def test_register_is_reused_after_main():
+    assert _output_registers(skip_main=False) == [1, 1]
+
+
+def test_register_is_not_reused_when_main_can_be_skipped():
+    assert _output_registers(skip_main=True) == [1, 2]
@@ -0,0 +1,20 @@
+"""
+@author: grimrhapsody
+"""
+
+import pytest
+from pydses import EventBuilder, disable, event, initialize_event_with_slot
+from pydses.simulate import EventSimulator
+
+
+def test_substitution_outside_arguments_names_event_and_line():
+    with EventBuilder() as builder:
+        event(0, 0)
+        initialize_event_with_slot(0, 11810100, 1810800)
+        event(11810100, 0)
+        disable(0)
+    builder.events[1].instructions[0].add_substitution(6, 0, 4)
+    sim = EventSimulator(builder.events)
+    sim.start()
+    with pytest.raises(ValueError, match=r'Event 11810100, line 0: substitution \^\(6 <- 0, 4\)'):
+        sim.tick()
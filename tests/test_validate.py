@@ -0,0 +1,25 @@
+"""
+@author: grimrhapsody
+"""
+
+import pytest
+from pydses import EventBuilder, event, wait
+from pydses import validate
+from pydses.validate import check_events, find_violations
+
+
+def _build(seconds):
+    with EventBuilder() as builder:
+        event(11810100, 0)
+        wait(seconds)
+    return builder.events
+
+
+@pytest.mark.parametrize('numpy', [validate.np, None], ids=['default', 'no-numpy'])
+def test_nan_floats_are_rejected_with_or_without_numpy(monkeypatch, numpy):
+    monkeypatch.setattr(validate, 'np', numpy)
+    assert find_violations(_build(1.5)) == []
+    violations = find_violations(_build(float('nan')))
+    assert [(event_id, line) for event_id, line, _ in violations] == [(11810100, 0)]
+    with pytest.raises(ValueError, match='out of range'):
+        check_events(_build(float('nan')))